@@ -1,6 +1,15 @@
 import streamlit as st
-from model.inference import load_model, predict_next_letter
+from model.checkpoints import variant_model_path
+from model.policy_table import PolicyTable
+from model.ai_game import AIGamePlan, LazyResource
+from model.game_state import GameState
+from model.stats_store import ANONYMOUS, StatsStore
+from model.client import InferenceClient
+from model import profiling
+from concurrent.futures import ThreadPoolExecutor
+import functools
 import secrets
+import os
 
 # ------------------------------
 # Arcade Theme Styling with Retro Frame
@@ -86,24 +95,102 @@ if "game_started" not in st.session_state:
         Click below to start the game!
     """)
 
+    player_name = st.text_input("Your name for the leaderboard (optional)", max_chars=20)
+
     if st.button("🎮 Start Game"):
         st.session_state.game_started = True
+        st.session_state.player_name = player_name.strip() or ANONYMOUS
         st.rerun()
     st.stop()
 
 # ------------------------------
-# Cached model loading
+# Cached model loading (torch is only imported once the AI first needs the model)
 # ------------------------------
+# HANGMAN_MODEL_VARIANT picks a distilled student (see scripts/bench_variants.py), default 'base'
+model_variant = os.environ.get("HANGMAN_MODEL_VARIANT", "base")
+model_path = variant_model_path("hangman_vs_ai/model/transformer.pt", model_variant)
+# HANGMAN_QUANTIZED=1 serves the int8 model (adopt only after scripts/quantization_report.py passes);
+# HANGMAN_BACKEND=numpy runs the .npz export of scripts/export_numpy.py without torch
+model_quantized = os.environ.get("HANGMAN_QUANTIZED", "0") == "1"
+model_backend = os.environ.get("HANGMAN_BACKEND", "torch")
+
+def load_inference():
+    from model import inference
+
+    inference.load_model(model_path, quantized=model_quantized, variant=model_variant, backend_name=model_backend)
+    return inference
+
+@st.cache_resource
+def load_inference_resource():
+    # Shared handle, loaded on first use by the script thread or an AI planning worker
+    return LazyResource(load_inference)
+
+inference_resource = load_inference_resource()
+
 @st.cache_resource
-def load_model_cached():
-    load_model("hangman_vs_ai/model/transformer.pt")
+def load_policy_cached():
+    # Precompiled AI decisions (scripts/compile_policy.py), ignored if built for another checkpoint,
+    # backend or quantization than the model served here
+    return PolicyTable.load("hangman_vs_ai/model/policy_table.json.gz", model_path=model_path,
+                            backend=model_backend, quantized=model_quantized)
 
-if "model_loaded" not in st.session_state:
-    with st.spinner("Loading AI model..."):
-        load_model_cached()
-    st.session_state.model_loaded = True
-else:
-    load_model_cached()
+# Client mode: HANGMAN_INFERENCE_URL points at scripts/serve.py and the model is never loaded here
+inference_url = os.environ.get("HANGMAN_INFERENCE_URL")
+
+@st.cache_resource
+def load_client_cached():
+    return InferenceClient(inference_url)
+
+inference_client = load_client_cached() if inference_url else None
+
+ai_policy = load_policy_cached()
+
+@st.cache_resource
+def load_ai_executor():
+    # Shared by all sessions: precomputes each new round's AI game in the background
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="ai-plan")
+
+def choose_ai_letter(game_state, feature_state, policy=None, client=None, inference=None):
+
+    # Runs on the script thread and on the AI planning workers, so every resource is passed in
+    # (policy table, inference client or the LazyResource of the local model), never looked up
+    ai_guess = policy.lookup(game_state.masked, game_state.guesses) if policy else None
+
+    # Fall back to the model for states the policy table has never seen
+    if (ai_guess is None or game_state.has_guessed(ai_guess)) and client is not None:
+        ai_guess = client.predict_next_letter(game_state.masked, game_state.guesses)
+    elif ai_guess is None or game_state.has_guessed(ai_guess):
+        ai_guess = inference.get().predict_next_letter(
+            current_state=game_state.masked,
+            guessed_letters=game_state.guesses,
+            feature_state=feature_state,
+            game_state=game_state
+        )
+    return ai_guess
+
+# The AI's decision function with this process's resources bound (safe to call off the script thread)
+ai_chooser = functools.partial(choose_ai_letter, policy=ai_policy, client=inference_client, inference=inference_resource)
+
+# Results of finished games across sessions (HANGMAN_STATS_DB= disables recording)
+stats_path = os.environ.get("HANGMAN_STATS_DB", "hangman_vs_ai/data/stats.sqlite3")
+
+@st.cache_resource
+def load_stats_cached():
+    # One store (and writer thread) shared by all sessions
+    return StatsStore(stats_path) if stats_path else None
+
+stats_store = load_stats_cached()
+
+def ai_feature_state():
+    # Local mode only: built on the first synchronous AI turn, replaying the guesses so far
+    if inference_url:
+        return None
+    if "ai_features" not in st.session_state:
+        features = inference_resource.get().GameFeatureState(len(st.session_state.target_word))
+        for letter in st.session_state.ai_game.guesses:
+            features.apply_guess(letter, [i for i, c in enumerate(st.session_state.target_word) if c == letter])
+        st.session_state.ai_features = features
+    return st.session_state.ai_features
 
 # ------------------------------
 # Game Init
@@ -114,19 +201,22 @@ def get_random_word():
     return secrets.choice(words)
 
 def reset_game():
+    if "ai_plan" in st.session_state:
+        st.session_state.ai_plan.cancel()
     keep_game_started = st.session_state.get("game_started", False)
+    keep_player_name = st.session_state.get("player_name", ANONYMOUS)
     st.session_state.clear()
     st.session_state["game_started"] = keep_game_started
+    st.session_state["player_name"] = keep_player_name
 
 if "target_word" not in st.session_state:
     word = get_random_word()
     st.session_state.target_word = word
-    st.session_state.masked_word = "_" * len(word)
-    st.session_state.ai_masked_word = "_" * len(word)
-    st.session_state.human_guessed = []
-    st.session_state.human_wrong = 0
-    st.session_state.ai_guessed = []
-    st.session_state.ai_wrong = 0
+    # Each player's revealed letters and guesses (GameState, replaced on every guess)
+    st.session_state.human_game = GameState(word)
+    st.session_state.ai_game = GameState(word)
+    # The round's AI game is played in the background, which also loads the model off the page's path
+    st.session_state.ai_plan = AIGamePlan(word, ai_chooser, track_features=not inference_url).start(load_ai_executor())
     st.session_state.turn = "human"
     st.session_state.human_solved_on = 0
     st.session_state.ai_solved_on = 0
@@ -144,16 +234,17 @@ with col1:
 
     st.image("hangman_vs_ai/assets/images/human_avatar.png", caption="PLAYER 1", width=150)
 
-    health_human = 6 - st.session_state.human_wrong
+    human_game = st.session_state.human_game
+    health_human = human_game.lives(6)
     human_img_path = f"hangman_vs_ai/assets/healthbars/human_{health_human}_lives.png"
     st.image(human_img_path, use_container_width=True)
 
-    human_correct_guesses = [g for g in st.session_state.human_guessed if g in st.session_state.target_word]
-    human_wrong_guesses = [g for g in st.session_state.human_guessed if g not in st.session_state.target_word]
+    human_correct_guesses = human_game.correct_guesses()
+    human_wrong_guesses = human_game.wrong_guesses()
     st.markdown(f"❤️ Lives: {health_human}/6")
     st.markdown(f"✅ Correct ({len(human_correct_guesses)}): " + ", ".join(human_correct_guesses) if human_correct_guesses else "✅ Correct: –")
     st.markdown(f"❌ Wrong ({len(human_wrong_guesses)}): " + ", ".join(human_wrong_guesses) if human_wrong_guesses else "❌ Wrong: –")
-    st.markdown(f"**Word:** `{st.session_state.masked_word}`")
+    st.markdown(f"**Word:** `{human_game.masked}`")
 
 with col_mid:
     st.markdown("### VS")
@@ -162,12 +253,13 @@ with col2:
 
     st.image("hangman_vs_ai/assets/images/ai_avatar.png", caption="AI", width=150)  
     
-    health_ai = 6 - st.session_state.ai_wrong
+    ai_game = st.session_state.ai_game
+    health_ai = ai_game.lives(6)
     ai_img_path = f"hangman_vs_ai/assets/healthbars/ai_{health_ai}_lives.png"
     st.image(ai_img_path, use_container_width=True)
 
-    ai_correct_guesses = [g for g in st.session_state.ai_guessed if g in st.session_state.target_word]
-    ai_wrong_guesses = [g for g in st.session_state.ai_guessed if g not in st.session_state.target_word]
+    ai_correct_guesses = ai_game.correct_guesses()
+    ai_wrong_guesses = ai_game.wrong_guesses()
     st.markdown(f"❤️ Lives: {health_ai}/6")
 
     if not st.session_state.game_over:
@@ -176,72 +268,92 @@ with col2:
     else:
         st.markdown(f"✅ Correct ({len(ai_correct_guesses)}): " + ", ".join(ai_correct_guesses) if ai_correct_guesses else "✅ Correct: –")
         st.markdown(f"❌ Wrong ({len(ai_wrong_guesses)}): " + ", ".join(ai_wrong_guesses) if ai_wrong_guesses else "❌ Wrong: –")
-        st.markdown(f"**Word:** `{st.session_state.ai_masked_word}`")        
+        st.markdown(f"**Word:** `{ai_game.masked}`")        
 
 # ------------------------------
 # Turn + Game Over Checker
 # ------------------------------
 def check_turn_and_game_state():
+    human_game = st.session_state.human_game
+    ai_game = st.session_state.ai_game
+
     # Track completion status
-    st.session_state.human_done = st.session_state.human_wrong >= 6 or "_" not in st.session_state.masked_word
-    st.session_state.ai_done = st.session_state.ai_wrong >= 6 or "_" not in st.session_state.ai_masked_word
+    st.session_state.human_done = human_game.wrong_count >= 6 or human_game.solved
+    st.session_state.ai_done = ai_game.wrong_count >= 6 or ai_game.solved
 
     # Initialize solved turn tracking
     if "turn_counter" not in st.session_state:
         st.session_state.turn_counter = 0
     st.session_state.turn_counter += 1
 
-    if "human_solved_on" not in st.session_state and "_" not in st.session_state.masked_word:
+    if "human_solved_on" not in st.session_state and human_game.solved:
         st.session_state.human_solved_on = st.session_state.turn_counter
 
-    if "ai_solved_on" not in st.session_state and "_" not in st.session_state.ai_masked_word:
+    if "ai_solved_on" not in st.session_state and ai_game.solved:
         st.session_state.ai_solved_on = st.session_state.turn_counter
 
     # If both players have solved or failed, compute the outcome
     if st.session_state.human_done and st.session_state.ai_done:
         st.session_state.game_over = True
 
-        human_solved = "_" not in st.session_state.masked_word
-        ai_solved = "_" not in st.session_state.ai_masked_word
+        human_solved = human_game.solved
+        ai_solved = ai_game.solved
 
         if human_solved and ai_solved:
             if st.session_state.human_solved_on < st.session_state.ai_solved_on:
-                outcome = "🎉 You revealed the word first! You win!"
+                outcome, winner = "🎉 You revealed the word first! You win!", "human"
             elif st.session_state.ai_solved_on < st.session_state.human_solved_on:
-                outcome = "🤖 AI revealed the word first! AI wins!"
+                outcome, winner = "🤖 AI revealed the word first! AI wins!", "ai"
             else:
                 # Both solved on same turn — compare wrong guesses
-                if st.session_state.human_wrong < st.session_state.ai_wrong:
-                    outcome = "🎉 You both solved the word, but you made fewer mistakes. You win!"
-                elif st.session_state.ai_wrong < st.session_state.human_wrong:
-                    outcome = "🤖 You both solved the word, but the AI made fewer mistakes. AI wins!"
+                if human_game.wrong_count < ai_game.wrong_count:
+                    outcome, winner = "🎉 You both solved the word, but you made fewer mistakes. You win!", "human"
+                elif ai_game.wrong_count < human_game.wrong_count:
+                    outcome, winner = "🤖 You both solved the word, but the AI made fewer mistakes. AI wins!", "ai"
                 else:
-                    outcome = "🤝 It's a tie! Equal guesses and mistakes."
+                    outcome, winner = "🤝 It's a tie! Equal guesses and mistakes.", "tie"
 
         elif not human_solved and not ai_solved:
-            human_revealed = len(st.session_state.masked_word) - st.session_state.masked_word.count('_')
-            ai_revealed = len(st.session_state.ai_masked_word) - st.session_state.ai_masked_word.count('_')
+            human_revealed = human_game.revealed_count
+            ai_revealed = ai_game.revealed_count
             if human_revealed > ai_revealed:
-                outcome = "📊 Both out of lives. You revealed more of the word. You win!"
+                outcome, winner = "📊 Both out of lives. You revealed more of the word. You win!", "human"
             elif ai_revealed > human_revealed:
-                outcome = "🤖 Both out of lives. AI revealed more of the word. AI wins!"
+                outcome, winner = "🤖 Both out of lives. AI revealed more of the word. AI wins!", "ai"
             else:
-                outcome = "🤷 Both out of lives. It's a tie!"
+                outcome, winner = "🤷 Both out of lives. It's a tie!", "tie"
 
         elif human_solved:
-            outcome = "🎉 You revealed the full word! You win!"
+            outcome, winner = "🎉 You revealed the full word! You win!", "human"
         else:
-            outcome = "🤖 AI revealed the full word! AI wins!"
+            outcome, winner = "🤖 AI revealed the full word! AI wins!", "ai"
 
         st.session_state.outcome = outcome
+
+        # Queued for the stats writer thread, the rerun does not wait for the database
+        if stats_store is not None:
+            stats_store.record(
+                word=st.session_state.target_word,
+                winner=winner,
+                outcome=outcome,
+                human_guesses=human_game.guesses,
+                ai_guesses=ai_game.guesses,
+                human_wrong=human_game.wrong_count,
+                ai_wrong=ai_game.wrong_count,
+                human_solved=human_solved,
+                ai_solved=ai_solved,
+                human_solved_on=len(human_game.guesses) if human_solved else None,
+                ai_solved_on=len(ai_game.guesses) if ai_solved else None,
+                player=st.session_state.get("player_name", ANONYMOUS)
+            )
         return
 
     # If one side finishes, allow the other to take final turn
-    if "_" not in st.session_state.masked_word and not st.session_state.ai_done:
+    if human_game.solved and not st.session_state.ai_done:
         st.session_state.turn = "ai"
         return
 
-    if "_" not in st.session_state.ai_masked_word and not st.session_state.human_done:
+    if ai_game.solved and not st.session_state.human_done:
         st.session_state.turn = "human"
         return
 
@@ -270,6 +382,20 @@ if st.session_state.game_over:
     st.markdown(f"**The word was:** `{st.session_state.target_word}`")
     st.button("Play Again", on_click=lambda: reset_game())
 
+    if stats_store is not None:
+        with st.expander("🏆 Human vs AI stats"):
+            totals = stats_store.totals()
+            if totals["games"]:
+                st.markdown(
+                    f"**{totals['games']:,} games** | 🧍 Humans won {totals['human_wins'] / totals['games']:.0%} | "
+                    f"🤖 AI won {totals['ai_wins'] / totals['games']:.0%} | 🤝 Ties {totals['ties'] / totals['games']:.0%}"
+                )
+            st.table([
+                {"player": row["key"], "wins vs AI": row["human_wins"], "games": row["games"],
+                 "win rate": f"{row['human_wins'] / row['games']:.0%}"}
+                for row in stats_store.leaderboard(10)
+            ])
+
 # ------------------------------
 # Human Guess + AI Guess
 # ------------------------------
@@ -301,47 +427,55 @@ if not st.session_state.game_over and st.session_state.turn == "human":
         if not guess.isalpha():
             st.warning("🚫 Please enter a single alphabetical letter (a–z).")
 
-        elif guess in st.session_state.human_guessed:
+        elif st.session_state.human_game.has_guessed(guess):
             st.warning(f"❗ You've already guessed '{guess}'. Try a new letter.")
 
         else:
-            st.session_state.human_guessed.append(guess)
-
-            if guess in st.session_state.target_word:
-                new_mask = list(st.session_state.masked_word)
-                for i, c in enumerate(st.session_state.target_word):
-                    if c == guess:
-                        new_mask[i] = guess
-                st.session_state.masked_word = "".join(new_mask)
-            else:
-                st.session_state.human_wrong += 1
-
+            st.session_state.human_game = st.session_state.human_game.guess(guess)
             st.session_state.clear_input = True
             check_turn_and_game_state()
             st.rerun()
 
 elif not st.session_state.game_over and st.session_state.turn == "ai":
 
-    ai_guess = predict_next_letter(
-        current_state=st.session_state.ai_masked_word,
-        guessed_letters=st.session_state.ai_guessed
-    )
+    # Precomputed by the round's background worker; decide synchronously if it is not there yet
+    ai_game = st.session_state.ai_game
+    ai_guess = st.session_state.ai_plan.next_guess(ai_game.guesses)
+    if ai_guess is None:
+        with st.spinner("🤖 AI is thinking..."):
+            ai_guess = ai_chooser(ai_game, ai_feature_state())
 
-    if ai_guess not in st.session_state.ai_guessed:
-        st.session_state.ai_guessed.append(ai_guess)
-
-        if ai_guess in st.session_state.target_word:
-            new_ai_mask = list(st.session_state.ai_masked_word)
-            for i, c in enumerate(st.session_state.target_word):
-                if c == ai_guess:
-                    new_ai_mask[i] = ai_guess
-            st.session_state.ai_masked_word = "".join(new_ai_mask)
-        else:
-            st.session_state.ai_wrong += 1
+    if ai_guess is not None and not ai_game.has_guessed(ai_guess):
+        positions = [i for i, c in enumerate(st.session_state.target_word) if c == ai_guess]
+        if "ai_features" in st.session_state:
+            st.session_state.ai_features.apply_guess(ai_guess, positions)
+        st.session_state.ai_game = ai_game.guess(ai_guess, positions)
 
     check_turn_and_game_state()
     st.rerun()
 
+# ------------------------------
+# Optional inference debug panel (HANGMAN_DEBUG_PANEL=1, timings need HANGMAN_PROFILE=1)
+# ------------------------------
+if os.environ.get("HANGMAN_DEBUG_PANEL", "0") == "1":
+    with st.expander("🔧 Inference profile"):
+        if inference_url:
+            st.json(inference_client.metrics())
+        else:
+            stats = profiling.snapshot()
+            if not stats["enabled"]:
+                st.caption("Profiling is off, start the app with HANGMAN_PROFILE=1")
+            st.table([
+                {"stage": name, "calls": s["count"], "rows": s["rows"], "mean (ms)": round(s["mean"] * 1e3, 3)}
+                for name, s in stats["stages"].items()
+            ])
+            st.table([
+                {"word length": length, "turns": t["count"], "mean (ms)": round(t["mean"] * 1e3, 3)}
+                for length, t in stats["turns_by_length"].items()
+            ])
+            st.json(stats["events"])
+            st.code(profiling.prometheus_text(), language="text")
+
 st.markdown("""
 <hr style="
     border: none;
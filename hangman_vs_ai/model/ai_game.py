@@ -0,0 +1,107 @@
+import threading
+from model.constants import max_lives
+from model.game_state import GameState
+
+class LazyResource:
+
+    """
+    Value built by `factory` on the first get(), once, on whichever thread asks first.
+
+    Lets the app hand background workers a model handle without loading the model up front
+    and without the workers calling back into Streamlit's caches.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self._value = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def get(self):
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self._value = self.factory()
+                    self._loaded = True
+        return self._value
+
+class AIGamePlan:
+
+    """
+    Plays the AI's whole game for a word ahead of time on a background worker.
+
+    The AI's guesses depend only on the target word, so they can be computed as soon as the
+    word is chosen. The app then reads the next guess from the plan and only runs the model
+    itself if the worker has not reached that turn yet.
+
+    Parameters:
+    -----------
+    word : str
+        Target word.
+    choose_letter : callable
+        choose_letter(game_state, feature_state) -> letter or None, the same decision function
+        the app would call synchronously (game_state is a GameState). It runs on the worker, so
+        it must only use resources resolved beforehand (no Streamlit calls).
+    max_lives : int
+        Number of incorrect guesses allowed.
+    track_features : bool
+        Keep a GameFeatureState for choose_letter (requires torch); otherwise it receives None.
+    """
+
+    def __init__(self, word, choose_letter, max_lives=max_lives, track_features=True):
+        self.word = word
+        self.choose_letter = choose_letter
+        self.max_lives = max_lives
+        self.track_features = track_features
+        self.guesses = []
+        self.done = False
+        self.error = None
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+
+    def start(self, executor=None):
+        # Runs on the given executor (shared across sessions) or a daemon thread of its own
+        if executor is not None:
+            executor.submit(self._play)
+        else:
+            threading.Thread(target=self._play, name=f"ai-plan-{self.word}", daemon=True).start()
+        return self
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def _play(self):
+        game = GameState(self.word)
+
+        try:
+            feature_state = None
+            if self.track_features:
+                # Imported on the worker so that starting a round never waits for torch
+                from model.inference import GameFeatureState
+                feature_state = GameFeatureState(len(self.word))
+
+            while not game.solved and game.wrong_count < self.max_lives and not self._cancelled.is_set():
+                letter = self.choose_letter(game, feature_state)
+                if letter is None or game.has_guessed(letter):
+                    break
+                positions = [i for i, c in enumerate(self.word) if c == letter]
+                if feature_state is not None:
+                    feature_state.apply_guess(letter, positions)
+                game = game.guess(letter, positions)
+                with self._lock:
+                    self.guesses.append(letter)
+        except Exception as error:
+            # The app falls back to synchronous inference, which will surface the problem itself
+            self.error = error
+        finally:
+            self.done = True
+
+    def next_guess(self, guessed_letters):
+
+        # Precomputed guess for the turn after guessed_letters, or None if the worker is not there
+        # yet (or the game diverged from the plan)
+        turn = len(guessed_letters)
+        with self._lock:
+            if turn < len(self.guesses) and self.guesses[:turn] == list(guessed_letters):
+                return self.guesses[turn]
+        return None
@@ -0,0 +1,156 @@
+import random
+import string
+from collections import Counter
+import numpy as np
+
+# Dictionary-filtering predictor backed by precomputed bitsets.
+#
+# For every word length the index keeps one bitset per (position, letter) and per letter
+# ("word contains letter"), stored as Python ints with bit i standing for the i-th word of
+# that length. The words consistent with a masked state are then a handful of bitwise ANDs,
+# and letter counts over the candidates come from per-word 26-bit letter-presence masks.
+
+_BIT_WEIGHTS = np.uint32(1) << np.arange(26, dtype=np.uint32)
+
+def _bitset(flags):
+    # Boolean array -> Python int with bit i set where flags[i] is True
+    return int.from_bytes(np.packbits(flags, bitorder='little').tobytes(), 'little')
+
+def _letter_mask(letters):
+    mask = 0
+    for letter in letters:
+        mask |= 1 << (ord(letter) - ord('a'))
+    return mask
+
+class CandidateIndex:
+
+    def __init__(self, words):
+        words = sorted({word.strip().lower() for word in words if word.strip().isalpha()})
+        self.words = {}
+        self.all_bits = {}
+        self.position_bits = {}
+        self.contains_bits = {}
+        self.letter_masks = {}
+
+        for length in sorted({len(word) for word in words}):
+            group = [word for word in words if len(word) == length]
+            chars = np.frombuffer(''.join(group).encode('ascii'), dtype=np.uint8).reshape(len(group), length) - ord('a')
+            letters = np.arange(26, dtype=np.uint8)
+
+            # [num_words, length, 26] one-hot of the letter at each position
+            one_hot = chars[:, :, None] == letters
+            presence = one_hot.any(axis=1)
+
+            self.words[length] = group
+            self.all_bits[length] = (1 << len(group)) - 1
+            self.position_bits[length] = [[_bitset(one_hot[:, pos, c]) for c in range(26)] for pos in range(length)]
+            self.contains_bits[length] = [_bitset(presence[:, c]) for c in range(26)]
+            self.letter_masks[length] = (presence * _BIT_WEIGHTS).sum(axis=1, dtype=np.uint32)
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(f.read().split())
+
+    def candidate_bits(self, current_state, guessed_letters):
+
+        length = len(current_state)
+        if length not in self.all_bits:
+            return 0
+
+        position_bits = self.position_bits[length]
+        contains_bits = self.contains_bits[length]
+        bits = self.all_bits[length]
+
+        state_letters = set(current_state) - {'_'}
+        correct = [ord(letter) - ord('a') for letter in state_letters]
+        wrong = [ord(letter) - ord('a') for letter in set(guessed_letters) - state_letters]
+
+        # Wrong guesses: the word cannot contain the letter anywhere
+        for c in wrong:
+            bits &= ~contains_bits[c]
+
+        for pos, letter in enumerate(current_state):
+            if letter == '_':
+                # Hidden positions cannot hold a letter that was already revealed elsewhere
+                for c in correct:
+                    bits &= ~position_bits[pos][c]
+            else:
+                bits &= position_bits[pos][ord(letter) - ord('a')]
+            if not bits:
+                break
+
+        return bits
+
+    def candidate_indices(self, current_state, guessed_letters):
+        length = len(current_state)
+        bits = self.candidate_bits(current_state, guessed_letters)
+        if not bits:
+            return np.zeros(0, dtype=np.int64)
+        num_words = len(self.words[length])
+        flags = np.unpackbits(np.frombuffer(bits.to_bytes((num_words + 7) // 8, 'little'), dtype=np.uint8), bitorder='little')
+        return np.flatnonzero(flags[:num_words])
+
+    def candidates(self, current_state, guessed_letters):
+        words = self.words.get(len(current_state), [])
+        return [words[i] for i in self.candidate_indices(current_state, guessed_letters)]
+
+    def letter_counts(self, current_state, guessed_letters):
+
+        # Number of candidate words containing each unguessed letter, shape [26]
+        idx = self.candidate_indices(current_state, guessed_letters)
+        if len(idx) == 0:
+            return np.zeros(26, dtype=np.int64), 0
+        # Every letter outside the hidden positions has been guessed, so masking out the guessed
+        # letters leaves exactly the letters that can still appear under a '_'
+        masks = self.letter_masks[len(current_state)][idx] & np.uint32(~_letter_mask(guessed_letters) & ((1 << 26) - 1))
+        counts = ((masks[:, None] & _BIT_WEIGHTS) != 0).sum(axis=0)
+        return counts, len(idx)
+
+    def predict(self, current_state, guessed_letters):
+
+        # Most common unguessed letter among the candidates, or None if no word matches
+        counts, num_candidates = self.letter_counts(current_state, guessed_letters)
+        if num_candidates == 0 or counts.max() == 0:
+            return None, num_candidates
+        return string.ascii_lowercase[int(counts.argmax())], num_candidates
+
+def predict_letter_with_heuristics(hangman_str, guessed_letters, words_list):
+
+    # Linear-scan baseline from the notebook, kept for latency comparisons
+    if len(guessed_letters) == 0:
+        return 'e'
+    else:
+        possible_words = []
+        for word in words_list:
+            valid_word = True
+            if len(hangman_str) != len(word):
+                continue
+            else:
+                for i, letter in enumerate(word):
+                    if hangman_str[i] != '_' and hangman_str[i] != word[i]:
+                        valid_word = False
+                        break
+                    elif hangman_str[i] == '_' and word[i] in guessed_letters:
+                        valid_word = False
+                        break
+            if valid_word:
+                possible_words.append(word)
+        letter_counts = Counter()
+        for word in possible_words:
+            masked_letters = set()
+            for i, letter in enumerate(word):
+                if hangman_str[i] == '_' and letter not in guessed_letters:
+                    masked_letters.add(letter)
+            for letter in masked_letters:
+                letter_counts[letter] += 1
+        total_letters = sum(letter_counts.values())
+        letter_freq = {
+            letter: count / total_letters
+            for letter, count in letter_counts.items()
+            if letter in string.ascii_lowercase and letter not in guessed_letters
+            }
+        if not letter_freq:
+            return random.choice([letter for letter in string.ascii_lowercase if letter not in guessed_letters])
+        best_guess = sorted(letter_freq, key=letter_freq.get, reverse=True)[0]
+        return best_guess
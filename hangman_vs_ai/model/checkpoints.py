@@ -0,0 +1,79 @@
+import hashlib
+import json
+import os
+
+# Torch-free checkpoint bookkeeping: model variants, where each artifact derived from a
+# checkpoint lives, and checkpoint hashes. Importable by the app before torch is loaded.
+
+# Architectures load_model can build. 'base' is the trained teacher; the smaller ones are
+# distilled students (model/distill.py) with the same forward signature. All of them are trained
+# without the [PAD] attention mask; a checkpoint trained with it (model/train.py padding_mask=True)
+# says so in its metadata file (checkpoint_meta_path).
+MODEL_VARIANTS = {
+    'base': {'d_model': 256, 'nhead': 4, 'num_layers': 4, 'dim_feedforward': 512},
+    'small': {'d_model': 128, 'nhead': 4, 'num_layers': 2, 'dim_feedforward': 256},
+    'tiny': {'d_model': 64, 'nhead': 4, 'num_layers': 1, 'dim_feedforward': 128}
+}
+
+# Digests keyed by (absolute path, mtime_ns, size): a checkpoint is hashed once per process
+# however many artifacts validate against it, and rewriting the file changes the key.
+# parallel_eval hands the parent's entries to its workers so they do not hash it again.
+sha256_cache = {}
+
+def checkpoint_sha256(model_path):
+    stat = os.stat(model_path)
+    key = (os.path.abspath(model_path), stat.st_mtime_ns, stat.st_size)
+    if key not in sha256_cache:
+        digest = hashlib.sha256()
+        with open(model_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        sha256_cache[key] = digest.hexdigest()
+    return sha256_cache[key]
+
+def _with_suffix(model_path, suffix):
+    root, ext = os.path.splitext(model_path)
+    return f"{root}.{suffix}{ext or '.pt'}"
+
+def variant_model_path(model_path: str, variant: str) -> str:
+    # Student checkpoints sit next to the teacher: transformer.pt -> transformer.small.pt
+    if variant == 'base':
+        return model_path
+    return _with_suffix(model_path, variant)
+
+def checkpoint_meta_path(model_path: str) -> str:
+    # transformer.pt -> transformer.meta.json (how the checkpoint was trained)
+    root, _ = os.path.splitext(model_path)
+    return f"{root}.meta.json"
+
+def write_checkpoint_meta(model_path: str, **meta) -> str:
+    # Stored with the checkpoint's hash, so the file is ignored once the checkpoint is replaced
+    path = checkpoint_meta_path(model_path)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'checkpoint_sha256': checkpoint_sha256(model_path), **meta}, f, indent=2)
+    return path
+
+def read_checkpoint_meta(model_path: str) -> dict:
+    # Training metadata of an existing checkpoint, {} when missing or written for another checkpoint
+    path = checkpoint_meta_path(model_path)
+    if not os.path.exists(path) or not os.path.exists(model_path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        meta = json.load(f)
+    return meta if meta.get('checkpoint_sha256') == checkpoint_sha256(model_path) else {}
+
+def trained_with_padding_mask(model_path: str) -> bool:
+    return bool(read_checkpoint_meta(model_path).get('padding_mask', False))
+
+def frozen_model_path(model_path: str) -> str:
+    # transformer.pt -> transformer.frozen.pt
+    return _with_suffix(model_path, 'frozen')
+
+def quantized_model_path(model_path: str) -> str:
+    # transformer.pt -> transformer.int8.pt
+    return _with_suffix(model_path, 'int8')
+
+def numpy_model_path(model_path: str) -> str:
+    # transformer.pt -> transformer.npz (NumPy backend export)
+    root, _ = os.path.splitext(model_path)
+    return f"{root}.npz"
@@ -0,0 +1,70 @@
+import http.client
+import json
+import socket
+import threading
+from urllib.parse import urlparse
+
+# Thin client for model/server.py. Imports neither torch nor the model, so a game front-end
+# in client mode stays light and all sessions share one warm model.
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+
+    def __init__(self, socket_path, timeout=None):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+class InferenceClient:
+
+    """
+    Letter predictions from a running inference server.
+
+    url is either http://host:port or unix:///path/to/socket. Every thread keeps its own
+    keep-alive connection, which is re-opened once if the server dropped it.
+    """
+
+    def __init__(self, url, timeout=5.0):
+        self.url = url
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connect(self):
+        parsed = urlparse(self.url)
+        if parsed.scheme == 'unix':
+            return _UnixHTTPConnection(parsed.path, timeout=self.timeout)
+        return http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=self.timeout)
+
+    def _request(self, method, path, payload=None):
+        body = json.dumps(payload).encode('utf-8') if payload is not None else None
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+
+        for attempt in range(2):
+            connection = getattr(self._local, 'connection', None)
+            if connection is None:
+                connection = self._local.connection = self._connect()
+            try:
+                connection.request(method, path, body=body, headers=headers)
+                response = connection.getresponse()
+                data = json.loads(response.read())
+            except (ConnectionError, http.client.HTTPException, OSError):
+                connection.close()
+                self._local.connection = None
+                if attempt:
+                    raise
+                continue
+            if response.status != 200:
+                raise RuntimeError(f"Inference server error {response.status}: {data.get('error')}")
+            return data
+
+    def predict_next_letter(self, current_state, guessed_letters):
+        return self._request('POST', '/predict', {'state': current_state, 'guessed': list(guessed_letters)})['letter']
+
+    def metrics(self):
+        return self._request('GET', '/metrics')
+
+    def health(self):
+        return self._request('GET', '/health')
@@ -0,0 +1,78 @@
+import string
+
+# Shared game and vocabulary constants (kept free of torch so lightweight modules can import them)
+
+max_lives = 6
+max_len = 10
+alphabet = list(string.ascii_lowercase)
+guess_freq = {
+    'e': 0.1175169493434241,
+    's': 0.09242216065650082,
+    'i': 0.0817352523819177,
+    'a': 0.07717338258591046,
+    'r': 0.07275266346825236,
+    'n': 0.06424307948735275,
+    't': 0.06347726197716062,
+    'o': 0.061044665180079734,
+    'l': 0.053326425959711994,
+    'd': 0.04023845455023237,
+    'c': 0.03906870584348792,
+    'u': 0.03410891126277301,
+    'g': 0.031182287091470143,
+    'p': 0.028631063660457538,
+    'm': 0.027730101883760915,
+    'h': 0.0234640478711024,
+    'b': 0.02069809521664377,
+    'y': 0.01571877979743376,
+    'f': 0.014406378809379013,
+    'k': 0.01061783453836971,
+    'w': 0.00980847054230391,
+    'v': 0.00963578620177039,
+    'z': 0.00413241134911518,
+    'x': 0.003072279658535487,
+    'j': 0.00197911270281025,
+    'q': 0.0018154379800436966
+ }
+guess_order = sorted(guess_freq, key=guess_freq.get, reverse=True)
+ngram_list = [
+    'in',
+    'er',
+    'es',
+    'ed',
+    'ng',
+    'te',
+    're',
+    'st',
+    'le',
+    'at',
+    'ti',
+    'an',
+    'en',
+    'ri',
+    'ar',
+    'on',
+    'li',
+    'ra',
+    'al',
+    'or',
+    'ing',
+    'ers',
+    'ate',
+    'ter',
+    'ies',
+    'est',
+    'tin',
+    'ine',
+    'lin',
+    'ent',
+    'nes',
+    'ess',
+    'ted',
+    'ion',
+    'ati'
+]
+# Map: MASK -> 0, PAD -> 1, 'a' -> 2, ..., 'z' -> 27
+special_tokens = ['[PAD]', '[MASK]']
+alphabet = list(string.ascii_lowercase)
+all_tokens = special_tokens + alphabet
+vocab = {letter: index for index, letter in enumerate(all_tokens)}
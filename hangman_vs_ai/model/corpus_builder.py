@@ -0,0 +1,104 @@
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+from model.data_pipeline import iter_encoded_samples
+from model.dataset_store import DatasetWriter, FIELDS, dataset_key, open_arrays, pack_samples, split_words
+
+# Multi-process version of build_dataset.
+#
+# The shuffled word list is first split into training and validation words (split_words), and
+# each side is cut into fixed-size chunks (independent of the worker count). Every chunk is
+# generated by one worker into its own shard directory with per-word RNG streams (word_seed),
+# rows are permuted within the chunk by a chunk-seeded generator, and the shards are
+# concatenated in chunk order: all training chunks, then all validation chunks. A chunk never
+# holds words of both sides, so meta 'num_train_samples' is a word-level split, and the merged
+# dataset is byte-identical for any number of workers.
+
+def _build_shard(task):
+
+    chunk_idx, words, num_permutations, seed, shard_path = task
+
+    # Step 1: Generate and encode every sample of the chunk (per-word seeds, no shared RNG)
+    packed = pack_samples(list(iter_encoded_samples(words, num_permutations, seed)))
+
+    # Step 2: Mix samples of different words within the chunk
+    order = np.random.default_rng([seed, chunk_idx]).permutation(len(packed['label']))
+    writer = DatasetWriter(shard_path, meta={'chunk': chunk_idx, 'num_words': len(words)})
+    writer.write_packed({name: values[order] for name, values in packed.items()})
+    writer.close()
+    return chunk_idx, writer.num_samples
+
+def build_dataset_parallel(words, cache_dir='data_cache', num_permutations=6, seed=42, num_workers=None,
+                           chunk_words=2048, val_fraction=0.3):
+
+    """
+    Generate the encoded training set on a process pool, or reuse a cached one.
+
+    Inputs:
+    -------
+    words : list of str
+        Training words.
+    cache_dir : str or Path
+        Directory holding datasets, one sub-directory per content hash.
+    num_permutations, seed :
+        Generation parameters (part of the hash, as in build_dataset).
+    num_workers : int
+        Worker processes, defaults to os.cpu_count(). Does not change the output.
+    chunk_words : int
+        Words per shard (part of the hash, since it sets the shuffling granularity).
+    val_fraction : float
+        Share of the words held out for validation (part of the hash), stored after the
+        training samples.
+
+    Outputs:
+    --------
+    Path of the dataset directory.
+    """
+
+    words = list(words)
+    key = dataset_key(words, builder='parallel', num_permutations=num_permutations, seed=seed, chunk_words=chunk_words,
+                      val_fraction=val_fraction)
+    path = Path(cache_dir) / key
+    if (path / 'meta.json').exists():
+        return path
+
+    # Split by word first; training and validation words are chunked separately
+    train_words, val_words = split_words(words, val_fraction, seed)
+    chunks = [train_words[lo:lo + chunk_words] for lo in range(0, len(train_words), chunk_words)]
+    num_train_chunks = len(chunks)
+    chunks += [val_words[lo:lo + chunk_words] for lo in range(0, len(val_words), chunk_words)]
+
+    shard_dir = Path(cache_dir) / f'{key}.shards'
+    shutil.rmtree(shard_dir, ignore_errors=True)
+    shard_dir.mkdir(parents=True)
+    tasks = [
+        (chunk_idx, chunk, num_permutations, seed, shard_dir / f'{chunk_idx:05d}')
+        for chunk_idx, chunk in enumerate(chunks)
+    ]
+
+    # Step 1: Build the shards
+    num_workers = num_workers or os.cpu_count()
+    if num_workers == 1:
+        for task in tasks:
+            _build_shard(task)
+    else:
+        with ProcessPoolExecutor(max_workers=num_workers) as pool:
+            list(pool.map(_build_shard, tasks))
+
+    # Step 2: Concatenate the shards in chunk order (training chunks first)
+    writer = DatasetWriter(path, meta={
+        'key': key, 'num_words': len(words), 'num_val_words': len(val_words), 'num_permutations': num_permutations,
+        'seed': seed, 'val_fraction': val_fraction, 'builder': 'parallel', 'chunk_words': chunk_words,
+        'num_shards': len(tasks)
+    })
+    for chunk_idx, task in enumerate(tasks):
+        if chunk_idx == num_train_chunks:
+            writer.meta['num_train_samples'] = writer.num_samples
+        _, arrays = open_arrays(task[-1])
+        writer.write_packed({name: np.asarray(arrays[name]) for name in FIELDS})
+    writer.meta.setdefault('num_train_samples', writer.num_samples)
+    writer.close()
+    shutil.rmtree(shard_dir, ignore_errors=True)
+    return path
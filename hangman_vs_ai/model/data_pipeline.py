@@ -0,0 +1,217 @@
+import hashlib
+import random
+from pathlib import Path
+import numpy as np
+import torch
+from torch.utils.data import IterableDataset, Sampler, get_worker_info
+from torch.utils.data.dataloader import default_collate
+from model.constants import guess_order, vocab
+from model.inference import generate_features, encode_features, trim_batch
+
+def load_words(path):
+
+    # Same filtering as the notebook: one lowercase alphabetical word per line
+    words = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        word = line.strip().lower()
+        if word.isalpha():
+            words.append(word)
+    return words
+
+def word_seed(word, seed=42, epoch=0):
+
+    # Stable per-word seed (independent of PYTHONHASHSEED, worker count and word position)
+    digest = hashlib.blake2b(f"{seed}:{epoch}:{word}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+def generate_masked_samples(word, guess_order, num_permutations, rng):
+
+    """
+    Generates masked-word samples for a single word (streaming version of the notebook function).
+
+    Each permutation masks all unique letters of the word in a random order, followed by a
+    deterministic masking phase in reversed guess order. Duplicate (state, remaining letters)
+    pairs are dropped.
+
+    Inputs:
+    -------
+    word : str
+        Word to generate training samples from.
+    guess_order : list of str
+        Letters ordered by frequency in the training dictionary.
+    num_permutations : int
+        Number of random masking orders.
+    rng : np.random.Generator
+        Generator seeded for this word.
+
+    Outputs:
+    --------
+    Yields dicts with 'current_state', 'next_guesses' and 'original_word'.
+    """
+
+    word_letters = set(word)
+    guess_order_word = [c for c in guess_order if c in word_letters]
+    seen_samples = set()
+
+    def remaining(masked_word):
+        return [letter for letter in guess_order_word if letter not in masked_word]
+
+    def sample(masked_word, letters):
+        key = (masked_word, tuple(sorted(letters)))
+        if letters and key not in seen_samples:
+            seen_samples.add(key)
+            return {'current_state': masked_word, 'next_guesses': letters, 'original_word': word}
+        return None
+
+    # Random masking phase (sorted so the permutation does not depend on set iteration order)
+    for _ in range(num_permutations):
+        masked_word = word
+        for letter in rng.permuted(sorted(word_letters)):
+            masked_word = masked_word.replace(letter, '_')
+            result = sample(masked_word, remaining(masked_word))
+            if result:
+                yield result
+
+    # Deterministic masking using reversed guess order
+    masked_word = word
+    for letter in reversed(guess_order_word):
+        masked_word = masked_word.replace(letter, '_')
+        result = sample(masked_word, remaining(masked_word))
+        if result:
+            yield result
+
+def iter_encoded_samples(words, num_permutations=6, seed=42, epoch=0):
+
+    # Lazily generate, featurize and encode samples one word at a time
+    for word in words:
+        word_rng_seed = word_seed(word, seed, epoch)
+        samples = list(generate_masked_samples(word, guess_order, num_permutations, np.random.default_rng(word_rng_seed)))
+        features = generate_features(samples, inference=False, rng=random.Random(word_rng_seed))
+        yield from encode_features(features, inference=False)
+
+def shuffle_buffer(samples, buffer_size, rng):
+
+    # Reservoir-style shuffle buffer: mixes samples of neighbouring words with bounded memory
+    buffer = []
+    for sample in samples:
+        if len(buffer) < buffer_size:
+            buffer.append(sample)
+            continue
+        idx = rng.randrange(len(buffer))
+        yield buffer[idx]
+        buffer[idx] = sample
+
+    rng.shuffle(buffer)
+    yield from buffer
+
+def to_tensors(sample):
+
+    # Same dtypes as HangmanDataset.__getitem__ in the notebook
+    return {
+        'input_ids': torch.tensor(sample['input_ids'], dtype=torch.long),
+        'masked_idx': torch.tensor(sample['masked_idx'], dtype=torch.long),
+        'norm_features': torch.tensor(sample['norm_features'], dtype=torch.float),
+        'char_multi_hot': torch.tensor(sample['char_multi_hot'], dtype=torch.float),
+        'ngram_vector': torch.tensor(sample['ngram_vector'], dtype=torch.float),
+        'label': torch.tensor(sample['label'], dtype=torch.float)
+    }
+
+class StreamingHangmanDataset(IterableDataset):
+
+    """
+    Streams encoded training samples straight from a word list.
+
+    Words are sharded across DataLoader workers and every word is generated with its own
+    seed, so the stream for a given (seed, epoch) is reproducible and memory stays flat no
+    matter how many permutations per word are requested. A shuffle buffer mixes samples of
+    neighbouring words before they are batched.
+    """
+
+    def __init__(self, words, num_permutations=6, seed=42, shuffle_words=True, shuffle_buffer=10_000):
+        self.words = list(words)
+        self.num_permutations = num_permutations
+        self.seed = seed
+        self.shuffle_words = shuffle_words
+        self.shuffle_buffer = shuffle_buffer
+        self.epoch = 0
+
+    def set_epoch(self, epoch):
+        # Call before each epoch to draw new masks / guess histories for every word
+        self.epoch = epoch
+
+    def _worker_words(self):
+        words = self.words
+        if self.shuffle_words:
+            words = words[:]
+            random.Random(f"{self.seed}:{self.epoch}").shuffle(words)
+
+        worker_info = get_worker_info()
+        if worker_info is None:
+            return words, 0
+        return words[worker_info.id::worker_info.num_workers], worker_info.id
+
+    def __iter__(self):
+        words, worker_id = self._worker_words()
+        samples = iter_encoded_samples(words, self.num_permutations, self.seed, self.epoch)
+
+        if self.shuffle_buffer > 1:
+            samples = shuffle_buffer(samples, self.shuffle_buffer, random.Random(f"{self.seed}:{self.epoch}:{worker_id}"))
+
+        for sample in samples:
+            yield to_tensors(sample)
+
+def word_lengths(encoded):
+
+    # Number of non-[PAD] tokens of every encoded sample (list of dicts or [N, max_len] array)
+    if isinstance(encoded, np.ndarray):
+        return (encoded != vocab['[PAD]']).sum(axis=1)
+    return np.array([sum(token != vocab['[PAD]'] for token in sample['input_ids']) for sample in encoded])
+
+class LengthBucketBatchSampler(Sampler):
+
+    """
+    Batch sampler that only puts samples of the same word length in a batch.
+
+    Indices are shuffled within each length bucket, cut into batches, and the batches of all
+    buckets are shuffled together, so every epoch still sees the whole dataset in random order.
+    Combine with collate_trimmed (and a padding-mask model) so a batch of 5-letter words runs
+    5 positions instead of max_len.
+    """
+
+    def __init__(self, lengths, batch_size, shuffle=True, drop_last=False, seed=42):
+        self.lengths = np.asarray(lengths)
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        self.seed = seed
+        self.epoch = 0
+        self.buckets = [np.flatnonzero(self.lengths == length) for length in np.unique(self.lengths)]
+
+    def set_epoch(self, epoch):
+        self.epoch = epoch
+
+    def _batches(self):
+        rng = np.random.default_rng([self.seed, self.epoch])
+        batches = []
+        for bucket in self.buckets:
+            if self.shuffle:
+                bucket = rng.permutation(bucket)
+            for lo in range(0, len(bucket), self.batch_size):
+                batch = bucket[lo:lo + self.batch_size]
+                if len(batch) == self.batch_size or not self.drop_last:
+                    batches.append(batch.tolist())
+        if self.shuffle:
+            batches = [batches[i] for i in rng.permutation(len(batches))]
+        return batches
+
+    def __iter__(self):
+        return iter(self._batches())
+
+    def __len__(self):
+        if self.drop_last:
+            return sum(len(bucket) // self.batch_size for bucket in self.buckets)
+        return sum(-(-len(bucket) // self.batch_size) for bucket in self.buckets)
+
+def collate_trimmed(samples):
+    # default_collate, then drop the [PAD] columns no sample in the batch reaches
+    return trim_batch(default_collate(samples))
@@ -0,0 +1,245 @@
+import hashlib
+import json
+import math
+import os
+import random
+import shutil
+from pathlib import Path
+import numpy as np
+import torch
+from torch.utils.data import Dataset
+from model.constants import max_len, guess_order, ngram_list, vocab
+from model.data_pipeline import iter_encoded_samples, shuffle_buffer
+from model.inference import trim_batch
+
+# Compact on-disk replacement for encoded_features.pkl.
+#
+# A dataset is a directory holding one fixed-width binary file per field (struct-of-arrays)
+# plus a meta.json. Every file is read back through np.memmap, so batches are zero-copy
+# slices and the page cache is shared between DataLoader workers.
+#
+# The word list is split into training and validation words before any sample is generated:
+# training samples are stored first, validation samples after them (meta 'num_train_samples'),
+# so no word contributes samples to both sides of the split.
+
+FORMAT_VERSION = 2
+
+# name -> (on-disk dtype, columns on disk, columns in the model input)
+FIELDS = {
+    'input_ids': ('int8', max_len, max_len),
+    'masked_idx': ('uint8', math.ceil(max_len / 8), max_len),        # bit-packed
+    'norm_features': ('float16', 19, 19),
+    'char_multi_hot': ('uint8', math.ceil(26 * 4 / 8), 26 * 4),      # bit-packed
+    'ngram_vector': ('float16', len(ngram_list), len(ngram_list)),
+    'label': ('float16', 26, 26)
+}
+PACKED_FIELDS = ('masked_idx', 'char_multi_hot')
+
+def dataset_key(words, **params):
+
+    # Content hash of the word list and everything that changes the generated samples
+    digest = hashlib.sha256()
+    digest.update(json.dumps({
+        'format_version': FORMAT_VERSION,
+        'max_len': max_len,
+        'guess_order': guess_order,
+        'ngram_list': ngram_list,
+        'params': params
+    }, sort_keys=True).encode('utf-8'))
+    for word in words:
+        digest.update(word.encode('utf-8'))
+        digest.update(b'\n')
+    return digest.hexdigest()[:16]
+
+def split_words(words, val_fraction=0.3, seed=42):
+
+    # Seeded shuffle of the word list, cut into (training words, validation words)
+    words = list(words)
+    random.Random(seed).shuffle(words)
+    cut = len(words) - int(len(words) * val_fraction)
+    return words[:cut], words[cut:]
+
+def pack_samples(encoded):
+
+    # List of encode_features dicts -> dict of on-disk arrays
+    packed = {}
+    for name, (dtype, _, _) in FIELDS.items():
+        values = np.array([sample[name] for sample in encoded])
+        if name in PACKED_FIELDS:
+            values = np.packbits(values.astype(np.uint8), axis=1)
+        packed[name] = values.astype(dtype)
+    return packed
+
+class DatasetWriter:
+
+    """
+    Appends packed samples to a dataset directory. Files are written to a temporary
+    directory and moved into place by close(), so readers never see a partial dataset.
+    """
+
+    def __init__(self, path, meta=None):
+        self.path = Path(path)
+        self.tmp_path = self.path.with_name(self.path.name + f'.tmp-{os.getpid()}')
+        shutil.rmtree(self.tmp_path, ignore_errors=True)
+        self.tmp_path.mkdir(parents=True)
+        self.files = {name: open(self.tmp_path / f'{name}.bin', 'wb') for name in FIELDS}
+        self.meta = dict(meta or {})
+        self.num_samples = 0
+
+    def write_encoded(self, encoded):
+        if encoded:
+            self.write_packed(pack_samples(encoded))
+
+    def write_packed(self, packed):
+        num_rows = len(packed['label'])
+        for name, (dtype, columns, _) in FIELDS.items():
+            values = np.ascontiguousarray(packed[name], dtype=dtype)
+            assert values.shape == (num_rows, columns), f"{name}: expected {(num_rows, columns)}, got {values.shape}"
+            self.files[name].write(values.tobytes())
+        self.num_samples += num_rows
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+        self.meta.update({
+            'format_version': FORMAT_VERSION,
+            'num_samples': self.num_samples,
+            'fields': {name: {'dtype': dtype, 'columns': columns} for name, (dtype, columns, _) in FIELDS.items()}
+        })
+        (self.tmp_path / 'meta.json').write_text(json.dumps(self.meta, indent=2))
+        shutil.rmtree(self.path, ignore_errors=True)
+        os.replace(self.tmp_path, self.path)
+        return self.path
+
+def build_dataset(words, cache_dir='data_cache', num_permutations=6, seed=42, buffer_size=100_000, chunk_size=65_536,
+                  val_fraction=0.3):
+
+    """
+    Generate and store the encoded training set for a word list, or reuse it if a dataset with
+    the same content hash already exists.
+
+    Inputs:
+    -------
+    words : list of str
+        Training words.
+    cache_dir : str or Path
+        Directory holding datasets, one sub-directory per content hash.
+    num_permutations, seed :
+        Generation parameters passed to iter_encoded_samples (part of the hash).
+    buffer_size : int
+        Shuffle buffer size, so contiguous batches mix samples from many words.
+    chunk_size : int
+        Samples converted and written at a time.
+    val_fraction : float
+        Share of the words held out for validation (part of the hash). Their samples are stored
+        after the training samples and shuffled separately.
+
+    Outputs:
+    --------
+    Path of the dataset directory.
+    """
+
+    words = list(words)
+    key = dataset_key(words, num_permutations=num_permutations, seed=seed, buffer_size=buffer_size, val_fraction=val_fraction)
+    path = Path(cache_dir) / key
+    if (path / 'meta.json').exists():
+        return path
+
+    # Step 1: Split by word, so the shuffle buffer never mixes training and validation samples
+    train_words, val_words = split_words(words, val_fraction, seed)
+
+    writer = DatasetWriter(path, meta={'key': key, 'num_words': len(words), 'num_val_words': len(val_words),
+                                       'num_permutations': num_permutations, 'seed': seed, 'val_fraction': val_fraction})
+
+    # Step 2: Training samples first, then validation samples, each through its own buffer
+    for split_idx, split in enumerate((train_words, val_words)):
+        samples = shuffle_buffer(iter_encoded_samples(split, num_permutations, seed), buffer_size, random.Random(seed + split_idx))
+        chunk = []
+        for sample in samples:
+            chunk.append(sample)
+            if len(chunk) >= chunk_size:
+                writer.write_encoded(chunk)
+                chunk = []
+        writer.write_encoded(chunk)
+        if split_idx == 0:
+            writer.meta['num_train_samples'] = writer.num_samples
+    return writer.close()
+
+def open_arrays(path):
+
+    # Read-only (copy-on-write) memmaps of every field, shaped [num_samples, columns]
+    path = Path(path)
+    meta = json.loads((path / 'meta.json').read_text())
+    assert meta['format_version'] == FORMAT_VERSION, f"Unsupported dataset format {meta['format_version']}"
+    num_samples = meta['num_samples']
+    arrays = {}
+    for name, (dtype, columns, _) in FIELDS.items():
+        if num_samples == 0:
+            arrays[name] = np.zeros((0, columns), dtype=dtype)
+        else:
+            arrays[name] = np.memmap(path / f'{name}.bin', dtype=dtype, mode='c', shape=(num_samples, columns))
+    return meta, arrays
+
+class MemmapHangmanDataset(Dataset):
+
+    """
+    Batch-level replacement for HangmanDataset backed by a memory-mapped dataset directory.
+
+    Each item is a whole batch: a contiguous row slice of every field, unpacked and cast in a
+    handful of vectorized ops (no per-item torch.tensor calls). Use it with
+    DataLoader(dataset, batch_size=None, shuffle=True) to shuffle batch order.
+
+    bucket_by_length=True orders the rows by word length (stable, so the shuffled generation
+    order is kept within a length) and trims each batch to its longest word, for models
+    loaded with a padding mask. Batches are then gathered rows instead of contiguous slices.
+    """
+
+    def __init__(self, path, batch_size=512, start=0, stop=None, inference=False, bucket_by_length=False):
+        self.meta, self.arrays = open_arrays(path)
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.start = start
+        self.stop = self.meta['num_samples'] if stop is None else stop
+        self.inference = inference
+        self.bucket_by_length = bucket_by_length
+        self.order = None
+        if bucket_by_length:
+            lengths = (self.arrays['input_ids'][self.start:self.stop] != vocab['[PAD]']).sum(axis=1)
+            self.order = self.start + np.argsort(lengths, kind='stable')
+
+    def __len__(self):
+        return math.ceil((self.stop - self.start) / self.batch_size)
+
+    def split(self):
+        # (training, validation) datasets at the stored word-level boundary
+        cut = min(max(self.meta['num_train_samples'], self.start), self.stop)
+        return (
+            MemmapHangmanDataset(self.path, self.batch_size, self.start, cut, self.inference, self.bucket_by_length),
+            MemmapHangmanDataset(self.path, self.batch_size, cut, self.stop, self.inference, self.bucket_by_length)
+        )
+
+    def __getitem__(self, idx):
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError(idx)
+        lo = self.start + idx * self.batch_size
+        hi = min(lo + self.batch_size, self.stop)
+
+        if self.order is None:
+            rows = {name: self.arrays[name][lo:hi] for name in FIELDS}
+        else:
+            index = self.order[lo - self.start:hi - self.start]
+            rows = {name: self.arrays[name][index] for name in FIELDS}
+        output = {
+            'input_ids': torch.from_numpy(rows['input_ids']).long(),
+            'masked_idx': torch.from_numpy(np.unpackbits(rows['masked_idx'], axis=1, count=FIELDS['masked_idx'][2])).long(),
+            'norm_features': torch.from_numpy(rows['norm_features']).float(),
+            'char_multi_hot': torch.from_numpy(np.unpackbits(rows['char_multi_hot'], axis=1, count=FIELDS['char_multi_hot'][2])).float(),
+            'ngram_vector': torch.from_numpy(rows['ngram_vector']).float()
+        }
+
+        if not self.inference:
+            output['label'] = torch.from_numpy(rows['label']).float()
+
+        return trim_batch(output) if self.bucket_by_length else output
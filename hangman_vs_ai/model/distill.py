@@ -0,0 +1,117 @@
+import copy
+import torch
+import torch.nn as nn
+from torch.optim import AdamW
+from torch.utils.data import DataLoader
+from model.inference import build_model, load_state_dict_file, model_from_state_dict
+from model.dataset_store import MemmapHangmanDataset
+
+# Knowledge distillation of the 4-layer teacher into a smaller HangmanTransformer variant.
+#
+# The student is trained against the teacher's sigmoid outputs (soft targets), optionally mixed
+# with the hard multi-label targets of the dataset, on the memory-mapped training set built by
+# model/dataset_store.py.
+
+INPUT_KEYS = ('input_ids', 'masked_idx', 'norm_features', 'char_multi_hot', 'ngram_vector')
+
+def distillation_loss(student_logits, teacher_probs, labels, alpha=0.8):
+    # alpha * BCE(student, teacher probabilities) + (1 - alpha) * BCE(student, hard labels)
+    soft = nn.functional.binary_cross_entropy_with_logits(student_logits, teacher_probs)
+    if alpha >= 1.0:
+        return soft
+    hard = nn.functional.binary_cross_entropy_with_logits(student_logits, labels)
+    return alpha * soft + (1 - alpha) * hard
+
+def distill(teacher_path, dataset_path, output_path, variant='small', num_epochs=10, batch_size=512,
+            lr=1e-3, alpha=0.8, patience=2, device=None):
+
+    """
+    Train a student variant to reproduce the teacher's letter probabilities.
+
+    Inputs:
+    -------
+    teacher_path : str
+        Checkpoint of the base HangmanTransformer.
+    dataset_path : str or Path
+        Dataset directory from build_dataset().
+    output_path : str
+        Where the best student state_dict is saved (see variant_model_path()).
+    variant : str
+        Student architecture, a MODEL_VARIANTS key other than 'base'.
+    num_epochs, batch_size, lr, patience :
+        Training schedule; stops early after `patience` epochs without a lower validation loss.
+    alpha : float
+        Weight of the soft (teacher) targets against the hard dataset labels.
+
+    Outputs:
+    --------
+    history : list of dict
+        Per-epoch train/validation loss and top-1 agreement with the teacher.
+    """
+
+    device = torch.device(device or ('cuda' if torch.cuda.is_available() else 'cpu'))
+
+    # Step 1: Frozen teacher and fresh student
+    teacher = model_from_state_dict(load_state_dict_file(teacher_path), 'base')
+    teacher.to(device).eval()
+    for param in teacher.parameters():
+        param.requires_grad_(False)
+
+    student = build_model(variant).to(device)
+    optimizer = AdamW(student.parameters(), lr=lr, weight_decay=1e-2)
+
+    # Step 2: Whole-batch memmap datasets (shuffled batch order, validation words held out at build time)
+    train_dataset, val_dataset = MemmapHangmanDataset(dataset_path, batch_size=batch_size).split()
+    train_loader = DataLoader(train_dataset, batch_size=None, shuffle=True, num_workers=2, pin_memory=(device.type == 'cuda'))
+    val_loader = DataLoader(val_dataset, batch_size=None)
+
+    def run_epoch(loader, train):
+        student.train(train)
+        total_loss, agree, total = 0.0, 0, 0
+        with torch.set_grad_enabled(train):
+            for batch in loader:
+                inputs = [batch[key].to(device, non_blocking=True) for key in INPUT_KEYS]
+                labels = batch['label'].to(device, non_blocking=True)
+
+                with torch.no_grad():
+                    teacher_probs = torch.sigmoid(teacher(*inputs))
+
+                logits = student(*inputs)
+                loss = distillation_loss(logits, teacher_probs, labels, alpha)
+
+                if train:
+                    optimizer.zero_grad()
+                    loss.backward()
+                    optimizer.step()
+
+                total_loss += loss.item()
+                agree += (logits.argmax(dim=1) == teacher_probs.argmax(dim=1)).sum().item()
+                total += len(labels)
+        return total_loss / max(len(loader), 1), agree / max(total, 1)
+
+    # Step 3: Train with early stopping on the validation loss
+    history = []
+    best_val_loss = float('inf')
+    epochs_without_improvement = 0
+
+    for epoch in range(num_epochs):
+        train_loss, train_agree = run_epoch(train_loader, train=True)
+        val_loss, val_agree = run_epoch(val_loader, train=False)
+        history.append({'epoch': epoch + 1, 'train_loss': train_loss, 'train_agreement': train_agree,
+                        'val_loss': val_loss, 'val_agreement': val_agree})
+
+        print(f"Epoch {epoch+1} | Train Loss: {train_loss:.4f} | Val Loss: {val_loss:.4f} | Val Top-1 Agreement: {val_agree:.4f}")
+
+        if val_loss < best_val_loss:
+            best_val_loss = val_loss
+            epochs_without_improvement = 0
+            torch.save(copy.deepcopy(student.state_dict()), output_path)
+            print(f"✅ Best student saved at epoch {epoch+1}")
+        else:
+            epochs_without_improvement += 1
+            print(f"⚠️  No improvement for {epochs_without_improvement} epoch(s)")
+            if epochs_without_improvement >= patience:
+                print("🛑 Early stopping triggered.")
+                break
+
+    return history
@@ -0,0 +1,118 @@
+import time
+from model import inference
+from model.inference import predict_game_states
+from model.game_state import GameState
+
+def evaluate_hangman_model(word_list, batch_size=4096, max_lives=inference.max_lives, verbose=False,
+                           bucket_by_length=True, quiet=False):
+
+    """
+    Simulate Hangman games with the model and evaluate win rate.
+
+    Games are played in lockstep: up to `batch_size` games are kept in flight, every step
+    runs a single batched forward pass for all unfinished games, reveals the chosen letters
+    and drops finished games from the batch (refilling it from the remaining words).
+
+    Parameters:
+    -----------
+    word_list : list of str
+        Words to test the model on.
+    batch_size : int
+        Maximum number of games in flight (i.e. the forward pass batch size).
+    max_lives : int
+        Number of incorrect guesses allowed per word.
+    verbose : bool
+        If True, prints the outcome of each game.
+    bucket_by_length : bool
+        Start games in order of word length so the batch in flight spans few lengths, which
+        lets a padding-mask checkpoint (model/train.py padding_mask=True) trim each forward pass.
+        Traces are still returned in word_list order.
+    quiet : bool
+        If True, skips the summary line (used by the sharded runner in model/parallel_eval.py).
+
+    Returns:
+    --------
+    results : dict
+        'win_rate', 'wins', 'total', 'elapsed' (seconds), 'games_per_sec',
+        'forward_passes' and 'traces' (one dict per game with the word, final state,
+        guess sequence, number of wrong guesses and the outcome).
+    """
+
+    assert inference.model is not None, "Call load_model() before evaluating"
+
+    words = [word.strip().lower() for word in word_list if word.strip()]
+    games = [GameState(word) for word in words]
+
+    order = range(len(games))
+    if bucket_by_length:
+        order = sorted(order, key=lambda idx: len(words[idx]))
+    pending = iter(order)
+    active = []
+    forward_passes = 0
+    start = time.perf_counter()
+
+    while True:
+        # Top the batch back up with games that have not started yet
+        while len(active) < batch_size:
+            idx = next(pending, None)
+            if idx is None:
+                break
+            active.append(idx)
+
+        if not active:
+            break
+
+        letters, _, _ = predict_game_states([games[idx] for idx in active], top_k=1)
+        forward_passes += 1
+
+        still_active = []
+        for idx, letter in zip(active, letters):
+            if letter is None:
+                # Every letter has been guessed already, nothing left to play
+                continue
+            game = games[idx] = games[idx].guess(letter)
+            if not game.solved and game.wrong_count < max_lives:
+                still_active.append(idx)
+        active = still_active
+
+    elapsed = time.perf_counter() - start
+
+    traces = []
+    wins = 0
+    for game in games:
+        won = game.solved
+        wins += won
+        traces.append({
+            'word': game.word,
+            'final_state': game.masked,
+            'guesses': list(game.guesses),
+            'wrong_guesses': game.wrong_count,
+            'won': won
+        })
+        if verbose:
+            result = "✅ WIN" if won else "❌ LOSS"
+            print(f"{game.masked} vs {game.word} → {result}")
+
+    total = len(games)
+    win_rate = wins / total if total else 0.0
+    games_per_sec = total / elapsed if elapsed > 0 else float('inf')
+    if not quiet:
+        print(f"\n🏁 Evaluated {total} games | ✅ Win rate: {win_rate:.2%} | ⚡ {games_per_sec:,.0f} games/sec")
+
+    return {
+        'win_rate': win_rate,
+        'wins': wins,
+        'total': total,
+        'elapsed': elapsed,
+        'games_per_sec': games_per_sec,
+        'forward_passes': forward_passes,
+        'traces': traces
+    }
+
+def replay_trace(trace):
+
+    # Yields the (state, guessed letters, letter played) decisions of a game trace in order
+    game = GameState(trace['word'])
+    for letter in trace['guesses']:
+        yield game.masked, list(game.guesses), letter
+        game = game.guess(letter)
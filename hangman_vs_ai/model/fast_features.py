@@ -0,0 +1,209 @@
+import math
+import numpy as np
+from model.constants import max_lives, max_len, alphabet, guess_freq, ngram_list, vocab
+
+# Vectorized (struct-of-arrays) version of generate_features + encode_features for inference.
+# Works on whole batches of masked strings and guess sets and returns contiguous NumPy arrays
+# that can be handed straight to torch.from_numpy.
+
+_MASK_CHAR = ord('_')
+_PAD_CHAR = 0
+
+# Byte -> token id lookup table ('_' -> [MASK], padding -> [PAD], letters -> their own ids)
+_TOKEN_LUT = np.full(256, vocab['[PAD]'], dtype=np.int64)
+_TOKEN_LUT[_MASK_CHAR] = vocab['[MASK]']
+for _letter in alphabet:
+    _TOKEN_LUT[ord(_letter)] = vocab[_letter]
+
+_IS_VOWEL = np.array([letter in 'aeiou' for letter in alphabet])
+_FREQS = np.array([guess_freq[letter] for letter in alphabet], dtype=np.float64)
+_MAX_FREQ = max(guess_freq.values())
+
+def _mask_entropy(total, length):
+    # Same formula as generate_features, evaluated once per (num_masked, word_length) pair
+    if total == 0 or total == length:
+        return 0
+    p = total / length
+    return - (p * math.log2(p) + (1 - p) * math.log2(1 - p))
+
+_ENTROPY = np.array(
+    [[_mask_entropy(total, length) if total <= length else 0 for length in range(max_len + 1)]
+     for total in range(max_len + 1)],
+    dtype=np.float64
+)
+
+def _has_border(ngram):
+    return any(ngram[:k] == ngram[-k:] for k in range(1, len(ngram)))
+
+# str.count counts non-overlapping matches, a sliding window counts overlapping ones.
+# The two only differ for n-grams that can overlap themselves, none of which are in ngram_list.
+assert not any(_has_border(ngram) for ngram in ngram_list), "Sliding window n-gram counts need border-free n-grams"
+
+def _ngram_code(ngram):
+    code = 0
+    for c in ngram.encode('ascii'):
+        code = code * 256 + c
+    return code
+
+# N-grams grouped by length: (length, output columns, packed integer codes)
+_NGRAM_GROUPS = [
+    (k, np.array([j for j, ngram in enumerate(ngram_list) if len(ngram) == k]),
+     np.array([_ngram_code(ngram) for ngram in ngram_list if len(ngram) == k], dtype=np.int64))
+    for k in sorted({len(ngram) for ngram in ngram_list})
+]
+
+def state_matrix(current_states):
+
+    # [N, max_len] uint8 matrix of the masked strings, right-padded with zeros
+    n = len(current_states)
+    if n and max(len(state) for state in current_states) > max_len:
+        raise ValueError(f"States longer than max_len={max_len} are not supported")
+    joined = ''.join(state.ljust(max_len, '\0') for state in current_states)
+    return np.frombuffer(joined.encode('ascii'), dtype=np.uint8).reshape(n, max_len)
+
+def guessed_matrix(guess_histories):
+
+    # [N, 26] boolean matrix of guessed letters (already-built matrices are passed through)
+    if isinstance(guess_histories, np.ndarray):
+        return guess_histories.astype(bool, copy=False)
+
+    n = len(guess_histories)
+    joined = [''.join(history) for history in guess_histories]
+    counts = np.fromiter((len(history) for history in joined), dtype=np.int64, count=n)
+    letters = np.frombuffer(''.join(joined).encode('ascii'), dtype=np.uint8).astype(np.int64) - ord('a')
+    guessed = np.zeros((n, 26), dtype=bool)
+    guessed[np.repeat(np.arange(n), counts), letters] = True
+    return guessed
+
+def encode_batch(current_states, guess_histories, dtype=np.float32):
+
+    """
+    Encode a batch of game states straight into model inputs.
+
+    Matches encode_features(generate_features(samples)) in inference mode: input_ids, masked_idx
+    and char_multi_hot are identical, and norm_features / ngram_vector use the same float64
+    arithmetic before the final cast to `dtype`. The one exception is avg_remaining_freq
+    (norm_features[:, 6]): the reference sums frequencies in set iteration order, which depends on
+    the string hash seed, so it can differ from this fixed-order sum in the last bit.
+
+    Inputs:
+    -------
+    current_states : list of str
+        Masked words (e.g. '_pp_e'), at most max_len characters.
+    guess_histories : list of iterables of str, or [N, 26] boolean array
+        Letters already guessed for each state (without duplicates).
+    dtype : numpy dtype, default=np.float32
+        Dtype of the float outputs (np.float64 returns the reference values exactly).
+
+    Outputs:
+    --------
+    dict of np.ndarray
+        'input_ids' [N, max_len] int64, 'masked_idx' [N, max_len] int64,
+        'norm_features' [N, 19], 'char_multi_hot' [N, 104] and 'ngram_vector' [N, 35].
+    """
+
+    chars = state_matrix(current_states)
+    guessed = guessed_matrix(guess_histories)
+    n, width = chars.shape
+
+    masked = chars == _MASK_CHAR
+    revealed = chars > _MASK_CHAR
+    lengths = (chars != _PAD_CHAR).sum(axis=1)
+    wl = np.maximum(lengths, 1)
+
+    # Mask structure
+    num_masked = masked.sum(axis=1)
+    any_masked = num_masked > 0
+    first_masked_idx = np.where(any_masked, masked.argmax(axis=1), -1)
+    last_masked_idx = np.where(any_masked, width - 1 - masked[:, ::-1].argmax(axis=1), -1)
+
+    prev_masked = np.zeros_like(masked)
+    prev_masked[:, 1:] = masked[:, :-1]
+    num_masked_blocks = (masked & ~prev_masked).sum(axis=1)
+    avg_masked_block_len = np.divide(num_masked, num_masked_blocks, out=np.zeros(n), where=num_masked_blocks > 0)
+
+    masked_entropy = _ENTROPY[num_masked, lengths]
+
+    # Prefix: leading '_' (a sentinel column handles fully masked full-width states)
+    masked_prefix_len = np.concatenate([masked, np.zeros((n, 1), dtype=bool)], axis=1).argmin(axis=1)
+    # Suffix: trailing '_' measured back from the last revealed letter
+    last_revealed_idx = np.where(revealed.any(axis=1), width - 1 - revealed[:, ::-1].argmax(axis=1), -1)
+    masked_suffix_len = lengths - 1 - last_revealed_idx
+
+    # Average frequency of the remaining unguessed letters
+    unguessed = ~guessed
+    num_unguessed = unguessed.sum(axis=1)
+    remaining_sum = np.where(unguessed, _FREQS, 0.0).sum(axis=1)
+    avg_remaining_freq = np.divide(remaining_sum, num_unguessed, out=np.zeros(n), where=num_unguessed > 0)
+    avg_remaining_freq /= _MAX_FREQ
+
+    # Revealed letter counts per state
+    rows, cols = np.nonzero(revealed)
+    letter_ids = chars[rows, cols].astype(np.int64) - ord('a')
+    revealed_counts = np.bincount(rows * 26 + letter_ids, minlength=n * 26).reshape(n, 26)
+    present = revealed_counts > 0
+
+    correct = guessed & present
+    incorrect = guessed & ~present
+    total_correct = correct.sum(axis=1)
+    total_incorrect = incorrect.sum(axis=1)
+    lives_remaining = np.maximum(max_lives - total_incorrect, 0)
+
+    num_correct_vowels = (correct & _IS_VOWEL).sum(axis=1)
+    num_correct_consonants = (correct & ~_IS_VOWEL).sum(axis=1)
+    num_incorrect_vowels = (incorrect & _IS_VOWEL).sum(axis=1)
+    num_incorrect_consonants = (incorrect & ~_IS_VOWEL).sum(axis=1)
+
+    num_repeated_letters = (revealed_counts > 1).sum(axis=1)
+    prev_revealed = np.zeros_like(revealed)
+    prev_revealed[:, 1:] = revealed[:, :-1]
+    num_contiguous_letters = (revealed & ~prev_revealed).sum(axis=1)
+
+    # Same column order and normalisation as encode_features
+    norm_features = np.stack([
+        wl / max_len,
+        1 - num_masked / wl,
+        first_masked_idx / wl,
+        last_masked_idx / wl,
+        num_masked_blocks / wl,
+        avg_masked_block_len / wl,
+        avg_remaining_freq,
+        masked_entropy,
+        lives_remaining / max_lives,
+        masked_prefix_len / wl,
+        masked_suffix_len / wl,
+        total_correct / max_lives,
+        total_incorrect / max_lives,
+        num_correct_vowels / 5,
+        num_incorrect_vowels / 5,
+        num_correct_consonants / 21,
+        num_incorrect_consonants / 21,
+        num_repeated_letters / wl,
+        num_contiguous_letters / wl
+    ], axis=1)
+
+    char_multi_hot = np.concatenate([
+        correct & _IS_VOWEL,
+        correct & ~_IS_VOWEL,
+        incorrect & _IS_VOWEL,
+        incorrect & ~_IS_VOWEL
+    ], axis=1)
+
+    # N-gram counts: pack every sliding window into an integer and compare against all n-grams of that length
+    ngram_counts = np.zeros((n, len(ngram_list)), dtype=np.int64)
+    for k, columns, codes in _NGRAM_GROUPS:
+        span = width - k + 1
+        windows = chars[:, :span].astype(np.int64)
+        for offset in range(1, k):
+            windows = windows * 256 + chars[:, offset:offset + span]
+        ngram_counts[:, columns] = (windows[:, :, None] == codes).sum(axis=1)
+    ngram_total = ngram_counts.sum(axis=1, keepdims=True)
+    ngram_vector = ngram_counts / np.where(ngram_total == 0, 1, ngram_total)
+
+    return {
+        'input_ids': _TOKEN_LUT[chars],
+        'masked_idx': masked.astype(np.int64),
+        'norm_features': np.ascontiguousarray(norm_features, dtype=dtype),
+        'char_multi_hot': char_multi_hot.astype(dtype),
+        'ngram_vector': np.ascontiguousarray(ngram_vector, dtype=dtype)
+    }
@@ -0,0 +1,149 @@
+# Compact Hangman game state shared by the app, inference and the evaluator.
+#
+# Guesses are 26-bit masks (bit i = alphabet[i]) and the revealed word is a bytes pattern with
+# b'_' at hidden positions, so membership tests are a bit test, applying a guess is one pass over
+# the word, and the (masked word, guessed mask) pair is exactly inference.cache_key().
+# numpy is only imported by the matrix helpers, so the app's startup imports stay numpy-free.
+
+_HIDDEN = ord('_')
+
+def _bits():
+    import numpy as np
+    return np.arange(26, dtype=np.int64)
+
+def letter_bit(letter):
+    return 1 << (ord(letter) - ord('a'))
+
+def guessed_bitmask(guessed_letters):
+
+    # 26-bit mask, bit i set when alphabet[i] has been guessed
+    mask = 0
+    for letter in guessed_letters:
+        mask |= letter_bit(letter)
+    return mask
+
+def popcount(mask):
+    return bin(mask).count('1')
+
+class GameState:
+
+    """
+    One player's view of a game: revealed pattern, guessed and wrong-guess masks, guess order.
+
+    Immutable: guess() returns a new state. Equality and hashing use the observable position
+    (pattern and guessed letters), the same information the model and the prediction cache see,
+    so states of different target words that look alike compare equal.
+
+    Parameters:
+    -----------
+    word : str
+        Target word, or None when only the masked state is known (guess() then needs positions).
+    pattern : bytes
+        Revealed letters with b'_' at hidden positions, defaults to all hidden.
+    guessed_mask, wrong_mask : int
+        26-bit masks of every guessed letter and of the guessed letters not in the word.
+    guesses : tuple of str
+        Guessed letters in order (for display and traces).
+    """
+
+    __slots__ = ('word', 'pattern', 'guessed_mask', 'wrong_mask', 'guesses')
+
+    def __init__(self, word, pattern=None, guessed_mask=0, wrong_mask=0, guesses=()):
+        self.word = word
+        self.pattern = b'_' * len(word) if pattern is None else pattern
+        self.guessed_mask = guessed_mask
+        self.wrong_mask = wrong_mask
+        self.guesses = guesses
+
+    @classmethod
+    def from_history(cls, current_state, guessed_letters, word=None):
+
+        # Rebuild a state from a masked word (e.g. '_pp_e') and the letters guessed so far
+        guessed_mask = guessed_bitmask(guessed_letters)
+        wrong_mask = guessed_bitmask(letter for letter in guessed_letters if letter not in current_state)
+        return cls(word, current_state.encode('ascii'), guessed_mask, wrong_mask, tuple(guessed_letters))
+
+    def guess(self, letter, positions=None):
+
+        """
+        State after guessing `letter` (unchanged if it was guessed before).
+
+        positions : list of int
+            Where the letter appears; looked up in self.word when omitted.
+        """
+
+        bit = letter_bit(letter)
+        if self.guessed_mask & bit:
+            return self
+        if positions is None:
+            positions = [i for i, c in enumerate(self.word) if c == letter]
+
+        pattern = self.pattern
+        if positions:
+            revealed = bytearray(pattern)
+            for i in positions:
+                revealed[i] = ord(letter)
+            pattern = bytes(revealed)
+
+        return GameState(self.word, pattern, self.guessed_mask | bit, self.wrong_mask | (0 if positions else bit),
+                         self.guesses + (letter,))
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @property
+    def masked(self):
+        return self.pattern.decode('ascii')
+
+    @property
+    def key(self):
+        # Same value as inference.cache_key(self.masked, self.guesses)
+        return self.masked, self.guessed_mask
+
+    @property
+    def solved(self):
+        return _HIDDEN not in self.pattern
+
+    @property
+    def wrong_count(self):
+        return popcount(self.wrong_mask)
+
+    @property
+    def revealed_count(self):
+        return len(self.pattern) - self.pattern.count(_HIDDEN)
+
+    def lives(self, max_lives):
+        return max_lives - self.wrong_count
+
+    def has_guessed(self, letter):
+        return bool(self.guessed_mask & letter_bit(letter))
+
+    def correct_guesses(self):
+        return [letter for letter in self.guesses if not self.wrong_mask & letter_bit(letter)]
+
+    def wrong_guesses(self):
+        return [letter for letter in self.guesses if self.wrong_mask & letter_bit(letter)]
+
+    def guessed_flags(self):
+        # [26] boolean row of the guessed letters (one row of fast_features.guessed_matrix)
+        return (self.guessed_mask >> _bits()) & 1 == 1
+
+    def __eq__(self, other):
+        if not isinstance(other, GameState):
+            return NotImplemented
+        return self.pattern == other.pattern and self.guessed_mask == other.guessed_mask
+
+    def __hash__(self):
+        return hash((self.pattern, self.guessed_mask))
+
+    def __repr__(self):
+        return f"GameState({self.masked!r}, guessed={''.join(self.guesses)!r}, wrong={self.wrong_count})"
+
+def guessed_matrix_of(states):
+
+    # [N, 26] boolean guessed-letter matrix for a list of GameStates (input of encode_batch)
+    import numpy as np
+
+    masks = np.fromiter((state.guessed_mask for state in states), dtype=np.int64, count=len(states))
+    return (masks[:, None] >> _bits()) & 1 == 1
@@ -1,115 +1,361 @@
-import torch
-from collections import Counter
+import numpy as np
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
 import re
 import string
 import random
 import math
-from model.model_definition import HangmanTransformer
-import torch.nn.functional as F
+from model.checkpoints import MODEL_VARIANTS, checkpoint_sha256, trained_with_padding_mask, variant_model_path, frozen_model_path, quantized_model_path, numpy_model_path
+from model.constants import max_lives, max_len, alphabet, guess_freq, guess_order, ngram_list, special_tokens, all_tokens, vocab
+from model.fast_features import encode_batch, guessed_matrix
+from model.game_state import guessed_bitmask, guessed_matrix_of
+from model import profiling
+
+try:
+    import torch
+    import torch.nn.functional as F
+    from model.model_definition import HangmanTransformer
+except ImportError:
+    # Without torch only the NumPy backend is available: load_model(..., backend='numpy')
+    torch = F = HangmanTransformer = None
 
 random.seed(42)
 
 # Initialise global variables
 
 device = 'cpu'
-max_lives = 6
-max_len = 10
 inference=True
-alphabet = list(string.ascii_lowercase)
-guess_freq = {
-    'e': 0.1175169493434241,
-    's': 0.09242216065650082,
-    'i': 0.0817352523819177,
-    'a': 0.07717338258591046,
-    'r': 0.07275266346825236,
-    'n': 0.06424307948735275,
-    't': 0.06347726197716062,
-    'o': 0.061044665180079734,
-    'l': 0.053326425959711994,
-    'd': 0.04023845455023237,
-    'c': 0.03906870584348792,
-    'u': 0.03410891126277301,
-    'g': 0.031182287091470143,
-    'p': 0.028631063660457538,
-    'm': 0.027730101883760915,
-    'h': 0.0234640478711024,
-    'b': 0.02069809521664377,
-    'y': 0.01571877979743376,
-    'f': 0.014406378809379013,
-    'k': 0.01061783453836971,
-    'w': 0.00980847054230391,
-    'v': 0.00963578620177039,
-    'z': 0.00413241134911518,
-    'x': 0.003072279658535487,
-    'j': 0.00197911270281025,
-    'q': 0.0018154379800436966
- }
-guess_order = sorted(guess_freq, key=guess_freq.get, reverse=True)
-ngram_list = [
-    'in',
-    'er',
-    'es',
-    'ed',
-    'ng',
-    'te',
-    're',
-    'st',
-    'le',
-    'at',
-    'ti',
-    'an',
-    'en',
-    'ri',
-    'ar',
-    'on',
-    'li',
-    'ra',
-    'al',
-    'or',
-    'ing',
-    'ers',
-    'ate',
-    'ter',
-    'ies',
-    'est',
-    'tin',
-    'ine',
-    'lin',
-    'ent',
-    'nes',
-    'ess',
-    'ted',
-    'ion',
-    'ati'
-]
-# Map: MASK -> 0, PAD -> 1, 'a' -> 2, ..., 'z' -> 27
-special_tokens = ['[PAD]', '[MASK]']
-alphabet = list(string.ascii_lowercase)
-all_tokens = special_tokens + alphabet
-vocab = {letter: index for index, letter in enumerate(all_tokens)}
+
+# Below this batch size NumPy's per-call overhead outweighs the vectorized encoder's gains
+vectorize_min_batch = 8
 
 model = None  # Global model object
+backend = 'torch'  # 'torch' or 'numpy', set by load_model
+model_quantized = False  # True when load_model served the dynamic int8 model
+
+# Set by load_model for padding-mask checkpoints: [PAD] columns beyond the longest word in a batch are dropped
+trim_padding = False
+
+class PredictionCache:
+
+    """
+    Bounded, thread-safe memo of predicted letters keyed by canonical game state.
+
+    policy='lru' refreshes an entry on every hit, policy='fifo' evicts in insertion order.
+    """
+
+    def __init__(self, maxsize=100_000, policy='lru'):
+        assert policy in ('lru', 'fifo'), f"Unknown eviction policy: {policy}"
+        self.maxsize = maxsize
+        self.policy = policy
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                if self.policy == 'lru':
+                    self._entries.move_to_end(key)
+                return True, self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, value):
+        with self._lock:
+            if self.maxsize <= 0:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def resize(self, maxsize):
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._entries) > max(maxsize, 0):
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'policy': self.policy,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+# Set HANGMAN_PREDICTION_CACHE=0 to bypass the cache (e.g. for A/B latency checks)
+cache_enabled = os.environ.get('HANGMAN_PREDICTION_CACHE', '1') != '0'
+prediction_cache = PredictionCache(maxsize=int(os.environ.get('HANGMAN_PREDICTION_CACHE_SIZE', 100_000)))
+
+def cache_key(current_state: str, guessed_letters) -> tuple:
+
+    # The prediction only depends on the masked state and the set of guessed letters
+    return current_state, guessed_bitmask(guessed_letters)
+
+def configure_cache(enabled=None, maxsize=None, policy=None):
+
+    global cache_enabled, prediction_cache
+
+    if enabled is not None:
+        cache_enabled = enabled
+    if policy is not None and policy != prediction_cache.policy:
+        prediction_cache = PredictionCache(maxsize=prediction_cache.maxsize if maxsize is None else maxsize, policy=policy)
+    elif maxsize is not None:
+        prediction_cache.resize(maxsize)
+
+def cache_stats() -> dict:
+    return prediction_cache.stats()
+
+# Hybrid mode: answer from a dictionary CandidateIndex once few enough words remain
+candidate_index = None
+hybrid_max_candidates = 0
 
-def load_model(model_path: str, device: str = "cpu"):
-    global model
+def configure_hybrid(index=None, max_candidates: int = 50):
 
-    # Match these hyperparameters to training
-    model = HangmanTransformer(
+    global candidate_index, hybrid_max_candidates
+
+    candidate_index = index
+    hybrid_max_candidates = max_candidates if index is not None else 0
+
+    # Cached letters may have been produced under the previous setting
+    prediction_cache.clear()
+
+# Planning mode: a LookaheadPlanner (model/planner.py) chooses the letters instead of the argmax
+planner = None
+
+def configure_planner(lookahead=None):
+
+    global planner
+
+    planner = lookahead
+    prediction_cache.clear()
+
+def build_model(variant: str = 'base', padding_mask: bool = False):
+
+    assert variant in MODEL_VARIANTS, f"Unknown model variant: {variant}"
+
+    # Match these hyperparameters to training (padding_mask only changes the encoder call)
+    return HangmanTransformer(
         vocab_size=28,
         max_len=10,
-        d_model=256,
-        nhead=4,
-        num_layers=4,
-        dim_feedforward=512,
         dropout=0.1,
         ngram_dim=35,
-        aux_dim=19
+        aux_dim=19,
+        batch_first=padding_mask,
+        pad_token_id=vocab['[PAD]'] if padding_mask else None,
+        **MODEL_VARIANTS[variant]
     )
 
-    checkpoint = torch.load(model_path, map_location=device)
-    model.load_state_dict(checkpoint)
-    model.eval()
-    model.to(device)
+def load_state_dict_file(model_path: str):
+
+    # Weights-only, memory-mapped load: tensors stay backed by the file's pages (shared through
+    # the page cache by every process serving the same checkpoint) and no pickle code runs.
+    # Falls back to a regular load for legacy (non-zip) checkpoints and older torch versions.
+    try:
+        return torch.load(model_path, map_location='cpu', weights_only=True, mmap=True)
+    except (TypeError, RuntimeError):
+        return torch.load(model_path, map_location='cpu')
+
+def model_from_state_dict(state_dict, variant='base', padding_mask=False):
+
+    # Parameters are created on the meta device and the loaded tensors assigned in place, which
+    # skips random initialisation and keeps the memory-mapped storage (torch >= 2.1)
+    try:
+        with torch.device('meta'):
+            loaded = build_model(variant, padding_mask)
+        loaded.load_state_dict(state_dict, assign=True)
+    except (TypeError, AttributeError, RuntimeError):
+        loaded = build_model(variant, padding_mask)
+        loaded.load_state_dict(state_dict)
+    return loaded.eval()
+
+def _example_inputs(batch_size=2):
+    return (
+        torch.zeros(batch_size, max_len, dtype=torch.long),
+        torch.ones(batch_size, max_len, dtype=torch.long),
+        torch.zeros(batch_size, 19, dtype=torch.float32),
+        torch.zeros(batch_size, 26 * 4, dtype=torch.float32),
+        torch.zeros(batch_size, len(ngram_list), dtype=torch.float32)
+    )
+
+def export_frozen(model_path: str, output_path: str = None, variant: str = 'base') -> str:
+
+    """
+    Export a checkpoint as a frozen TorchScript module optimized for inference.
+
+    The eval-mode model is traced at the fixed max_len sequence length (dropout becomes a
+    no-op), then frozen so the weights are inlined as constants and passed through
+    torch.jit.optimize_for_inference. The checkpoint hash is stored next to the graph so a
+    stale export is never loaded for a retrained checkpoint.
+
+    Inputs:
+    -------
+    model_path : str
+        state_dict checkpoint (e.g. hangman_vs_ai/model/transformer.pt).
+    output_path : str
+        Destination, defaults to frozen_model_path(model_path).
+    variant : str
+        Architecture of the checkpoint (a MODEL_VARIANTS key).
+
+    Outputs:
+    --------
+    Path of the exported module.
+    """
+
+    output_path = output_path or frozen_model_path(model_path)
+
+    eager = model_from_state_dict(load_state_dict_file(model_path), variant)
+
+    with torch.no_grad():
+        traced = torch.jit.trace(eager, _example_inputs())
+        frozen = torch.jit.optimize_for_inference(torch.jit.freeze(traced))
+
+        # The frozen graph must reproduce the eager model before it is allowed to replace it
+        check_inputs = _example_inputs(batch_size=5)
+        check_inputs[0].random_(2, len(vocab))
+        check_inputs[1].bernoulli_(0.5)
+        torch.testing.assert_close(frozen(*check_inputs), eager(*check_inputs), rtol=1e-4, atol=1e-5)
+
+    torch.jit.save(frozen, output_path, _extra_files={'checkpoint_sha256': checkpoint_sha256(model_path)})
+    return output_path
+
+def _load_frozen(model_path: str, device: str):
+
+    # Frozen module for this checkpoint, or None if it is missing or was exported from another one
+    path = frozen_model_path(model_path)
+    if not os.path.exists(path):
+        return None
+    extra_files = {'checkpoint_sha256': ''}
+    frozen = torch.jit.load(path, map_location=device, _extra_files=extra_files)
+    if os.path.exists(model_path) and extra_files['checkpoint_sha256'] != checkpoint_sha256(model_path):
+        return None
+    return frozen
+
+QUANTIZED_FORMAT = 'hangman-int8-dynamic-v1'
+
+def quantize_model(eager):
+
+    # Dynamic int8 weight quantization of every nn.Linear: the encoder feed-forward layers,
+    # aux_mlp and cls_head. Attention projections stay fp32 (in_proj is a bare parameter and
+    # out_proj is a NonDynamicallyQuantizableLinear), as do the embeddings.
+    return torch.ao.quantization.quantize_dynamic(eager.eval(), {torch.nn.Linear}, dtype=torch.qint8)
+
+def save_quantized(model_path: str, output_path: str = None, variant: str = 'base') -> str:
+
+    """
+    Quantize a fp32 checkpoint and save it as an int8 checkpoint.
+
+    The file holds the quantized state_dict (packed int8 weights with their scales) together
+    with a format tag and the hash of the fp32 checkpoint it was derived from.
+    """
+
+    output_path = output_path or quantized_model_path(model_path)
+    eager = model_from_state_dict(load_state_dict_file(model_path), variant)
+    torch.save({
+        'format': QUANTIZED_FORMAT,
+        'checkpoint_sha256': checkpoint_sha256(model_path),
+        'state_dict': quantize_model(eager).state_dict()
+    }, output_path)
+    return output_path
+
+def _load_quantized(model_path: str, variant: str, padding_mask: bool = False):
+
+    # int8 model from the saved quantized checkpoint, or quantized on the fly if it is missing or stale
+    quantized = quantize_model(build_model(variant, padding_mask))
+    path = quantized_model_path(model_path)
+    if os.path.exists(path):
+        payload = torch.load(path, map_location='cpu', weights_only=False)
+        if payload.get('format') == QUANTIZED_FORMAT and (
+                not os.path.exists(model_path) or payload['checkpoint_sha256'] == checkpoint_sha256(model_path)):
+            quantized.load_state_dict(payload['state_dict'])
+            return quantized
+
+    return quantize_model(model_from_state_dict(load_state_dict_file(model_path), variant, padding_mask))
+
+def _load_numpy(model_path: str, variant: str, padding_mask: bool):
+
+    # NumPy export for this checkpoint, re-exported when missing or stale (which needs torch)
+    from model.numpy_backend import NumpyHangmanTransformer, export_npz
+
+    path = numpy_model_path(model_path)
+    pad_token_id = vocab['[PAD]'] if padding_mask else None
+    if os.path.exists(path):
+        loaded = NumpyHangmanTransformer.load(path, pad_token_id)
+        if loaded.config['variant'] == variant and (
+                not os.path.exists(model_path) or loaded.config['checkpoint_sha256'] == checkpoint_sha256(model_path)):
+            return loaded
+
+    assert torch is not None, f"No up-to-date NumPy export at {path} (run scripts/export_numpy.py where torch is installed)"
+    export_npz(model_path, path, variant)
+    return NumpyHangmanTransformer.load(path, pad_token_id)
+
+def load_model(model_path: str, device: str = "cpu", frozen: bool = None, quantized: bool = False,
+               variant: str = 'base', padding_mask: bool = None, backend_name: str = 'torch'):
+
+    """
+    Load the global model.
+
+    frozen=None uses the frozen TorchScript export (export_frozen) when one exists for this
+    checkpoint and falls back to the eager model otherwise; True requires it, False skips it.
+    quantized=True loads the dynamic int8 model instead (CPU only), from save_quantized's
+    checkpoint when it is up to date. variant selects the architecture (MODEL_VARIANTS) that
+    model_path was trained with. Checkpoints trained with the [PAD] attention mask (recorded in
+    their checkpoint_meta_path file) run the batch-first encoder with [PAD] positions masked out
+    and trim every batch to its longest word (the frozen export, traced without a mask, is
+    skipped). padding_mask=None follows that record; an explicit value that contradicts it is
+    ignored with a message, since masking changes the outputs of a model trained without it. backend_name='numpy' runs the model with NumPy from its .npz
+    export (export_npz) and works without torch installed; frozen and quantized do not apply.
+    """
+
+    global model, trim_padding, backend, model_quantized
+
+    # The mask is a property of the checkpoint, not a serving option
+    trained_with_mask = trained_with_padding_mask(model_path)
+    if padding_mask is not None and padding_mask != trained_with_mask:
+        print(f"⚠️  {model_path} was trained {'with' if trained_with_mask else 'without'} the padding mask, "
+              f"ignoring padding_mask={padding_mask}")
+    padding_mask = trained_with_mask
+
+    loaded = None
+    if backend_name == 'numpy':
+        assert device == "cpu" and not quantized, "The NumPy backend runs fp32 on CPU only"
+        loaded = _load_numpy(model_path, variant, padding_mask)
+    elif quantized:
+        assert device == "cpu", "Dynamic int8 quantization only runs on CPU"
+        loaded = _load_quantized(model_path, variant, padding_mask)
+    elif frozen is not False and not padding_mask:
+        loaded = _load_frozen(model_path, device)
+        assert loaded is not None or frozen is None, f"No up-to-date frozen export for {model_path}"
+
+    if loaded is None:
+        loaded = model_from_state_dict(load_state_dict_file(model_path), variant, padding_mask)
+        loaded.to(device)
+
+    model = loaded
+    backend = backend_name
+    model_quantized = bool(quantized)
+    trim_padding = padding_mask
+
+    # Cached letters belong to the previous model
+    prediction_cache.clear()
 
 def pad_sequences(sequences, maxlen=None, padding='pre', truncating='pre', value=0):
     
@@ -134,9 +380,10 @@ def pad_sequences(sequences, maxlen=None, padding='pre', truncating='pre', value
 
     return padded
 
-def generate_features(masked_samples):
+def generate_features(masked_samples, inference=inference, rng=random):
 
-    global max_lives, inference
+    # rng only drives the simulated guess history of training samples (inference=False)
+    global max_lives
 
     all_features = []
 
@@ -169,8 +416,8 @@ def generate_features(masked_samples):
             # If not inference, we need to 'simulate' a guess history
             correct_guesses = state_set - {'_'}
             # If word is fully masked, pretend like you have guessed some so you still get incorrect guesses sometimes
-            if random.random() < 0.8:
-                min_guesses = random.randint(1, 5)
+            if rng.random() < 0.8:
+                min_guesses = rng.randint(1, 5)
             else:
                 min_guesses = 0
             # Construct a plausible guess history until all correct letters are guessed
@@ -182,8 +429,8 @@ def generate_features(masked_samples):
             # Identify incorrect guesses based on the guess history
             possible_incorrects = [letter for letter in guess_history if letter not in set(original_word)]
             # Randomly sample incorrect guesses to simulate guess limit
-            sample_size = min(len(possible_incorrects), random.randint(0, max_lives))
-            incorrect_guesses = random.sample(possible_incorrects, k=sample_size)
+            sample_size = min(len(possible_incorrects), rng.randint(0, max_lives))
+            incorrect_guesses = rng.sample(possible_incorrects, k=sample_size)
             # Calculate in-word letter frequencies to add to the labels
             letter_counts = Counter(original_word)
             total_count = sum(letter_counts[letter] for letter in next_guesses)
@@ -301,9 +548,9 @@ def generate_features(masked_samples):
 
     return all_features
 
-def encode_features(features):
+def encode_features(features, inference=inference):
 
-    global vocab, ngram_list, max_lives, max_len, inference
+    global vocab, ngram_list, max_lives, max_len
 
     encoded = []
 
@@ -384,48 +631,412 @@ def encode_features(features):
 
     return encoded
 
-def predict_next_letter(current_state: str, guessed_letters: list) -> str:
-    
-    global model, device
+class GameFeatureState:
+
+    """
+    Incrementally maintained features for one game, created when the game starts.
+
+    apply_guess() only touches the revealed positions (plus the n-gram windows around them),
+    instead of recomputing every feature from the masked string like generate_features does.
+    The encoding it keeps is the same as encode_features(generate_features(...)) for the
+    current state and guess history.
+    """
+
+    _vowels = set('aeiou')
+    _ngram_index = {ngram: j for j, ngram in enumerate(ngram_list)}
+    _ngram_sizes = sorted({len(ngram) for ngram in ngram_list})
+    _max_freq = max(guess_freq.values())
+
+    def __init__(self, word_length: int):
+        self.word_length = word_length
+        self.state = ['_'] * word_length
+        self.guessed = []
+        self.guessed_flags = [False] * 26
+
+        # Counters behind norm_features
+        self.num_masked = word_length
+        self.first_masked_idx = 0 if word_length else -1
+        self.last_masked_idx = word_length - 1
+        self.num_masked_blocks = 1 if word_length else 0
+        self.masked_prefix_len = word_length
+        self.masked_suffix_len = word_length
+        self.total_correct = 0
+        self.total_incorrect = 0
+        self.num_correct_vowels = 0
+        self.num_correct_consonants = 0
+        self.num_incorrect_vowels = 0
+        self.num_incorrect_consonants = 0
+        self.revealed_counts = [0] * 26
+        self.num_repeated_letters = 0
+        self.num_contiguous_letters = 0
+
+        # Encoded model inputs (ngram_vector holds raw counts, normalised in encoded_features())
+        pad = max_len - word_length
+        self.encoded = {
+            'input_ids': [vocab['[MASK]']] * word_length + [vocab['[PAD]']] * pad,
+            'masked_idx': [1] * word_length + [0] * pad,
+            'char_multi_hot': [0] * (26 * 4),
+            'ngram_vector': [0] * len(ngram_list)
+        }
 
-    # Step 1: Build sample
-    sample = {
-        'current_state': current_state,
-        'guess_history': guessed_letters
+    @property
+    def current_state(self):
+        return ''.join(self.state)
+
+    def apply_guess(self, letter: str, positions):
+
+        # positions: indices where the target word holds `letter` (empty for a wrong guess)
+        c = ord(letter) - ord('a')
+        assert not self.guessed_flags[c], f"'{letter}' has already been guessed"
+        self.guessed.append(letter)
+        self.guessed_flags[c] = True
+
+        is_vowel = letter in self._vowels
+        if positions:
+            self.total_correct += 1
+            if is_vowel:
+                self.num_correct_vowels += 1
+            else:
+                self.num_correct_consonants += 1
+            self.encoded['char_multi_hot'][(0 if is_vowel else 26) + c] = 1
+            for pos in positions:
+                self._reveal(pos, letter)
+            count_before = self.revealed_counts[c]
+            self.revealed_counts[c] += len(positions)
+            if count_before <= 1 < self.revealed_counts[c]:
+                self.num_repeated_letters += 1
+        else:
+            self.total_incorrect += 1
+            if is_vowel:
+                self.num_incorrect_vowels += 1
+            else:
+                self.num_incorrect_consonants += 1
+            self.encoded['char_multi_hot'][(52 if is_vowel else 78) + c] = 1
+
+    def _reveal(self, pos, letter):
+        state = self.state
+        length = self.word_length
+        left_masked = pos > 0 and state[pos - 1] == '_'
+        right_masked = pos < length - 1 and state[pos + 1] == '_'
+        left_revealed = pos > 0 and not left_masked
+        right_revealed = pos < length - 1 and not right_masked
+
+        # Splitting / shrinking / removing a masked block, extending / merging a letter run
+        if left_masked and right_masked:
+            self.num_masked_blocks += 1
+        elif not left_masked and not right_masked:
+            self.num_masked_blocks -= 1
+        if left_revealed and right_revealed:
+            self.num_contiguous_letters -= 1
+        elif not left_revealed and not right_revealed:
+            self.num_contiguous_letters += 1
+
+        state[pos] = letter
+        self.num_masked -= 1
+        self.encoded['input_ids'][pos] = vocab[letter]
+        self.encoded['masked_idx'][pos] = 0
+
+        if pos < self.masked_prefix_len:
+            self.masked_prefix_len = pos
+        if pos >= length - self.masked_suffix_len:
+            self.masked_suffix_len = length - 1 - pos
+        if pos == self.first_masked_idx:
+            nxt = pos + 1
+            while nxt < length and state[nxt] != '_':
+                nxt += 1
+            self.first_masked_idx = nxt if nxt < length else -1
+        if pos == self.last_masked_idx:
+            prv = pos - 1
+            while prv >= 0 and state[prv] != '_':
+                prv -= 1
+            self.last_masked_idx = prv
+
+        # Only windows covering pos can start matching; each window is counted once, when its
+        # last '_' is revealed (border-free n-grams, so this equals str.count)
+        ngram_counts = self.encoded['ngram_vector']
+        for size in self._ngram_sizes:
+            for start in range(max(0, pos - size + 1), min(pos, length - size) + 1):
+                j = self._ngram_index.get(''.join(state[start:start + size]))
+                if j is not None:
+                    ngram_counts[j] += 1
+
+    def norm_features(self):
+
+        wl = max(1, self.word_length)
+
+        unguessed = [guess_freq[letter] for letter, flag in zip(alphabet, self.guessed_flags) if not flag]
+        avg_remaining_freq = sum(unguessed) / len(unguessed) if unguessed else 0
+        avg_remaining_freq /= self._max_freq
+
+        if self.num_masked == 0 or self.num_masked == self.word_length:
+            masked_entropy = 0
+        else:
+            p = self.num_masked / self.word_length
+            masked_entropy = - (p * math.log2(p) + (1 - p) * math.log2(1 - p))
+
+        avg_masked_block_len = self.num_masked / self.num_masked_blocks if self.num_masked_blocks > 0 else 0
+
+        return [
+            wl / max_len,
+            1 - self.num_masked / wl,
+            self.first_masked_idx / wl,
+            self.last_masked_idx / wl,
+            self.num_masked_blocks / wl,
+            avg_masked_block_len / wl,
+            avg_remaining_freq,
+            masked_entropy,
+            max(max_lives - self.total_incorrect, 0) / max_lives,
+            self.masked_prefix_len / wl,
+            self.masked_suffix_len / wl,
+            self.total_correct / max_lives,
+            self.total_incorrect / max_lives,
+            self.num_correct_vowels / 5,
+            self.num_incorrect_vowels / 5,
+            self.num_correct_consonants / 21,
+            self.num_incorrect_consonants / 21,
+            self.num_repeated_letters / wl,
+            self.num_contiguous_letters / wl
+        ]
+
+    def encoded_features(self):
+
+        # Same structure as an encode_features() entry
+        ngram_counts = self.encoded['ngram_vector']
+        total = sum(ngram_counts) or 1
+        return {
+            'input_ids': list(self.encoded['input_ids']),
+            'masked_idx': list(self.encoded['masked_idx']),
+            'norm_features': self.norm_features(),
+            'char_multi_hot': list(self.encoded['char_multi_hot']),
+            'ngram_vector': [count / total for count in ngram_counts]
+        }
+
+    def to_tensors(self):
+
+        encoded = self.encoded_features()
+        return {
+            'input_ids': torch.tensor(encoded['input_ids'], dtype=torch.long, device=device).unsqueeze(0),
+            'masked_idx': torch.tensor(encoded['masked_idx'], dtype=torch.long, device=device).unsqueeze(0),
+            'norm_features': torch.tensor(encoded['norm_features'], dtype=torch.float32, device=device).unsqueeze(0),
+            'char_multi_hot': torch.tensor(encoded['char_multi_hot'], dtype=torch.float32, device=device).unsqueeze(0),
+            'ngram_vector': torch.tensor(encoded['ngram_vector'], dtype=torch.float32, device=device).unsqueeze(0)
+        }
+
+def _encode_batch(current_states, guess_histories, guessed):
+
+    n = len(current_states)
+    if n >= vectorize_min_batch:
+        with profiling.stage('encode_batch', n):
+            return encode_batch(current_states, guessed)
+
+    samples = [
+        {'current_state': current_state, 'guess_history': guessed_letters}
+        for current_state, guessed_letters in zip(current_states, guess_histories)
+    ]
+    with profiling.stage('generate_features', n):
+        features = generate_features(samples)
+    with profiling.stage('encode_features', n):
+        return _stack_encoded(encode_features(features))
+
+def _stack_encoded(encoded):
+
+    # List of encode_features entries -> dict of [N, ...] arrays with the model input dtypes
+    return {
+        key: np.array([e[key] for e in encoded], dtype=np.int64 if key in ('input_ids', 'masked_idx') else np.float32)
+        for key in ('input_ids', 'masked_idx', 'norm_features', 'char_multi_hot', 'ngram_vector')
     }
 
-    # Step 2: Feature generation and encoding
-    features = generate_features(sample)
-    encoded = encode_features(features)[0]
+def trim_batch(batch):
+
+    # Words are right-padded, so the leading columns keep their positions; only valid when the
+    # model masks [PAD] (otherwise the padding changes the encoder output)
+    input_ids = batch['input_ids']
+    width = max(int((input_ids != vocab['[PAD]']).sum(1).max()), 1)
+    if width == input_ids.shape[1]:
+        return batch
+    trimmed = dict(batch)
+    trimmed['input_ids'] = input_ids[:, :width]
+    trimmed['masked_idx'] = batch['masked_idx'][:, :width]
+    return trimmed
+
+def _encoded_tensors(encoded, guessed):
+
+    # Step 0: With a padding-mask model, drop the [PAD] columns no word in the batch reaches
+    if trim_padding:
+        encoded = trim_batch(encoded)
+
+    keys = ('input_ids', 'masked_idx', 'norm_features', 'char_multi_hot', 'ngram_vector')
+    if backend == 'numpy':
+        return tuple(encoded[key] for key in keys), guessed
+
+    # Step 1: Wrap the arrays as tensors (no copies on CPU)
+    inputs = tuple(
+        torch.from_numpy(encoded[key]).to(device)
+        for key in keys
+    )
+    return inputs, torch.from_numpy(guessed).to(device)
+
+def _forward(inputs):
+
+    if backend == 'numpy':
+        return model(*inputs)
+
+    # Step 2: Model inference (frozen TorchScript modules are already in inference mode)
+    if not isinstance(model, torch.jit.ScriptModule):
+        model.eval()
+
+    with torch.no_grad():
+        # Positional arguments: the frozen TorchScript module is called the same way
+        return model(*inputs)
+
+def _select_letters_numpy(logits, guessed, top_k):
+
+    # Same selection as _select_letters on NumPy arrays (probs is an ndarray)
+    with np.errstate(over='ignore'):
+        probs = (1.0 / (1.0 + np.exp(-logits))).astype(np.float32)
+    probs[guessed] = 0.0
+
+    selectable = np.where(guessed, np.float32(-1.0), probs)
+    best = selectable.argmax(axis=1)
+    exhausted = guessed.all(axis=1)
+    letters = [None if done else alphabet[idx] for idx, done in zip(best.tolist(), exhausted.tolist())]
+
+    k = min(top_k, 26)
+    top_idx = np.argsort(-selectable, axis=1, kind='stable')[:, :k]
+    top_probs = np.take_along_axis(selectable, top_idx, axis=1)
+    top = [
+        [(alphabet[idx], prob) for idx, prob in zip(row_idx, row_probs) if prob >= 0]
+        for row_idx, row_probs in zip(top_idx.tolist(), top_probs.tolist())
+    ]
+    return letters, probs, top
 
-    # Step 3: Move tensors to device
-    input_ids = torch.tensor(encoded['input_ids'], dtype=torch.long, device=device).unsqueeze(0)
-    masked_idx = torch.tensor(encoded['masked_idx'], dtype=torch.long, device=device).unsqueeze(0)
-    norm_features = torch.tensor(encoded['norm_features'], dtype=torch.float32, device=device).unsqueeze(0)
-    char_multi_hot = torch.tensor(encoded['char_multi_hot'], dtype=torch.float32, device=device).unsqueeze(0)
-    ngram_vector = torch.tensor(encoded['ngram_vector'], dtype=torch.float32, device=device).unsqueeze(0)
+def _select_letters(logits, guessed, top_k):
 
-    # Step 4: Model inference
-    model.eval()
+    if backend == 'numpy':
+        return _select_letters_numpy(logits, guessed, top_k)
 
     with torch.no_grad():
 
-        logits = model(
-            input_ids=input_ids,
-            masked_idx=masked_idx,
-            norm_features=norm_features,
-            char_multi_hot=char_multi_hot,
-            ngram_vector=ngram_vector
-        )
+        # Guessed letters get probability 0 so they can never be picked again
+        probs = torch.sigmoid(logits).masked_fill(guessed, 0.0)  # shape: [N, 26]
+
+        # Step 3: Letter selection (guessed letters are pushed below any real probability)
+        selectable = probs.masked_fill(guessed, -1.0)
+        best = selectable.argmax(dim=1).tolist()
+        exhausted = guessed.all(dim=1).tolist()
+        letters = [None if done else alphabet[idx] for idx, done in zip(best, exhausted)]
+
+        k = min(top_k, 26)
+        top_probs, top_idx = selectable.topk(k, dim=1)
+        top = [
+            [(alphabet[idx], prob) for idx, prob in zip(row_idx, row_probs) if prob >= 0]
+            for row_idx, row_probs in zip(top_idx.tolist(), top_probs.tolist())
+        ]
+
+    return letters, probs, top
+
+def _predict_encoded(encoded, guessed, top_k):
+
+    # Tensor construction, forward pass and letter selection (separate stages for profiling)
+    n = len(guessed)
+    with profiling.stage('tensor_build', n):
+        inputs, guessed = _encoded_tensors(encoded, guessed)
+    with profiling.stage('forward', n):
+        logits = _forward(inputs)
+    with profiling.stage('select', n):
+        return _select_letters(logits, guessed, top_k)
+
+def _empty_probs():
+    return np.zeros((0, 26), dtype=np.float32) if backend == 'numpy' else torch.zeros((0, 26))
+
+def predict_next_letters(current_states: list, guess_histories: list, top_k: int = 3):
+
+    """
+    Batched version of predict_next_letter: one tensor build and one forward pass for N games.
+
+    Returns (letters, probs, top) where letters holds the N predicted letters (None when every
+    letter was guessed), probs is the [N, 26] sigmoid probability tensor (an ndarray on the
+    NumPy backend) with guessed letters set to 0, and top holds the top_k (letter, prob) pairs per game over unguessed letters.
+    """
 
-        probs = torch.sigmoid(logits).squeeze(0)  # shape: [26]
+    if not current_states:
+        return [], _empty_probs(), []
 
-        # Filter out guessed letters
-        filtered = [(char, probs[i].item()) for i, char in enumerate(alphabet) if char not in guessed_letters]
+    # Feature generation and encoding for the whole batch
+    guessed = guessed_matrix(guess_histories)
+    encoded = _encode_batch(current_states, guess_histories, guessed)
+
+    return _predict_encoded(encoded, guessed, top_k)
+
+def predict_from_feature_states(feature_states: list, top_k: int = 3):
+
+    # Same outputs as predict_next_letters, reading the encoding kept by each GameFeatureState
+    if not feature_states:
+        return [], _empty_probs(), []
+
+    with profiling.stage('feature_state', len(feature_states)):
+        encoded = _stack_encoded([fs.encoded_features() for fs in feature_states])
+        guessed = np.array([fs.guessed_flags for fs in feature_states], dtype=bool)
+
+    return _predict_encoded(encoded, guessed, top_k)
+
+def predict_game_states(game_states: list, top_k: int = 3):
+
+    # Same outputs as predict_next_letters for GameStates (guessed matrix straight from the masks)
+    if not game_states:
+        return [], _empty_probs(), []
+
+    guessed = guessed_matrix_of(game_states)
+    encoded = _encode_batch([gs.masked for gs in game_states], [gs.guesses for gs in game_states], guessed)
+
+    return _predict_encoded(encoded, guessed, top_k)
+
+def predict_next_letter(current_state: str, guessed_letters: list, use_cache: bool = None,
+                        feature_state=None, game_state=None) -> str:
+
+    # feature_state: optional GameFeatureState tracking this game, skips feature generation
+    # game_state: optional GameState of this position, supplies the cache key and guessed mask
+
+    start = time.perf_counter() if profiling.enabled else 0.0
+
+    if use_cache is None:
+        use_cache = cache_enabled
+
+    if use_cache:
+        key = game_state.key if game_state is not None else cache_key(current_state, guessed_letters)
+        found, letter = prediction_cache.get(key)
+        if found:
+            profiling.count('cache_hit')
+            if profiling.enabled:
+                profiling.record_turn(len(current_state), time.perf_counter() - start)
+            return letter
+
+    letter = None
+
+    if candidate_index is not None:
+        index_letter, num_candidates = candidate_index.predict(current_state, guessed_letters)
+        if 0 < num_candidates <= hybrid_max_candidates:
+            letter = index_letter
+            profiling.count('candidate_index')
+
+    if letter is None and planner is not None:
+        profiling.count('planner')
+        letter = planner.choose(current_state, guessed_letters)
+
+    if letter is None:
+        profiling.count('model')
+        if feature_state is not None:
+            letters, _, _ = predict_from_feature_states([feature_state], top_k=1)
+        elif game_state is not None:
+            letters, _, _ = predict_game_states([game_state], top_k=1)
+        else:
+            letters, _, _ = predict_next_letters([current_state], [guessed_letters], top_k=1)
+        letter = letters[0]
 
-        if not filtered:
-            return None
+    if use_cache:
+        prediction_cache.put(key, letter)
 
-        top_char, top_prob = max(filtered, key=lambda x: x[1])
+    if profiling.enabled:
+        profiling.record_turn(len(current_state), time.perf_counter() - start)
 
-        return top_char
\ No newline at end of file
+    return letter
@@ -4,9 +4,16 @@ import torch
 class HangmanTransformer(nn.Module):
 
     def __init__(self, vocab_size=28, max_len=10, d_model=256, nhead=4, num_layers=4,
-                 dim_feedforward=512, dropout=0.1, ngram_dim=35, aux_dim=19):
+                 dim_feedforward=512, dropout=0.1, ngram_dim=35, aux_dim=19, batch_first=False, pad_token_id=None):
         super(HangmanTransformer, self).__init__()
 
+        # batch_first and pad_token_id only change how the encoder is called, not its parameters,
+        # so every configuration loads the same state_dict. With pad_token_id set, [PAD] positions
+        # are excluded from attention (src_key_padding_mask) and inputs may be trimmed to the
+        # longest word in the batch.
+        self.batch_first = batch_first
+        self.pad_token_id = pad_token_id
+
         self.token_embedding = nn.Embedding(vocab_size, d_model)
         self.position_embedding = nn.Embedding(max_len, d_model)
         self.embedding_dropout = nn.Dropout(dropout)  # Token dropout
@@ -16,7 +23,8 @@ class HangmanTransformer(nn.Module):
             nhead=nhead,
             dim_feedforward=dim_feedforward,
             dropout=dropout,
-            activation='gelu'
+            activation='gelu',
+            batch_first=batch_first
         )
         self.transformer_encoder = nn.TransformerEncoder(encoder_layer, num_layers=num_layers)
 
@@ -44,9 +52,15 @@ class HangmanTransformer(nn.Module):
         pos_emb = self.position_embedding(positions)
         x = self.embedding_dropout(token_emb + pos_emb)
 
-        x = x.transpose(0, 1)  # Transformer expects seq_len x batch x embed
-        transformer_output = self.transformer_encoder(x)
-        x = transformer_output.transpose(0, 1)  # Back to batch x seq_len x embed
+        padding_mask = input_ids.eq(self.pad_token_id) if self.pad_token_id is not None else None
+
+        if self.batch_first:
+            # Batch-first with a padding mask is eligible for PyTorch's fused inference fast path
+            x = self.transformer_encoder(x, src_key_padding_mask=padding_mask)
+        else:
+            x = x.transpose(0, 1)  # Transformer expects seq_len x batch x embed
+            transformer_output = self.transformer_encoder(x, src_key_padding_mask=padding_mask)
+            x = transformer_output.transpose(0, 1)  # Back to batch x seq_len x embed
 
         # Masked token representation
         masked_idx = masked_idx.bool()
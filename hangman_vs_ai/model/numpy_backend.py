@@ -0,0 +1,177 @@
+import json
+import math
+import numpy as np
+from model.checkpoints import MODEL_VARIANTS, checkpoint_sha256
+
+# Torch-free HangmanTransformer for CPU-only deployments.
+#
+# export_npz() flattens a checkpoint's state_dict into a .npz (same key names, float32) plus a
+# JSON config; NumpyHangmanTransformer replays HangmanTransformer.forward in eval mode with
+# NumPy: embeddings, post-norm GELU encoder layers (nn.TransformerEncoderLayer defaults),
+# masked mean pooling, aux_mlp and cls_head. Only export_npz needs torch.
+
+FORMAT_VERSION = 1
+LAYER_NORM_EPS = 1e-5
+
+def export_npz(model_path, output_path, variant='base'):
+
+    """
+    Export a state_dict checkpoint to a flat .npz for the NumPy backend.
+
+    Inputs:
+    -------
+    model_path : str
+        state_dict checkpoint.
+    output_path : str
+        Destination .npz (see numpy_model_path()).
+    variant : str
+        Architecture of the checkpoint (a MODEL_VARIANTS key).
+
+    Outputs:
+    --------
+    Path of the exported file.
+    """
+
+    from model.inference import load_state_dict_file
+
+    config = {
+        'format_version': FORMAT_VERSION,
+        'variant': variant,
+        'checkpoint_sha256': checkpoint_sha256(model_path),
+        **MODEL_VARIANTS[variant]
+    }
+    state_dict = load_state_dict_file(model_path)
+    arrays = {name: tensor.detach().float().numpy() for name, tensor in state_dict.items()}
+    np.savez(output_path, __config__=np.array(json.dumps(config)), **arrays)
+    return output_path
+
+def _erf(x):
+    # Abramowitz & Stegun 7.1.26 (|error| < 1.5e-7, below float32 resolution of the GELU output),
+    # evaluated in place in float32 (the activation is the largest array of the forward pass)
+    a = np.abs(x)
+    t = a * np.float32(0.3275911)
+    t += 1
+    np.reciprocal(t, out=t)
+    poly = t * np.float32(1.061405429)
+    for coefficient in (-1.453152027, 1.421413741, -0.284496736, 0.254829592):
+        poly += np.float32(coefficient)
+        poly *= t
+    np.square(a, out=a)
+    np.negative(a, out=a)
+    np.exp(a, out=a)
+    poly *= a
+    np.subtract(1, poly, out=poly)
+    return np.copysign(poly, x, out=poly)
+
+def gelu(x):
+    # Exact (erf) GELU, as activation='gelu' in nn.TransformerEncoderLayer
+    out = _erf(x * np.float32(1.0 / math.sqrt(2.0)))
+    out += 1
+    out *= x
+    out *= np.float32(0.5)
+    return out
+
+def layer_norm(x, weight, bias, eps=LAYER_NORM_EPS):
+    mean = x.mean(axis=-1, keepdims=True)
+    var = ((x - mean) ** 2).mean(axis=-1, keepdims=True)
+    return (x - mean) / np.sqrt(var + eps) * weight + bias
+
+def linear(x, weight_t, bias):
+    # weight_t is the transposed [in, out] weight; flattening the leading dims keeps this one BLAS
+    # gemm (a 3-D @ 2-D matmul falls back to a much slower per-batch loop)
+    return (x.reshape(-1, x.shape[-1]) @ weight_t).reshape(*x.shape[:-1], weight_t.shape[1]) + bias
+
+def softmax(x, axis=-1):
+    x = x - x.max(axis=axis, keepdims=True)
+    e = np.exp(x)
+    return e / e.sum(axis=axis, keepdims=True)
+
+class NumpyHangmanTransformer:
+
+    """
+    Eval-mode HangmanTransformer on NumPy arrays.
+
+    Called like the torch module, model(input_ids, masked_idx, norm_features, char_multi_hot,
+    ngram_vector), with [N, ...] arrays; returns the [N, 26] float32 logits.
+    pad_token_id masks [PAD] keys in attention (the padding-mask model).
+    """
+
+    def __init__(self, params, config, pad_token_id=None):
+        self.params = params
+        # Contiguous [in, out] copies of every linear weight (state_dict stores [out, in])
+        self.weights_t = {
+            name[:-len('weight')]: np.ascontiguousarray(value.T)
+            for name, value in params.items()
+            if name.endswith('weight') and value.ndim == 2 and 'embedding' not in name
+        }
+        self.config = config
+        self.nhead = config['nhead']
+        self.num_layers = config['num_layers']
+        self.pad_token_id = pad_token_id
+
+    @classmethod
+    def load(cls, path, pad_token_id=None):
+        with np.load(path) as data:
+            config = json.loads(str(data['__config__']))
+            params = {name: data[name].astype(np.float32) for name in data.files if name != '__config__'}
+        assert config['format_version'] == FORMAT_VERSION, f"Unsupported NumPy model format {config['format_version']}"
+        return cls(params, config, pad_token_id)
+
+    def _linear(self, x, prefix):
+        # prefix: module path with trailing separator, e.g. 'cls_head.0.' or '...self_attn.in_proj_'
+        return linear(x, self.weights_t[prefix], self.params[prefix + 'bias'])
+
+    def parameters(self):
+        # Same role as nn.Module.parameters() for parameter counts
+        return iter(self.params.values())
+
+    def _self_attention(self, x, layer, key_padding_mask):
+        prefix = f'transformer_encoder.layers.{layer}.self_attn.'
+        batch_size, seq_len, d_model = x.shape
+        head_dim = d_model // self.nhead
+
+        # [N, L, 3d] -> three [N, heads, L, head_dim]
+        qkv = self._linear(x, prefix + 'in_proj_')
+        qkv = qkv.reshape(batch_size, seq_len, 3, self.nhead, head_dim).transpose(2, 0, 3, 1, 4)
+        q, k, v = qkv[0], qkv[1], qkv[2]
+
+        scores = q @ k.transpose(0, 1, 3, 2) / math.sqrt(head_dim)
+        if key_padding_mask is not None:
+            scores = np.where(key_padding_mask[:, None, None, :], -np.inf, scores)
+        attn = softmax(scores) @ v
+
+        attn = attn.transpose(0, 2, 1, 3).reshape(batch_size, seq_len, d_model)
+        return self._linear(attn, prefix + 'out_proj.')
+
+    def _encoder_layer(self, x, layer, key_padding_mask):
+        p = self.params
+        prefix = f'transformer_encoder.layers.{layer}.'
+
+        # Post-norm (norm_first=False): x = norm1(x + SA(x)); x = norm2(x + FF(x))
+        x = layer_norm(x + self._self_attention(x, layer, key_padding_mask), p[prefix + 'norm1.weight'], p[prefix + 'norm1.bias'])
+        ff = self._linear(gelu(self._linear(x, prefix + 'linear1.')), prefix + 'linear2.')
+        return layer_norm(x + ff, p[prefix + 'norm2.weight'], p[prefix + 'norm2.bias'])
+
+    def __call__(self, input_ids, masked_idx, norm_features, char_multi_hot, ngram_vector):
+        p = self.params
+        seq_len = input_ids.shape[1]
+
+        # Step 1: Token + position embeddings
+        x = p['token_embedding.weight'][input_ids] + p['position_embedding.weight'][:seq_len]
+        key_padding_mask = input_ids == self.pad_token_id if self.pad_token_id is not None else None
+
+        # Step 2: Encoder
+        for layer in range(self.num_layers):
+            x = self._encoder_layer(x, layer, key_padding_mask)
+
+        # Step 3: Mean of the masked positions
+        mask = masked_idx.astype(np.float32)
+        masked_token_emb = (x * mask[:, :, None]).sum(axis=1) / np.maximum(mask.sum(axis=1, keepdims=True), 1)
+
+        # Step 4: Auxiliary features and classifier
+        aux_features = np.concatenate([norm_features, char_multi_hot, ngram_vector], axis=1).astype(np.float32)
+        aux_emb = self._linear(np.maximum(self._linear(aux_features, 'aux_mlp.0.'), 0), 'aux_mlp.3.')
+
+        cls_input = np.concatenate([masked_token_emb, aux_emb], axis=1)
+        hidden = np.maximum(self._linear(cls_input, 'cls_head.0.'), 0)
+        return self._linear(hidden, 'cls_head.3.').astype(np.float32)
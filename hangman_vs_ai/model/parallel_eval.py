@@ -0,0 +1,147 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from model.checkpoints import checkpoint_sha256, sha256_cache
+from model.constants import max_lives
+
+# Multi-process version of evaluate_hangman_model.
+#
+# The word list is dealt round-robin into shards (so every shard gets a similar mix of word
+# lengths), a pool of spawned workers loads the checkpoint once each with a fixed intra-op thread
+# count, every shard is played by the lockstep evaluator inside one worker, and the per-shard
+# traces are merged back into word_list order. Games do not interact, so the merged win rate does
+# not depend on the worker count.
+
+THREAD_ENV_VARS = ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS')
+
+def _init_worker(model_path, variant, backend_name, padding_mask, num_threads, digests):
+
+    # Step 1: Pin the BLAS/OpenMP pools before torch or NumPy start them (hence spawned workers)
+    for name in THREAD_ENV_VARS:
+        os.environ[name] = str(num_threads)
+
+    from model import checkpoints, inference
+    if inference.torch is not None:
+        inference.torch.set_num_threads(num_threads)
+        inference.torch.set_num_interop_threads(1)
+
+    # Step 2: One model load per worker, reused for every shard it plays (checkpoint already hashed)
+    checkpoints.sha256_cache.update(digests)
+    inference.load_model(model_path, variant=variant, padding_mask=padding_mask, backend_name=backend_name)
+
+def _evaluate_shard(task):
+
+    shard_idx, indices, words, batch_size, lives = task
+    from model.evaluator import evaluate_hangman_model
+
+    # Wall-clock (not perf_counter) bounds, comparable across processes
+    started = time.time()
+    results = evaluate_hangman_model(words, batch_size=batch_size, max_lives=lives, quiet=True)
+    return shard_idx, indices, results, (started, time.time())
+
+def length_breakdown(traces):
+
+    # Per word length: games, wins, win rate and mean number of wrong guesses
+    buckets = {}
+    for trace in traces:
+        bucket = buckets.setdefault(len(trace['word']), {'games': 0, 'wins': 0, 'wrong_guesses': 0})
+        bucket['games'] += 1
+        bucket['wins'] += trace['won']
+        bucket['wrong_guesses'] += trace['wrong_guesses']
+    return {
+        length: {
+            'games': b['games'],
+            'wins': b['wins'],
+            'win_rate': b['wins'] / b['games'],
+            'mean_wrong_guesses': b['wrong_guesses'] / b['games']
+        }
+        for length, b in sorted(buckets.items())
+    }
+
+def evaluate_parallel(word_list, model_path, num_workers=None, threads_per_worker=1, shards_per_worker=4,
+                      batch_size=1024, max_lives=max_lives, variant='base', backend_name='torch',
+                      padding_mask=None):
+
+    """
+    Evaluate the model on a word list across a process pool.
+
+    Parameters:
+    -----------
+    word_list : list of str
+        Words to test the model on.
+    model_path : str
+        Checkpoint loaded by every worker (load_model arguments: variant, backend_name,
+        padding_mask).
+    num_workers : int
+        Worker processes, defaults to os.cpu_count() // threads_per_worker.
+    threads_per_worker : int
+        torch intra-op (and BLAS) threads of each worker.
+    shards_per_worker : int
+        Shards per worker; more shards balance uneven shards better, fewer keep batches fuller.
+    batch_size : int
+        Games in flight per forward pass within a shard.
+    max_lives : int
+        Number of incorrect guesses allowed per word.
+
+    Returns:
+    --------
+    results : dict
+        Same keys as evaluate_hangman_model ('elapsed' is the wall-clock time including worker
+        start-up, 'forward_passes' the sum over shards), plus 'eval_elapsed' (first shard start
+        to last shard end inside the pool), 'num_workers', 'num_shards' and 'by_length'
+        (see length_breakdown).
+    """
+
+    words = [word.strip().lower() for word in word_list if word.strip()]
+    num_workers = max(1, num_workers or (os.cpu_count() or 1) // threads_per_worker)
+    num_shards = min(len(words), num_workers * shards_per_worker) or 1
+
+    # Round-robin dealing: shard k holds words k, k + num_shards, ... (similar length mix per shard)
+    tasks = [
+        (shard_idx, list(range(shard_idx, len(words), num_shards)), words[shard_idx::num_shards], batch_size, max_lives)
+        for shard_idx in range(num_shards)
+    ]
+
+    # Hash the checkpoint once here rather than in every worker
+    digests = {}
+    if os.path.exists(model_path):
+        checkpoint_sha256(model_path)
+        digests = dict(sha256_cache)
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=num_workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+        initargs=(model_path, variant, backend_name, padding_mask, threads_per_worker, digests)
+    ) as pool:
+        shard_results = list(pool.map(_evaluate_shard, tasks))
+    elapsed = time.perf_counter() - start
+
+    # Merge the shards back into word_list order
+    traces = [None] * len(words)
+    forward_passes = 0
+    for _, indices, results, _ in shard_results:
+        for idx, trace in zip(indices, results['traces']):
+            traces[idx] = trace
+        forward_passes += results['forward_passes']
+
+    wins = sum(trace['won'] for trace in traces)
+    total = len(traces)
+    bounds = [shard[-1] for shard in shard_results]
+    eval_elapsed = max(end for _, end in bounds) - min(begin for begin, _ in bounds) if bounds else 0.0
+
+    return {
+        'win_rate': wins / total if total else 0.0,
+        'wins': wins,
+        'total': total,
+        'elapsed': elapsed,
+        'eval_elapsed': eval_elapsed,
+        'games_per_sec': total / elapsed if elapsed > 0 else float('inf'),
+        'forward_passes': forward_passes,
+        'num_workers': num_workers,
+        'num_shards': num_shards,
+        'by_length': length_breakdown(traces),
+        'traces': traces
+    }
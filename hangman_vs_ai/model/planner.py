@@ -0,0 +1,339 @@
+import threading
+import time
+import numpy as np
+from model.constants import alphabet, guess_order, max_lives
+from model.inference import cache_key, predict_next_letters
+
+# Time-budgeted expectimax over the next guesses.
+#
+# A guess is a chance node: the dictionary words still consistent with the state (CandidateIndex)
+# are split by where the letter would appear, and each reveal pattern is an outcome weighted by
+# its share of the candidates (the empty pattern costs a life). Decision nodes branch on the
+# model's `branching` most probable unguessed letters; positions at the search horizon are scored
+# with the model (probability that its best letter hits, compounded over the remaining lives).
+#
+# The search deepens one ply at a time. Every ply first walks the tree to collect the positions
+# the model has not scored yet, scores them in batched forward passes (memoized across plies and
+# turns), then backs the values up. When the deadline falls inside a ply, that ply is abandoned
+# and the answer of the deepest completed one is returned (depth 0 being the greedy letter).
+# Every step checks the deadline, including the root's own forward pass: a turn that cannot
+# afford it answers with the most frequent unguessed letter instead.
+#
+# One planner serves concurrent turns (app sessions and the AI pre-planning threads): the
+# per-turn tree and deadline live in a _Search object. Turns share the memo of model scores and
+# the forward-pass cost estimate (under a lock) and the read-only dictionary pattern arrays.
+
+# Reveal patterns are uint16 bitmasks over positions: longer states get the greedy model letter
+MAX_PATTERN_LEN = 16
+
+def _probs_numpy(probs):
+    return probs if isinstance(probs, np.ndarray) else probs.detach().cpu().numpy()
+
+class _Deadline(Exception):
+    pass
+
+class LookaheadPlanner:
+
+    """
+    Anytime expectimax letter chooser on top of the model's letter probabilities.
+
+    Safe to share between threads: concurrent turns only share the memo of scored positions
+    and the forward-pass cost estimate.
+
+    Parameters:
+    -----------
+    index : CandidateIndex
+        Dictionary the outcome distributions are drawn from. States with no consistent word,
+        or longer than MAX_PATTERN_LEN, fall back to the greedy model letter.
+    budget_ms : float
+        Per-turn time budget. Every forward pass is sized to the time left from the measured
+        cost of earlier ones, so a turn overruns it only by a misjudged pass (or the first pass
+        of a new planner, before anything was measured). 0 plays the greedy model letter
+        without a deadline.
+    max_depth : int
+        Deepest number of guesses searched.
+    branching : int
+        Letters expanded per decision node (the model's top ones).
+    chunk_size : int
+        Largest number of positions per batched forward pass (chunks are cut to the time left).
+    memo_size : int
+        Scored positions kept between turns before the memo is cleared.
+    """
+
+    def __init__(self, index, budget_ms=50.0, max_depth=3, branching=4, chunk_size=256, memo_size=200_000,
+                 max_lives=max_lives):
+        self.index = index
+        self.budget = budget_ms / 1000
+        self.max_depth = max_depth
+        self.branching = branching
+        self.chunk_size = chunk_size
+        self.memo_size = memo_size
+        self.max_lives = max_lives
+        self.memo = {}
+        self.call_time = 0.0  # Fixed cost of a forward pass (s)
+        self.row_time = 0.0  # Cost per position (s)
+        self._timings = np.zeros(5)  # Decayed sums of 1, n, n^2, t, n*t over past forward passes
+        # Built up front (about 50 bytes per dictionary word) so no turn pays for it
+        self.patterns = {length: self._letter_patterns(length) for length in index.words if length <= MAX_PATTERN_LEN}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Model scores (shared between turns)
+    # ------------------------------------------------------------------
+
+    def _record_timing(self, rows, elapsed):
+
+        # Forward pass cost as call_time + rows * row_time, a least-squares fit over the recent
+        # passes (older ones decay), so both small and large chunks are predicted
+        self._timings = 0.9 * self._timings + [1.0, rows, rows * rows, elapsed, rows * elapsed]
+        self._fit_timings()
+
+    def _fit_timings(self):
+        s1, sn, snn, st, snt = self._timings
+        if sn <= 0:
+            return
+        det = s1 * snn - sn * sn
+        if det > 1e-9 * s1 * snn:
+            self.row_time = max((s1 * snt - sn * st) / det, 0.0)
+            self.call_time = max((st - self.row_time * sn) / s1, 0.0)
+        else:
+            # Every pass had the same size so far: charge it all per row
+            self.row_time, self.call_time = st / sn, 0.0
+
+    def _chunk_rows(self, remaining):
+        # Most positions one forward pass can score in `remaining` seconds (0 if not even one)
+        if remaining >= self.call_time + self.chunk_size * self.row_time:
+            return self.chunk_size
+        if remaining < self.call_time + self.row_time:
+            return 0
+        return int((remaining - self.call_time) / self.row_time)
+
+    def _score(self, positions, deadline):
+
+        # Model probabilities for (state, guessed) positions not memoized yet, in batched chunks
+        # shrunk to what the predicted forward cost fits into the time left
+        with self._lock:
+            missing = {}
+            for i, (state, guessed) in enumerate(positions):
+                if i % 256 == 255 and time.perf_counter() >= deadline:
+                    raise _Deadline
+                key = cache_key(state, guessed)
+                if key not in self.memo:
+                    missing[key] = (state, guessed)
+        missing = list(missing.items())
+
+        lo = 0
+        while lo < len(missing):
+            remaining = deadline - time.perf_counter()
+            with self._lock:
+                size = self._chunk_rows(remaining) if remaining > 0 else 0
+            if size == 0:
+                raise _Deadline
+
+            chunk = missing[lo:lo + size]
+            start = time.perf_counter()
+            _, probs, _ = predict_next_letters([s for _, (s, _) in chunk], [g for _, (_, g) in chunk], top_k=1)
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                for (key, _), row in zip(chunk, _probs_numpy(probs)):
+                    self.memo[key] = row
+                self._record_timing(len(chunk), elapsed)
+            lo += size
+
+    def _probs(self, state, guessed):
+        with self._lock:
+            return self.memo.get(cache_key(state, guessed))
+
+    def _letter_patterns(self, length):
+
+        # [26, num words] reveal pattern (bitmask over positions) of every letter in every
+        # dictionary word of one length, so an outcome split is a single gather
+        words = self.index.words[length]
+        chars = np.frombuffer(''.join(words).encode('ascii'), dtype=np.uint8).reshape(len(words), length)
+        weights = 1 << np.arange(length)
+        return np.stack([(chars == ord(letter)) @ weights for letter in alphabet]).astype(np.uint16)
+
+    # ------------------------------------------------------------------
+    # Turn
+    # ------------------------------------------------------------------
+
+    def plan(self, current_state, guessed_letters, lives=None):
+
+        """
+        Best letter found within the time budget, and how deep the search got.
+
+        Inputs:
+        -------
+        current_state : str
+            Masked word, e.g. '_pp_e'.
+        guessed_letters : list of str
+            Letters guessed so far.
+        lives : int
+            Incorrect guesses left, defaults to max_lives minus the wrong guesses so far.
+
+        Outputs:
+        --------
+        (letter, depth): letter is None when every letter was guessed; depth is the deepest
+        completed ply (0 for the greedy model letter, -1 when the deadline came before the
+        model scored the position and the letter is the most frequent unguessed one).
+        """
+
+        deadline = time.perf_counter() + self.budget if self.budget > 0 else float('inf')
+        with self._lock:
+            if len(self.memo) > self.memo_size:
+                self.memo.clear()
+
+        guessed = list(guessed_letters)
+        if lives is None:
+            lives = self.max_lives - len(set(guessed) - set(current_state))
+        search = _Search(self, deadline)
+
+        # Depth -1: frequency order, the fallback when even the root cannot be scored in time
+        unguessed = [letter for letter in guess_order if letter not in guessed]
+        best, depth_reached = (unguessed[0] if unguessed else None), -1
+
+        # Depth 0: the greedy model letter
+        try:
+            self._score([(current_state, guessed)], deadline)
+        except _Deadline:
+            # Shrink the measured costs, so one slow outlier pass cannot keep every later turn
+            # on the fallback letter
+            with self._lock:
+                self._timings[3:] *= 0.5
+                self._fit_timings()
+            return best, depth_reached
+        probs = self._probs(current_state, guessed)
+        if probs is None:
+            return best, depth_reached
+        unguessed = [i for i in np.argsort(-probs, kind='stable') if alphabet[i] not in guessed]
+        best, depth_reached = (alphabet[unguessed[0]] if unguessed else None), 0
+
+        if best is None or self.budget <= 0 or time.perf_counter() >= deadline:
+            return best, depth_reached
+        if len(current_state) > MAX_PATTERN_LEN:
+            return best, depth_reached
+        candidates = self.index.candidate_indices(current_state, guessed)
+        if len(candidates) == 0:
+            return best, depth_reached
+
+        # Iterative deepening until the deadline (a ply cut short keeps the previous answer)
+        for depth in range(1, self.max_depth + 1):
+            try:
+                positions = []
+                search.collect(current_state, guessed, lives, candidates, depth, positions)
+                self._score(positions, deadline)
+                letter = search.best_letter(current_state, guessed, lives, candidates, depth)
+            except _Deadline:
+                break
+            if letter is not None:
+                best, depth_reached = letter, depth
+            if time.perf_counter() >= deadline:
+                break
+
+        return best, depth_reached
+
+    def choose(self, current_state, guessed_letters, lives=None):
+        # Letter of plan() (None when every letter was guessed)
+        return self.plan(current_state, guessed_letters, lives)[0]
+
+class _Search:
+
+    """
+    Game tree of one turn: the deadline and the expanded decision nodes, built once and shared
+    by the collection and backup passes of every ply. Each check of the deadline raises
+    _Deadline once it has passed.
+    """
+
+    def __init__(self, planner, deadline):
+        self.planner = planner
+        self.deadline = deadline
+        self.tree = {}
+
+    def check(self):
+        if time.perf_counter() >= self.deadline:
+            raise _Deadline
+
+    def _scored(self, state, guessed):
+        # A position evicted by another turn's memo reset abandons the ply like the deadline
+        probs = self.planner._probs(state, guessed)
+        if probs is None:
+            raise _Deadline
+        return probs
+
+    def _top_letters(self, state, guessed):
+        probs = self._scored(state, guessed)
+        order = np.argsort(-probs, kind='stable')
+        return [alphabet[i] for i in order if alphabet[i] not in guessed][:self.planner.branching]
+
+    def _leaf_value(self, state, guessed, lives):
+        if '_' not in state:
+            return 1.0
+        if lives <= 0:
+            return 0.0
+        hit = float(self._scored(state, guessed).max())
+        return 1.0 - (1.0 - hit) ** lives
+
+    def _outcomes(self, state, letter, candidates):
+
+        # (next state, candidate subset, probability) for every reveal pattern of `letter`
+        patterns = self.planner.patterns[len(state)][ord(letter) - ord('a'), candidates]
+
+        # One stable (radix, for uint16) sort groups the candidates by pattern
+        order = np.argsort(patterns, kind='stable')
+        patterns = patterns[order]
+        starts = np.flatnonzero(np.diff(patterns)) + 1
+        values = patterns[np.concatenate(([0], starts))]
+        subsets = np.split(candidates[order], starts)
+        outcomes = []
+        for pattern, subset in zip(values.tolist(), subsets):
+            next_state = ''.join(letter if pattern >> i & 1 else c for i, c in enumerate(state))
+            outcomes.append((next_state, subset, len(subset) / len(candidates)))
+        return outcomes
+
+    def _children(self, state, guessed, lives, candidates):
+
+        # (letter, [(next state, guessed, lives, candidates, probability)]) per expanded letter
+        key = (*cache_key(state, guessed), lives)
+        if key in self.tree:
+            return self.tree[key]
+
+        children = []
+        for letter in self._top_letters(state, guessed):
+            self.check()
+            next_guessed = guessed + [letter]
+            children.append((letter, [
+                (next_state, next_guessed, lives - (next_state == state), subset, prob)
+                for next_state, subset, prob in self._outcomes(state, letter, candidates)
+            ]))
+        self.tree[key] = children
+        return children
+
+    def collect(self, state, guessed, lives, candidates, depth, positions):
+
+        # Positions the depth-limited tree needs scored (parents are scored by shallower plies)
+        if '_' not in state or lives <= 0:
+            return
+        self.check()
+        positions.append((state, guessed))
+        if depth == 0 or self.planner._probs(state, guessed) is None:
+            return
+        for _, outcomes in self._children(state, guessed, lives, candidates):
+            for next_state, next_guessed, next_lives, subset, _ in outcomes:
+                self.collect(next_state, next_guessed, next_lives, subset, depth - 1, positions)
+
+    def _value(self, state, guessed, lives, candidates, depth):
+        if depth == 0 or '_' not in state or lives <= 0:
+            return self._leaf_value(state, guessed, lives)
+        self.check()
+        return max(
+            sum(prob * self._value(s, g, l, c, depth - 1) for s, g, l, c, prob in outcomes)
+            for _, outcomes in self._children(state, guessed, lives, candidates)
+        )
+
+    def best_letter(self, state, guessed, lives, candidates, depth):
+        best_letter, best_value = None, -1.0
+        for letter, outcomes in self._children(state, guessed, lives, candidates):
+            value = sum(prob * self._value(s, g, l, c, depth - 1) for s, g, l, c, prob in outcomes)
+            if value > best_value:
+                best_letter, best_value = letter, value
+        return best_letter
@@ -0,0 +1,112 @@
+import gzip
+import json
+from pathlib import Path
+from model.constants import max_lives
+from model.checkpoints import checkpoint_sha256
+from model.game_state import guessed_bitmask
+
+# Precompiled AI policy: every decision the (deterministic) model makes while playing a word list,
+# stored as {word length: {"<masked state>:<guessed mask>": letter}}. Loading and looking up a
+# table needs neither torch nor the model, so app.py can skip inference for known words.
+# The table records the checkpoint hash and the backend/quantization it was compiled with (the
+# int8 and NumPy models can pick a different letter on near-ties), and load() rejects a table
+# compiled for another configuration than the one being served.
+
+FORMAT_VERSION = 2
+
+def _entry_key(current_state, guessed_letters):
+    return f"{current_state}:{guessed_bitmask(guessed_letters):07x}"
+
+class PolicyTable:
+
+    def __init__(self, table, checkpoint_sha=None, max_lives=max_lives, backend='torch', quantized=False):
+        self.table = table
+        self.checkpoint_sha = checkpoint_sha
+        self.max_lives = max_lives
+        self.backend = backend
+        self.quantized = quantized
+
+    def __len__(self):
+        return sum(len(states) for states in self.table.values())
+
+    def lookup(self, current_state, guessed_letters):
+        # Letter the model would play, or None if this state was never reached while compiling
+        states = self.table.get(str(len(current_state)))
+        if states is None:
+            return None
+        return states.get(_entry_key(current_state, guessed_letters))
+
+    def save(self, path):
+        payload = {
+            'format_version': FORMAT_VERSION,
+            'checkpoint_sha256': self.checkpoint_sha,
+            'max_lives': self.max_lives,
+            'backend': self.backend,
+            'quantized': self.quantized,
+            'table': self.table
+        }
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            json.dump(payload, f, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, path, model_path=None, backend=None, quantized=None):
+        # Returns None when the file is missing or was compiled for a different checkpoint,
+        # backend or quantization (None skips that check)
+        path = Path(path)
+        if not path.exists():
+            return None
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            payload = json.load(f)
+        if payload.get('format_version') != FORMAT_VERSION:
+            return None
+        if model_path is not None and Path(model_path).exists() and payload['checkpoint_sha256'] != checkpoint_sha256(model_path):
+            return None
+        if backend is not None and payload['backend'] != backend:
+            return None
+        if quantized is not None and payload['quantized'] != quantized:
+            return None
+        return cls(payload['table'], payload['checkpoint_sha256'], payload['max_lives'], payload['backend'], payload['quantized'])
+
+def compile_policy(words, model_path, batch_size=4096):
+
+    """
+    Play every word with the loaded model and compile the decisions into a PolicyTable.
+
+    Games are played with the lockstep batched evaluator, then each trace is replayed to
+    recover the (state, guessed letters) -> letter decisions. Words that share a prefix of
+    the game tree share entries, so the table is much smaller than the sum of all games.
+
+    Inputs:
+    -------
+    words : list of str
+        Gameplay word list (e.g. hangman_vs_ai/data/words.txt).
+    model_path : str
+        Checkpoint the model was loaded from (its hash, and the backend and quantization of
+        the loaded model, are stored in the table).
+    batch_size : int
+        Games in flight per forward pass.
+
+    Outputs:
+    --------
+    PolicyTable
+    """
+
+    # Imported here so that loading a table never pulls in torch
+    from model import inference
+    from model.evaluator import evaluate_hangman_model, replay_trace
+
+    results = evaluate_hangman_model(words, batch_size=batch_size, max_lives=max_lives)
+
+    table = {}
+    conflicts = 0
+    for trace in results['traces']:
+        states = table.setdefault(str(len(trace['word'])), {})
+        for current_state, guessed, letter in replay_trace(trace):
+            if states.setdefault(_entry_key(current_state, guessed), letter) != letter:
+                conflicts += 1
+
+    # The model is deterministic, so the same state should always produce the same letter
+    if conflicts:
+        print(f"⚠️  {conflicts} conflicting decisions (batched float round-off on near-ties), first one kept")
+
+    return PolicyTable(table, checkpoint_sha256(model_path), max_lives, inference.backend, inference.model_quantized)
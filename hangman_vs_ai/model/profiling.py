@@ -0,0 +1,130 @@
+import bisect
+import contextlib
+import os
+import threading
+import time
+from collections import defaultdict
+
+# Opt-in stage timers and counters for model/inference.py.
+#
+# Enable with HANGMAN_PROFILE=1 or profiling.enable(). When disabled, stage() hands back a shared
+# no-op context manager and record_turn()/count() return immediately, so the instrumented code
+# pays one function call and a flag check per stage.
+
+enabled = os.environ.get('HANGMAN_PROFILE', '0') == '1'
+
+# Histogram bucket upper bounds in seconds (Prometheus 'le' labels)
+BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+STAGES = ('generate_features', 'encode_features', 'encode_batch', 'feature_state', 'tensor_build', 'forward', 'select')
+
+_NULL = contextlib.nullcontext()
+_lock = threading.Lock()
+
+class Histogram:
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)  # last bucket is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        self.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def as_dict(self):
+        return {'count': self.count, 'sum': self.sum, 'mean': self.sum / self.count if self.count else 0.0}
+
+_stages = defaultdict(Histogram)
+_stage_rows = defaultdict(int)
+_turns = defaultdict(Histogram)
+_events = defaultdict(int)
+
+def enable(flag=True):
+    global enabled
+    enabled = flag
+
+def reset():
+    with _lock:
+        _stages.clear()
+        _stage_rows.clear()
+        _turns.clear()
+        _events.clear()
+
+class _StageTimer:
+
+    __slots__ = ('name', 'rows', 'start')
+
+    def __init__(self, name, rows):
+        self.name = name
+        self.rows = rows
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        with _lock:
+            _stages[self.name].observe(elapsed)
+            _stage_rows[self.name] += self.rows
+        return False
+
+def stage(name, rows=1):
+    # `with profiling.stage('forward', rows=n):` times one stage of one (batched) call
+    return _StageTimer(name, rows) if enabled else _NULL
+
+def record_turn(word_length, seconds):
+    # End-to-end predict_next_letter latency, bucketed by word length
+    if enabled:
+        with _lock:
+            _turns[word_length].observe(seconds)
+
+def count(event, n=1):
+    if enabled:
+        with _lock:
+            _events[event] += n
+
+def snapshot():
+
+    # Plain-dict copy of every counter, for the app's debug panel and tests
+    with _lock:
+        return {
+            'enabled': enabled,
+            'stages': {name: {**hist.as_dict(), 'rows': _stage_rows[name]} for name, hist in _stages.items()},
+            'turns_by_length': {length: hist.as_dict() for length, hist in sorted(_turns.items())},
+            'events': dict(_events)
+        }
+
+def _histogram_lines(metric, label, histograms):
+    lines = []
+    for key, hist in histograms:
+        cumulative = 0
+        for bound, n in zip(BUCKETS + (float('inf'),), hist.buckets):
+            cumulative += n
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            lines.append(f'{metric}_bucket{{{label}="{key}",le="{le}"}} {cumulative}')
+        lines.append(f'{metric}_sum{{{label}="{key}"}} {hist.sum!r}')
+        lines.append(f'{metric}_count{{{label}="{key}"}} {hist.count}')
+    return lines
+
+def prometheus_text():
+
+    # Prometheus text exposition format (version 0.0.4)
+    with _lock:
+        lines = [
+            '# HELP hangman_stage_seconds Time spent in each inference stage per call.',
+            '# TYPE hangman_stage_seconds histogram',
+            *_histogram_lines('hangman_stage_seconds', 'stage', sorted(_stages.items())),
+            '# HELP hangman_stage_rows_total Game states processed by each inference stage.',
+            '# TYPE hangman_stage_rows_total counter',
+            *[f'hangman_stage_rows_total{{stage="{name}"}} {rows}' for name, rows in sorted(_stage_rows.items())],
+            '# HELP hangman_turn_seconds End-to-end predict_next_letter latency by word length.',
+            '# TYPE hangman_turn_seconds histogram',
+            *_histogram_lines('hangman_turn_seconds', 'word_length', sorted(_turns.items())),
+            '# HELP hangman_events_total Prediction path counters (cache hits, index answers, model calls).',
+            '# TYPE hangman_events_total counter',
+            *[f'hangman_events_total{{event="{event}"}} {n}' for event, n in sorted(_events.items())]
+        ]
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,235 @@
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from model import inference, profiling
+from model.constants import max_len
+from model.inference import predict_next_letters, cache_key
+
+# Micro-batching inference service.
+#
+# Concurrent game sessions send one (state, guessed letters) request each; the batcher collects
+# them until either max_batch_size requests are waiting or the oldest has waited max_wait_ms,
+# then answers the whole batch with a single forward pass. The HTTP layer is a minimal
+# HTTP/1.1 implementation on asyncio streams (TCP or Unix socket) with keep-alive.
+#
+#   POST /predict  {"state": "_pp_e", "guessed": ["e", "p"]}  ->  {"letter": "a"}
+#   GET  /metrics  queue depth, batch sizes, latency percentiles, cache stats
+#   GET  /metrics/prometheus  stage profile of model/profiling.py (HANGMAN_PROFILE=1)
+#   GET  /health
+
+_LETTERS = frozenset('abcdefghijklmnopqrstuvwxyz')
+
+def validate_request(request):
+
+    # Error message for a payload the feature encoder would reject, or None if it is valid
+    if not isinstance(request, dict):
+        return "request body must be a JSON object"
+    if 'state' not in request:
+        return "missing field: state"
+    state, guessed = request['state'], request.get('guessed', [])
+    if not isinstance(state, str) or not 0 < len(state) <= max_len:
+        return f"'state' must be a string of 1 to {max_len} characters"
+    if not set(state) <= _LETTERS | {'_'}:
+        return "'state' may only contain a-z and '_'"
+    if not isinstance(guessed, list) or not all(isinstance(g, str) and g in _LETTERS for g in guessed):
+        return "'guessed' must be a list of single letters a-z"
+    return None
+
+class MicroBatcher:
+
+    def __init__(self, max_batch_size=64, max_wait_ms=5.0, latency_window=10_000):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue()
+        # One model thread: forward passes never overlap, the event loop keeps accepting requests
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model")
+        self.latencies = deque(maxlen=latency_window)
+        self.batch_sizes = deque(maxlen=latency_window)
+        self.requests = 0
+        self.batches = 0
+        self.cache_hits = 0
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def predict(self, current_state, guessed_letters):
+        start = time.perf_counter()
+        self.requests += 1
+
+        # Repeated states are answered straight from the shared prediction cache
+        key = cache_key(current_state, guessed_letters)
+        if inference.cache_enabled:
+            hit, letter = inference.prediction_cache.get(key)
+            if hit:
+                self.cache_hits += 1
+                self.latencies.append(time.perf_counter() - start)
+                return letter
+
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((current_state, list(guessed_letters), key, future))
+        letter = await future
+        self.latencies.append(time.perf_counter() - start)
+        return letter
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Step 1: Block for the first request, then collect until full or the deadline passes
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Step 2: One forward pass for the whole batch
+            states = [item[0] for item in batch]
+            histories = [item[1] for item in batch]
+            try:
+                letters, _, _ = await loop.run_in_executor(self.executor, predict_next_letters, states, histories, 1)
+                self.batches += 1
+                self.batch_sizes.append(len(batch))
+                self._resolve(batch, letters)
+            except Exception:
+                # Re-run the items one at a time so a failing row only fails its own request
+                for item in batch:
+                    try:
+                        letters, _, _ = await loop.run_in_executor(self.executor, predict_next_letters, [item[0]], [item[1]], 1)
+                    except Exception as error:
+                        if not item[3].done():
+                            item[3].set_exception(error)
+                    else:
+                        self.batches += 1
+                        self.batch_sizes.append(1)
+                        self._resolve([item], letters)
+
+    def _resolve(self, batch, letters):
+
+        # Step 3: Answer every request and remember the decisions
+        for (_, _, key, future), letter in zip(batch, letters):
+            if inference.cache_enabled:
+                inference.prediction_cache.put(key, letter)
+            if not future.done():
+                future.set_result(letter)
+
+    def metrics(self):
+        latencies = np.array(self.latencies) * 1000
+        percentiles = np.percentile(latencies, [50, 90, 99]).tolist() if len(latencies) else [0.0, 0.0, 0.0]
+        return {
+            'queue_depth': self.queue.qsize(),
+            'requests': self.requests,
+            'batches': self.batches,
+            'cache_hits': self.cache_hits,
+            'mean_batch_size': float(np.mean(self.batch_sizes)) if self.batch_sizes else 0.0,
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000,
+            'latency_ms': dict(zip(('p50', 'p90', 'p99'), percentiles)),
+            'prediction_cache': inference.cache_stats()
+        }
+
+async def _respond(writer, status, payload, keep_alive, content_type='application/json'):
+    body = payload.encode('utf-8') if isinstance(payload, str) else json.dumps(payload).encode('utf-8')
+    reason = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 500: 'Internal Server Error'}[status]
+    writer.write(
+        f"HTTP/1.1 {status} {reason}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + body
+    )
+    await writer.drain()
+
+def make_handler(batcher):
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                # Request line and headers
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, version = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+                keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+
+                # Routing
+                if method == 'POST' and path == '/predict':
+                    try:
+                        request = json.loads(body)
+                        problem = validate_request(request)
+                        if problem:
+                            raise ValueError(problem)
+                        state, guessed = request['state'], request.get('guessed', [])
+                    except ValueError as error:
+                        await _respond(writer, 400, {'error': str(error)}, keep_alive)
+                    else:
+                        try:
+                            letter = await batcher.predict(state, guessed)
+                            await _respond(writer, 200, {'letter': letter}, keep_alive)
+                        except Exception as error:
+                            await _respond(writer, 500, {'error': repr(error)}, keep_alive)
+                elif method == 'GET' and path == '/metrics':
+                    await _respond(writer, 200, batcher.metrics(), keep_alive)
+                elif method == 'GET' and path == '/metrics/prometheus':
+                    await _respond(writer, 200, profiling.prometheus_text(), keep_alive, 'text/plain; version=0.0.4')
+                elif method == 'GET' and path == '/health':
+                    await _respond(writer, 200, {'status': 'ok', 'model_loaded': inference.model is not None}, keep_alive)
+                else:
+                    await _respond(writer, 404, {'error': f'{method} {path}'}, keep_alive)
+
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    return handle
+
+async def serve(host='127.0.0.1', port=8765, unix_socket=None, max_batch_size=64, max_wait_ms=5.0):
+
+    """
+    Run the inference service until cancelled. Call load_model() first.
+
+    Inputs:
+    -------
+    host, port : str, int
+        TCP address (ignored when unix_socket is given).
+    unix_socket : str
+        Path of a Unix domain socket to listen on instead of TCP.
+    max_batch_size : int
+        Largest micro-batch per forward pass.
+    max_wait_ms : float
+        Longest time the first request of a batch waits for company.
+    """
+
+    assert inference.model is not None, "Call load_model() before serving"
+
+    batcher = MicroBatcher(max_batch_size, max_wait_ms)
+    batcher.start()
+    handler = make_handler(batcher)
+
+    if unix_socket:
+        server = await asyncio.start_unix_server(handler, path=unix_socket)
+        address = f"unix://{unix_socket}"
+    else:
+        server = await asyncio.start_server(handler, host, port)
+        address = f"http://{host}:{port}"
+
+    print(f"🚀 Serving on {address} | batch ≤ {max_batch_size} | wait ≤ {max_wait_ms}ms")
+    async with server:
+        await server.serve_forever()
@@ -0,0 +1,225 @@
+import json
+import queue
+import sqlite3
+import threading
+import time
+
+# Persistent Human vs AI results.
+#
+# Finished games are appended to a SQLite database in WAL mode (readers never block the writer,
+# and several app processes can share the file). record() only enqueues the game; a background
+# writer inserts whatever has queued up (up to max_batch games, at most flush_interval seconds
+# after the first one) in one transaction, which also folds the batch into the `summary` table.
+# Leaderboards and totals read that table (one row per scope and key), never the games log.
+#
+#   games    one row per finished game (append-only)
+#   summary  running counts per (scope, key): ('all', ''), ('length', '7'), ('player', 'ada')
+#
+# Games without a player name are logged as ANONYMOUS and counted in the totals and per-length
+# rows, but get no 'player' row: unrelated players would otherwise share one leaderboard entry.
+
+ANONYMOUS = 'anonymous'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    finished_at REAL NOT NULL,
+    player TEXT NOT NULL,
+    word TEXT NOT NULL,
+    winner TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    human_solved INTEGER NOT NULL,
+    ai_solved INTEGER NOT NULL,
+    human_solved_on INTEGER,
+    ai_solved_on INTEGER,
+    human_wrong INTEGER NOT NULL,
+    ai_wrong INTEGER NOT NULL,
+    human_guesses TEXT NOT NULL,
+    ai_guesses TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS summary (
+    scope TEXT NOT NULL,
+    key TEXT NOT NULL,
+    games INTEGER NOT NULL DEFAULT 0,
+    human_wins INTEGER NOT NULL DEFAULT 0,
+    ai_wins INTEGER NOT NULL DEFAULT 0,
+    ties INTEGER NOT NULL DEFAULT 0,
+    human_solved INTEGER NOT NULL DEFAULT 0,
+    ai_solved INTEGER NOT NULL DEFAULT 0,
+    human_wrong INTEGER NOT NULL DEFAULT 0,
+    ai_wrong INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (scope, key)
+);
+CREATE INDEX IF NOT EXISTS summary_player_wins ON summary (scope, human_wins DESC);
+"""
+
+COUNTERS = ('games', 'human_wins', 'ai_wins', 'ties', 'human_solved', 'ai_solved', 'human_wrong', 'ai_wrong')
+
+UPSERT = f"""
+INSERT INTO summary (scope, key, {', '.join(COUNTERS)}) VALUES (?, ?, {', '.join('?' for _ in COUNTERS)})
+ON CONFLICT (scope, key) DO UPDATE SET {', '.join(f'{c} = {c} + excluded.{c}' for c in COUNTERS)}
+"""
+
+def _connect(path):
+    connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+def _summary_deltas(games):
+
+    # Counter increments per (scope, key) for a batch of games
+    deltas = {}
+    for game in games:
+        counts = (
+            1,
+            game['winner'] == 'human',
+            game['winner'] == 'ai',
+            game['winner'] == 'tie',
+            bool(game['human_solved']),
+            bool(game['ai_solved']),
+            game['human_wrong'],
+            game['ai_wrong']
+        )
+        scope_keys = [('all', ''), ('length', str(len(game['word'])))]
+        if game['player'] != ANONYMOUS:
+            scope_keys.append(('player', game['player']))
+        for scope_key in scope_keys:
+            row = deltas.setdefault(scope_key, [0] * len(COUNTERS))
+            for i, count in enumerate(counts):
+                row[i] += count
+    return deltas
+
+class StatsStore:
+
+    """
+    Append-only game log with a background batched writer and incremental summaries.
+
+    Parameters:
+    -----------
+    path : str
+        SQLite database file (created on first use).
+    flush_interval : float
+        Longest time in seconds a recorded game waits before it is written.
+    max_batch : int
+        Most games written per transaction.
+    """
+
+    def __init__(self, path, flush_interval=1.0, max_batch=512):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.written = 0
+        self.batches = 0
+        self.error = None
+
+        with _connect(path) as connection:
+            connection.executescript(SCHEMA)
+        self._reader = threading.local()
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._run, name="stats-writer", daemon=True)
+        self._writer.start()
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def record(self, word, winner, outcome, human_guesses, ai_guesses, human_wrong, ai_wrong,
+               human_solved, ai_solved, human_solved_on=None, ai_solved_on=None, player=ANONYMOUS):
+
+        # Queue one finished game; returns immediately (the writer thread does the I/O).
+        # *_solved_on: guesses that side needed to reveal the word, None if it did not
+        self._queue.put({
+            'finished_at': time.time(),
+            'player': player,
+            'word': word,
+            'winner': winner,
+            'outcome': outcome,
+            'human_solved': int(human_solved),
+            'ai_solved': int(ai_solved),
+            'human_solved_on': human_solved_on,
+            'ai_solved_on': ai_solved_on,
+            'human_wrong': human_wrong,
+            'ai_wrong': ai_wrong,
+            'human_guesses': json.dumps(list(human_guesses)),
+            'ai_guesses': json.dumps(list(ai_guesses))
+        })
+
+    def _run(self):
+        connection = _connect(self.path)
+        while True:
+            # Step 1: Block for the first game, then collect until the batch is full or due
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            # Step 2: Log rows and summary increments in one transaction
+            games = [game for game in batch if game is not None]
+            try:
+                if games:
+                    self._write(connection, games)
+            except Exception as error:
+                # Stats are best effort: a bad batch is dropped, the writer keeps running and the
+                # game itself must not fail because of them
+                self.error = error
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+            if len(games) < len(batch):
+                connection.close()
+                return
+
+    def _write(self, connection, games):
+        columns = list(games[0])
+        with connection:
+            connection.executemany(
+                f"INSERT INTO games ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+                [tuple(game[c] for c in columns) for game in games]
+            )
+            connection.executemany(UPSERT, [(*scope_key, *row) for scope_key, row in _summary_deltas(games).items()])
+        self.written += len(games)
+        self.batches += 1
+
+    def flush(self):
+        # Wait until every game recorded so far is written
+        self._queue.join()
+
+    def close(self):
+        # Write what is queued, then stop the writer thread
+        self._queue.put(None)
+        self._writer.join()
+
+    # ------------------------------------------------------------------
+    # Reads (summary table only)
+    # ------------------------------------------------------------------
+
+    def _connection(self):
+        connection = getattr(self._reader, 'connection', None)
+        if connection is None:
+            connection = self._reader.connection = _connect(self.path)
+            connection.row_factory = sqlite3.Row
+        return connection
+
+    def _summary(self, where, params=(), order='', limit=None):
+        query = f"SELECT * FROM summary WHERE {where} {order}" + (" LIMIT ?" if limit else "")
+        rows = self._connection().execute(query, (*params, limit) if limit else params).fetchall()
+        return [dict(row) for row in rows]
+
+    def totals(self):
+        rows = self._summary("scope = 'all'")
+        return rows[0] if rows else dict.fromkeys(COUNTERS, 0)
+
+    def by_length(self):
+        return sorted(self._summary("scope = 'length'"), key=lambda row: int(row['key']))
+
+    def leaderboard(self, limit=10):
+        # Players with the most wins against the AI
+        return self._summary("scope = 'player'", order="ORDER BY human_wins DESC, games ASC", limit=limit)
@@ -0,0 +1,194 @@
+import contextlib
+import copy
+import time
+import torch
+import torch.nn as nn
+from torch.optim import AdamW
+from torch.utils.data import DataLoader
+from model.checkpoints import write_checkpoint_meta
+from model.inference import build_model
+from model.dataset_store import FIELDS, MemmapHangmanDataset
+
+# Training engine for HangmanTransformer (the notebook's training loop, outside the notebook).
+#
+# Differences from the notebook loop, all aimed at CPU throughput:
+#   - whole pre-collated batches are streamed from the memory-mapped dataset
+#     (model/dataset_store.py) instead of per-item tensors; small datasets can optionally be
+#     decoded once and kept on the device (preload=True, bounded by max_preload_bytes)
+#   - loss and accuracy are summed into device tensors and read back once per epoch, so no step
+#     waits on a .item() sync
+#   - optional bf16 autocast (the loss is still computed in fp32) and torch.compile
+# The accuracy metric (element-wise, sigmoid >= 0.5 against the labels), early stopping on
+# validation accuracy and best-checkpoint saving are the notebook's.
+
+INPUT_KEYS = ('input_ids', 'masked_idx', 'norm_features', 'char_multi_hot', 'ngram_vector')
+
+# Size of one decoded sample (int64 ids and masks, float32 everything else)
+DECODED_SAMPLE_BYTES = sum(
+    count * (8 if name in ('input_ids', 'masked_idx') else 4) for name, (_, _, count) in FIELDS.items()
+)
+
+class PreloadedBatches:
+
+    """
+    Every batch of a MemmapHangmanDataset decoded once and held on `device`.
+
+    Iterating yields the batches (dicts of tensors) in a fresh random order when shuffle=True.
+    Resident size is DECODED_SAMPLE_BYTES per sample, so only use it for datasets that fit in
+    memory (train_model checks this against max_preload_bytes).
+    """
+
+    def __init__(self, dataset, device, shuffle=False, seed=42):
+        self.batches = [
+            {name: tensor.to(device).contiguous() for name, tensor in batch.items()}
+            for batch in (dataset[idx] for idx in range(len(dataset)))
+        ]
+        self.num_samples = sum(len(batch['label']) for batch in self.batches)
+        self.shuffle = shuffle
+        self.generator = torch.Generator().manual_seed(seed)
+
+    def __len__(self):
+        return len(self.batches)
+
+    def __iter__(self):
+        order = torch.randperm(len(self.batches), generator=self.generator).tolist() if self.shuffle else range(len(self.batches))
+        return (self.batches[idx] for idx in order)
+
+def train_model(dataset_path, output_path, variant='base', num_epochs=15, batch_size=512, lr=2e-4,
+                weight_decay=1e-2, patience=2, padding_mask=False, bf16=False,
+                compile_model=False, num_threads=None, device=None, seed=42, preload=False,
+                max_preload_bytes=2 * 1024 ** 3, num_workers=2):
+
+    """
+    Train a HangmanTransformer on a dataset built by build_dataset() / build_dataset_parallel().
+
+    Inputs:
+    -------
+    dataset_path : str or Path
+        Dataset directory; its validation words were held out when it was built.
+    output_path : str
+        Where the best state_dict (highest validation accuracy) is saved, with its training
+        metadata (variant, padding_mask) in checkpoint_meta_path(output_path).
+    variant : str
+        Architecture, a MODEL_VARIANTS key.
+    num_epochs, batch_size, lr, weight_decay, patience :
+        Training schedule (notebook defaults); stops after `patience` epochs without a higher
+        validation accuracy.
+    padding_mask : bool
+        Train the padding-mask model on length-bucketed, trimmed batches.
+    bf16 : bool
+        Run forward and backward under bfloat16 autocast.
+    compile_model : bool
+        Compile the model with torch.compile (the first epoch includes the compilation).
+    num_threads : int
+        torch intra-op threads, defaults to torch's own setting.
+    preload : bool
+        Decode every batch once and keep it on the device instead of streaming from the memmap.
+        Ignored (with a message) when the decoded dataset would exceed max_preload_bytes.
+    num_workers : int
+        DataLoader workers decoding training batches when streaming.
+
+    Outputs:
+    --------
+    history : list of dict
+        Per-epoch train/validation loss and accuracy, epoch time and train samples/sec.
+    """
+
+    device = torch.device(device) if device else torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+    if num_threads:
+        torch.set_num_threads(num_threads)
+    torch.manual_seed(seed)
+
+    # Step 1: Whole-batch datasets, streamed from the memmap or (small datasets) preloaded
+    train_dataset, val_dataset = MemmapHangmanDataset(dataset_path, batch_size=batch_size, bucket_by_length=padding_mask).split()
+    num_train = train_dataset.stop - train_dataset.start
+    num_val = val_dataset.stop - val_dataset.start
+
+    decoded_bytes = (num_train + num_val) * DECODED_SAMPLE_BYTES
+    if preload and decoded_bytes > max_preload_bytes:
+        print(f"⚠️  Decoded dataset would take {decoded_bytes / 1e9:.1f} GB (limit {max_preload_bytes / 1e9:.1f} GB), streaming instead")
+        preload = False
+
+    if preload:
+        start = time.perf_counter()
+        train_batches = PreloadedBatches(train_dataset, device, shuffle=True, seed=seed)
+        val_batches = PreloadedBatches(val_dataset, device)
+        print(f"📦 {num_train:,} train / {num_val:,} validation samples preloaded in {time.perf_counter() - start:.1f}s")
+    else:
+        pin_memory = device.type == 'cuda'
+        train_batches = DataLoader(train_dataset, batch_size=None, shuffle=True, num_workers=num_workers,
+                                   pin_memory=pin_memory, persistent_workers=num_workers > 0)
+        val_batches = DataLoader(val_dataset, batch_size=None, pin_memory=pin_memory)
+
+    # Step 2: Model, optimizer and the (optionally compiled) forward
+    model = build_model(variant, padding_mask).to(device)
+    optimizer = AdamW(model.parameters(), lr=lr, weight_decay=weight_decay)
+    criterion = nn.BCEWithLogitsLoss()
+    forward = torch.compile(model) if compile_model else model
+
+    def autocast():
+        if bf16:
+            return torch.autocast(device_type=device.type, dtype=torch.bfloat16)
+        return contextlib.nullcontext()
+
+    def run_epoch(batches, train):
+        model.train(train)
+        # Sums stay on the device until the end of the epoch
+        total_loss = torch.zeros((), device=device)
+        correct = torch.zeros((), dtype=torch.long, device=device)
+        total = 0
+
+        with torch.set_grad_enabled(train):
+            for batch in batches:
+                batch = {name: tensor.to(device, non_blocking=True) for name, tensor in batch.items()}
+                labels = batch['label']
+                with autocast():
+                    logits = forward(*[batch[key] for key in INPUT_KEYS])
+                loss = criterion(logits.float(), labels)
+
+                if train:
+                    optimizer.zero_grad(set_to_none=True)
+                    loss.backward()
+                    optimizer.step()
+
+                total_loss += loss.detach()
+                # Notebook metric: thresholded sigmoid compared with the labels element-wise
+                preds = (torch.sigmoid(logits.detach().float()) >= 0.5).float()
+                correct += (preds == labels).sum()
+                total += labels.numel()
+
+        return total_loss.item() / max(len(batches), 1), correct.item() / max(total, 1)
+
+    # Step 3: Train with early stopping on the validation accuracy
+    history = []
+    best_val_acc = 0.0
+    epochs_without_improvement = 0
+
+    for epoch in range(num_epochs):
+        epoch_start = time.perf_counter()
+        train_loss, train_acc = run_epoch(train_batches, train=True)
+        train_time = time.perf_counter() - epoch_start
+        val_loss, val_acc = run_epoch(val_batches, train=False)
+        epoch_time = time.perf_counter() - epoch_start
+
+        samples_per_sec = num_train / train_time
+        history.append({'epoch': epoch + 1, 'train_loss': train_loss, 'train_acc': train_acc, 'val_loss': val_loss,
+                        'val_acc': val_acc, 'epoch_time': epoch_time, 'samples_per_sec': samples_per_sec})
+
+        print(f"Epoch {epoch+1} | Train Loss: {train_loss:.4f} | Train Acc: {train_acc:.4f} | Val Loss: {val_loss:.4f} | "
+              f"Val Acc: {val_acc:.4f} | {epoch_time:.1f}s | {samples_per_sec:,.0f} samples/s")
+
+        if val_acc > best_val_acc:
+            best_val_acc = val_acc
+            epochs_without_improvement = 0
+            torch.save(copy.deepcopy(model.state_dict()), output_path)
+            write_checkpoint_meta(output_path, variant=variant, padding_mask=padding_mask)
+            print(f"✅ Best model saved at epoch {epoch+1}")
+        else:
+            epochs_without_improvement += 1
+            print(f"⚠️  No improvement for {epochs_without_improvement} epoch(s)")
+            if epochs_without_improvement >= patience:
+                print("🛑 Early stopping triggered.")
+                break
+
+    return history
@@ -0,0 +1,76 @@
+# Latency comparison of the bitset CandidateIndex against the notebook's linear-scan heuristic.
+# Run from the repository root, e.g.:
+#   python hangman_vs_ai/scripts/bench_candidate_index.py --dictionary hangman_train.txt
+
+import argparse
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from model.candidate_index import CandidateIndex, predict_letter_with_heuristics
+
+def load_words(path):
+    return [w for w in Path(path).read_text(encoding="utf-8").split() if w.isalpha()]
+
+def random_game_states(words, n, seed=42):
+
+    # Mid-game states with at least one guess (the baseline hard-codes 'e' for the first one)
+    rng = random.Random(seed)
+    states = []
+    while len(states) < n:
+        word = rng.choice(words)
+        letters = sorted(set(word))
+        revealed = set(rng.sample(letters, rng.randint(0, len(letters) - 1)))
+        misses = [c for c in string.ascii_lowercase if c not in word]
+        guessed = list(revealed) + rng.sample(misses, rng.randint(0, 5))
+        if guessed:
+            states.append((''.join(c if c in revealed else '_' for c in word), guessed))
+    return states
+
+def percentiles(samples):
+    samples = np.array(samples) * 1e3
+    return f"p50 {np.percentile(samples, 50):8.3f} ms | p99 {np.percentile(samples, 99):8.3f} ms"
+
+def main():
+    parser = argparse.ArgumentParser(description="CandidateIndex vs linear scan latency")
+    parser.add_argument("--dictionary", default="hangman_train.txt")
+    parser.add_argument("--words", default="hangman_test.txt", help="Words the game states are drawn from")
+    parser.add_argument("--num-states", type=int, default=500)
+    args = parser.parse_args()
+
+    dictionary = load_words(args.dictionary)
+    start = time.perf_counter()
+    index = CandidateIndex(dictionary)
+    print(f"Index built over {len(dictionary):,} words in {time.perf_counter() - start:.2f}s")
+
+    states = random_game_states(load_words(args.words), args.num_states)
+    scan_times, index_times, candidates = [], [], []
+    agree = comparable = 0
+    for state, guessed in states:
+        start = time.perf_counter()
+        scan_letter = predict_letter_with_heuristics(state, guessed, dictionary)
+        scan_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        counts, num_candidates = index.letter_counts(state, guessed)
+        index_times.append(time.perf_counter() - start)
+        candidates.append(num_candidates)
+
+        # The baseline breaks ties arbitrarily, so only compare states with a unique best letter
+        if num_candidates and (counts == counts.max()).sum() == 1:
+            comparable += 1
+            agree += scan_letter == string.ascii_lowercase[int(counts.argmax())]
+
+    print(f"Linear scan : {percentiles(scan_times)}")
+    print(f"Bitset index: {percentiles(index_times)}")
+    print(f"Speedup (mean): {np.mean(scan_times) / np.mean(index_times):.0f}x | median candidates: {int(np.median(candidates))}")
+    print(f"Same letter on {agree}/{comparable} states with a unique best letter")
+
+if __name__ == "__main__":
+    main()
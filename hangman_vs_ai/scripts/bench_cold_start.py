@@ -0,0 +1,72 @@
+# Cold-start benchmark: time to first prediction and resident memory, eager vs frozen model.
+# Every run is a fresh interpreter, so import and load costs are measured as a container pays them.
+# Run from the repository root, e.g.:
+#   python hangman_vs_ai/scripts/bench_cold_start.py --runs 5
+
+import argparse
+import json
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+def child(model_path, frozen):
+
+    # Measured in a fresh process: import, load, first prediction
+    start = time.perf_counter()
+    from model.inference import load_model, predict_next_letter
+    imported = time.perf_counter()
+    load_model(model_path, frozen=frozen)
+    loaded = time.perf_counter()
+    predict_next_letter("_____", [], use_cache=False)
+    first = time.perf_counter()
+
+    print(json.dumps({
+        'import_s': imported - start,
+        'load_s': loaded - imported,
+        'first_predict_s': first - loaded,
+        'total_s': first - start,
+        'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    }))
+
+def run(model_path, frozen, runs):
+    results = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", "--model", model_path] + (["--frozen"] if frozen else []),
+            check=True, capture_output=True, text=True
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return {key: statistics.median(r[key] for r in results) for key in results[0]}
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start latency and memory of the eager and frozen model")
+    parser.add_argument("--model", default="hangman_vs_ai/model/transformer.pt")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes per variant (median reported)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--frozen", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.model, args.frozen)
+        return
+
+    from model.inference import frozen_model_path
+    variants = [("eager", False)]
+    if Path(frozen_model_path(args.model)).exists():
+        variants.append(("frozen", True))
+    else:
+        print("⚠️  No frozen export found, run scripts/export_frozen.py first")
+
+    print(f"{'variant':<8} {'import':>9} {'load':>9} {'1st pred':>9} {'total':>9} {'max RSS':>10}")
+    for name, frozen in variants:
+        r = run(args.model, frozen, args.runs)
+        print(f"{name:<8} {r['import_s'] * 1e3:>7.0f}ms {r['load_s'] * 1e3:>7.0f}ms "
+              f"{r['first_predict_s'] * 1e3:>7.0f}ms {r['total_s'] * 1e3:>7.0f}ms {r['max_rss_mb']:>8.0f}MB")
+
+if __name__ == "__main__":
+    main()
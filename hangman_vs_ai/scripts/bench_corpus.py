@@ -0,0 +1,61 @@
+# Scaling report for the parallel corpus builder: samples/sec from 1 worker up to all cores,
+# plus a check that every worker count produces byte-identical datasets.
+# Run from the repository root, e.g.:
+#   python hangman_vs_ai/scripts/bench_corpus.py --sample 8000
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from model.data_pipeline import load_words
+from model.dataset_store import FIELDS
+from model.corpus_builder import build_dataset_parallel
+
+def dataset_digest(path):
+    digest = hashlib.sha256()
+    for name in FIELDS:
+        digest.update((Path(path) / f'{name}.bin').read_bytes())
+    return digest.hexdigest()[:16]
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel corpus generation scaling report")
+    parser.add_argument("--words", default="hangman_train.txt")
+    parser.add_argument("--sample", type=int, default=8000, help="Random sample of N words (0 = all)")
+    parser.add_argument("--num-permutations", type=int, default=6)
+    parser.add_argument("--chunk-words", type=int, default=512)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    words = load_words(args.words)
+    if args.sample:
+        words = random.Random(args.seed).sample(words, min(args.sample, len(words)))
+
+    counts = sorted({1, *[2 ** i for i in range(1, os.cpu_count().bit_length()) if 2 ** i < os.cpu_count()], os.cpu_count()})
+
+    print(f"{len(words):,} words × {args.num_permutations} permutations | chunks of {args.chunk_words} words\n")
+    print(f"{'workers':>7} {'seconds':>8} {'samples/s':>11} {'speedup':>8} {'digest':>17}")
+    baseline = None
+    digests = set()
+    for num_workers in counts:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            start = time.perf_counter()
+            path = build_dataset_parallel(words, cache_dir, args.num_permutations, args.seed, num_workers, args.chunk_words)
+            elapsed = time.perf_counter() - start
+            num_samples = json.loads((path / 'meta.json').read_text())['num_samples']
+            digest = dataset_digest(path)
+        baseline = baseline or elapsed
+        digests.add(digest)
+        print(f"{num_workers:>7} {elapsed:>8.2f} {num_samples / elapsed:>11,.0f} {baseline / elapsed:>7.2f}× {digest:>17}")
+
+    print("\n✅ Output identical for every worker count" if len(digests) == 1 else "\n❌ Output depends on the worker count")
+
+if __name__ == "__main__":
+    main()
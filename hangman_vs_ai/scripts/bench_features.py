@@ -0,0 +1,88 @@
+# Throughput comparison of the per-sample dict encoder (generate_features + encode_features)
+# against the vectorized NumPy encoder (fast_features.encode_batch).
+# Run from the repository root, e.g.:
+#   python hangman_vs_ai/scripts/bench_features.py --sizes 1 1000 1000000
+
+import argparse
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from model.inference import generate_features, encode_features
+from model.fast_features import encode_batch
+
+def random_game_states(words, n, seed=42):
+
+    # Random mid-game states: a random subset of each word's letters revealed plus a few misses
+    rng = random.Random(seed)
+    states, histories = [], []
+    for _ in range(n):
+        word = rng.choice(words)
+        letters = sorted(set(word))
+        revealed = set(rng.sample(letters, rng.randint(0, len(letters) - 1)))
+        misses = [c for c in string.ascii_lowercase if c not in word]
+        history = list(revealed) + rng.sample(misses, rng.randint(0, 5))
+        rng.shuffle(history)
+        states.append(''.join(c if c in revealed else '_' for c in word))
+        histories.append(history)
+    return states, histories
+
+def reference_encode(states, histories):
+    samples = [{'current_state': s, 'guess_history': h} for s, h in zip(states, histories)]
+    return encode_features(generate_features(samples))
+
+def time_call(fn, min_time=0.2):
+
+    # Repeat small workloads until the total time is measurable
+    calls, start = 0, time.perf_counter()
+    while True:
+        fn()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed / calls
+
+def check_parity(states, histories):
+
+    reference = reference_encode(states, histories)
+    fast = encode_batch(states, histories, dtype=np.float64)
+    for key, values in fast.items():
+        expected = np.array([e[key] for e in reference], dtype=values.dtype)
+        if key == 'norm_features':
+            # avg_remaining_freq depends on set iteration order in the reference (see encode_batch)
+            assert np.array_equal(np.delete(expected, 6, axis=1), np.delete(values, 6, axis=1)), key
+            assert np.allclose(expected[:, 6], values[:, 6], rtol=0, atol=1e-15), key
+        else:
+            assert np.array_equal(expected, values), key
+    print(f"Parity check passed on {len(states):,} samples")
+
+def main():
+    parser = argparse.ArgumentParser(description="Feature encoder throughput comparison")
+    parser.add_argument("--words", default="hangman_test.txt")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 1_000, 1_000_000])
+    parser.add_argument("--skip-reference-above", type=int, default=None,
+                        help="Only time the vectorized encoder for sizes above this")
+    args = parser.parse_args()
+
+    words = [w for w in Path(args.words).read_text(encoding="utf-8").split() if w.isalpha()]
+    check_parity(*random_game_states(words, 10_000, seed=0))
+
+    print(f"{'samples':>10} | {'dict encoder':>16} | {'numpy encoder':>16} | {'speedup':>8}")
+    for n in args.sizes:
+        states, histories = random_game_states(words, n)
+        fast_time = time_call(lambda: encode_batch(states, histories))
+        if args.skip_reference_above is not None and n > args.skip_reference_above:
+            ref_rate, speedup = "skipped", "-"
+        else:
+            ref_time = time_call(lambda: reference_encode(states, histories))
+            ref_rate, speedup = f"{n / ref_time:,.0f}/s", f"{ref_time / fast_time:.1f}x"
+        print(f"{n:>10,} | {ref_rate:>16} | {n / fast_time:>14,.0f}/s | {speedup:>8}")
+
+if __name__ == "__main__":
+    main()
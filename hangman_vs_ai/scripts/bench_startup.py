@@ -0,0 +1,93 @@
+# Startup benchmark for app.py: time and memory until the intro screen can render and until the
+# model is ready, for the old startup (torch imported at the top, weights copied by torch.load)
+# and the lazy one (torch-free intro imports, weights-only memory-mapped load on first use).
+# Every run is a fresh interpreter. Run from the repository root, e.g.:
+#   python hangman_vs_ai/scripts/bench_startup.py --runs 5
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+def memory_mb():
+
+    # Current resident set split into anonymous (private) and file-backed (shareable page cache) pages
+    fields = {}
+    with open('/proc/self/status') as f:
+        for line in f:
+            name, _, value = line.partition(':')
+            if name in ('VmRSS', 'RssAnon', 'RssFile'):
+                fields[name] = int(value.split()[0]) / 1024
+    return fields
+
+def child(mode, model_path):
+    start = time.perf_counter()
+
+    if mode == 'before':
+        # Previous app.py: inference (and torch) imported before the intro screen, full-copy load
+        from model import inference
+        intro = time.perf_counter()
+        intro_memory = memory_mb()
+        import torch
+        model = inference.build_model()
+        model.load_state_dict(torch.load(model_path, map_location='cpu'))
+        inference.model = model.eval()
+    else:
+        # Lazy app.py: only torch-free modules before the intro, then lazy import and mmap load
+        from model.checkpoints import variant_model_path
+        from model.policy_table import PolicyTable
+        from model.ai_game import AIGamePlan
+        from model.client import InferenceClient
+        from model import profiling
+        intro = time.perf_counter()
+        intro_memory = memory_mb()
+        from model import inference
+        inference.load_model(model_path, frozen=False)
+
+    inference.predict_next_letter("_____", [], use_cache=False)
+    ready = time.perf_counter()
+    ready_memory = memory_mb()
+
+    print(json.dumps({
+        'intro_s': intro - start,
+        'intro_rss_mb': intro_memory['VmRSS'],
+        'ready_s': ready - start,
+        'ready_rss_mb': ready_memory['VmRSS'],
+        'ready_anon_mb': ready_memory['RssAnon'],
+        'ready_file_mb': ready_memory['RssFile']
+    }))
+
+def run(mode, model_path, runs):
+    results = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", mode, "--model", model_path],
+            check=True, capture_output=True, text=True
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return {key: statistics.median(r[key] for r in results) for key in results[0]}
+
+def main():
+    parser = argparse.ArgumentParser(description="App startup time and memory, eager vs lazy imports")
+    parser.add_argument("--model", default="hangman_vs_ai/model/transformer.pt")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes per mode (median reported)")
+    parser.add_argument("--child", choices=["before", "after"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.model)
+        return
+
+    print(f"{'startup':<8} {'intro':>8} {'intro RSS':>10} {'model ready':>12} {'ready RSS':>10} {'private':>9} {'file-backed':>12}")
+    for mode in ("before", "after"):
+        r = run(mode, args.model, args.runs)
+        print(f"{mode:<8} {r['intro_s'] * 1e3:>6.0f}ms {r['intro_rss_mb']:>8.0f}MB {r['ready_s'] * 1e3:>10.0f}ms "
+              f"{r['ready_rss_mb']:>8.0f}MB {r['ready_anon_mb']:>7.0f}MB {r['ready_file_mb']:>10.0f}MB")
+
+if __name__ == "__main__":
+    main()
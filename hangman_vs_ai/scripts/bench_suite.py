@@ -0,0 +1,181 @@
+# Benchmark suite for the inference hot path: per-stage timings for single-turn and batched
+# prediction plus end-to-end games/sec, compared against a stored JSON baseline.
+# Uses a randomly initialised stand-in checkpoint when transformer.pt is absent.
+# Run from the repository root, e.g.:
+#   python hangman_vs_ai/scripts/bench_suite.py --update          # record the baseline
+#   python hangman_vs_ai/scripts/bench_suite.py --tolerance 0.2   # fail on >20% regressions
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+import torch
+from model import inference
+from model.inference import (
+    build_model, load_model, generate_features, encode_features, predict_next_letter,
+    _stack_encoded, _encoded_tensors, _forward, _select_letters
+)
+from model.fast_features import encode_batch, guessed_matrix
+from model.evaluator import evaluate_hangman_model
+from model.checkpoints import checkpoint_sha256
+
+def sample_states(words, n, rng):
+
+    # Mid-game (state, guessed letters) pairs: a random subset of the word's letters revealed
+    # plus some wrong guesses, mirroring what the model sees during play
+    states = []
+    for word in rng.choices(words, k=n):
+        letters = sorted(set(word))
+        revealed = set(rng.sample(letters, rng.randint(0, len(letters) - 1)))
+        wrong = rng.sample([c for c in 'abcdefghijklmnopqrstuvwxyz' if c not in word], rng.randint(0, 5))
+        states.append((''.join(c if c in revealed else '_' for c in word), sorted(revealed) + wrong))
+    return states
+
+def timeit(fn, repeat):
+    # Median seconds per call after one warm-up call
+    fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def stage_timings(states, repeat):
+
+    current_states = [s for s, _ in states]
+    histories = [g for _, g in states]
+    samples = [{'current_state': s, 'guess_history': g} for s, g in states]
+    features = generate_features(samples)
+    encoded_list = encode_features(features)
+    encoded = _stack_encoded(encoded_list)
+    guessed = guessed_matrix(histories)
+    inputs, guessed_t = _encoded_tensors(encoded, guessed)
+    logits = _forward(inputs)
+
+    return {
+        'generate_features': timeit(lambda: generate_features(samples), repeat),
+        'encode_features': timeit(lambda: encode_features(features), repeat),
+        'encode_batch': timeit(lambda: encode_batch(current_states, histories), repeat),
+        'tensor_construction': timeit(lambda: _encoded_tensors(_stack_encoded(encoded_list), guessed), repeat),
+        'forward': timeit(lambda: _forward(inputs), repeat),
+        'postprocess': timeit(lambda: _select_letters(logits, guessed_t, 1), repeat)
+    }
+
+def run_suite(words, args):
+
+    rng = random.Random(args.seed)
+    results = {}
+
+    # Single-turn stages (what the app pays per AI turn)
+    single = sample_states(words, 1, rng)
+    for stage, seconds in stage_timings(single, args.repeat * 20).items():
+        results[f'single/{stage}'] = {'value': seconds * 1e6, 'unit': 'us', 'better': 'lower'}
+
+    turns = sample_states(words, 200, rng)
+    per_turn = statistics.median(
+        timeit(lambda s=s, g=g: predict_next_letter(s, g, use_cache=False), 3) for s, g in turns
+    )
+    results['single/predict_next_letter'] = {'value': per_turn * 1e6, 'unit': 'us', 'better': 'lower'}
+
+    # Batched stages (what the evaluator pays per lockstep step)
+    batch = sample_states(words, args.batch_size, rng)
+    for stage, seconds in stage_timings(batch, args.repeat).items():
+        results[f'batch/{stage}'] = {'value': seconds * 1e3, 'unit': 'ms', 'better': 'lower'}
+
+    # End-to-end self-play on a fixed word sample
+    games = random.Random(args.seed).sample(words, min(args.games, len(words)))
+    evaluation = evaluate_hangman_model(games, batch_size=args.batch_size)
+    results['e2e/games_per_sec'] = {'value': evaluation['games_per_sec'], 'unit': 'games/s', 'better': 'higher'}
+
+    return results
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    print(f"\n{'metric':<32} {'current':>12} {'baseline':>12} {'change':>8}")
+    for name, current in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            print(f"{name:<32} {current['value']:>10.1f}{current['unit']:>2} {'–':>12} {'new':>8}")
+            continue
+        change = current['value'] / reference['value'] - 1
+        worse = change > tolerance if current['better'] == 'lower' else change < -tolerance
+        flag = " ❌" if worse else ""
+        print(f"{name:<32} {current['value']:>10.1f}{current['unit']:>2} {reference['value']:>10.1f}{reference['unit']:>2} {change:>+7.1%}{flag}")
+        if worse:
+            regressions.append(name)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Inference hot-path benchmark suite")
+    parser.add_argument("--model", default="hangman_vs_ai/model/transformer.pt")
+    parser.add_argument("--words", default="hangman_test.txt")
+    parser.add_argument("--baseline", default="bench_baseline.json")
+    parser.add_argument("--update", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression per metric")
+    parser.add_argument("--games", type=int, default=2000, help="Words in the end-to-end self-play sample")
+    parser.add_argument("--batch-size", type=int, default=1024)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--threads", type=int, default=1, help="torch intra-op threads (pinned for stable numbers)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    torch.set_num_threads(args.threads)
+    inference.configure_cache(enabled=False)
+
+    words = [w.strip().lower() for w in Path(args.words).read_text(encoding="utf-8").splitlines()]
+    words = [w for w in words if w.isalpha() and len(w) <= inference.max_len]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if os.path.exists(args.model):
+            checkpoint = checkpoint_sha256(args.model)[:12]
+            load_model(args.model, frozen=False)
+        else:
+            # Stand-in weights: same architecture and cost, meaningless win rate
+            torch.manual_seed(args.seed)
+            synthetic_path = os.path.join(tmp, "synthetic.pt")
+            torch.save(build_model().state_dict(), synthetic_path)
+            checkpoint = "synthetic"
+            load_model(synthetic_path, frozen=False)
+            print(f"⚠️  {args.model} not found, benchmarking a synthetic checkpoint")
+
+        results = run_suite(words, args)
+
+    metadata = {
+        'checkpoint': checkpoint,
+        'python': platform.python_version(),
+        'torch': torch.__version__,
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'threads': args.threads
+    }
+
+    baseline_path = Path(args.baseline)
+    if args.update or not baseline_path.exists():
+        baseline_path.write_text(json.dumps({'metadata': metadata, 'results': results}, indent=2))
+        compare(results, {}, args.tolerance)
+        print(f"\n💾 Baseline written to {baseline_path}")
+        return
+
+    baseline = json.loads(baseline_path.read_text())
+    if baseline['metadata'].get('checkpoint') != checkpoint:
+        print(f"⚠️  Baseline was recorded with checkpoint {baseline['metadata'].get('checkpoint')}")
+
+    regressions = compare(results, baseline['results'], args.tolerance)
+    if regressions:
+        print(f"\n❌ {len(regressions)} metric(s) regressed by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+    print(f"\n✅ No regressions beyond {args.tolerance:.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# Size / latency / win-rate comparison of every model variant with a checkpoint on disk.
+# Run from the repository root, e.g.:
+#   python hangman_vs_ai/scripts/bench_variants.py --sample 5000
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from model import inference
+from model.inference import MODEL_VARIANTS, load_model, predict_next_letter, variant_model_path
+from model.evaluator import evaluate_hangman_model, replay_trace
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the base model with its distilled variants")
+    parser.add_argument("--model", default="hangman_vs_ai/model/transformer.pt", help="Base checkpoint")
+    parser.add_argument("--words", default="hangman_test.txt")
+    parser.add_argument("--sample", type=int, default=None, help="Evaluate a random sample of N words")
+    parser.add_argument("--latency-states", type=int, default=2000, help="Single-turn predictions to time")
+    parser.add_argument("--batch-size", type=int, default=4096)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    words = [w.strip().lower() for w in Path(args.words).read_text(encoding="utf-8").splitlines()]
+    words = [w for w in words if w.isalpha()]
+    if args.sample:
+        words = random.Random(args.seed).sample(words, min(args.sample, len(words)))
+
+    rows = []
+    states = None
+    for variant in MODEL_VARIANTS:
+        path = variant_model_path(args.model, variant)
+        if not os.path.exists(path):
+            print(f"⚠️  Skipping {variant}: {path} not found")
+            continue
+
+        load_model(path, frozen=False, variant=variant)
+        results = evaluate_hangman_model(words, batch_size=args.batch_size)
+
+        # Time every variant on the same states (the first evaluated variant's decisions)
+        if states is None:
+            states = [(state, guessed) for trace in results['traces'] for state, guessed, _ in replay_trace(trace)]
+            states = random.Random(args.seed).sample(states, min(args.latency_states, len(states)))
+        timings = []
+        for state, guessed in states:
+            start = time.perf_counter()
+            predict_next_letter(state, guessed, use_cache=False)
+            timings.append(time.perf_counter() - start)
+
+        num_params = sum(p.numel() for p in inference.model.parameters())
+        rows.append((variant, num_params, os.path.getsize(path), statistics.median(timings), results['win_rate']))
+
+    print(f"\n{'variant':<8} {'params':>11} {'checkpoint':>11} {'p50 turn':>10} {'win rate':>9}")
+    for variant, num_params, size, latency, win_rate in rows:
+        print(f"{variant:<8} {num_params:>11,} {size / 1e6:>9.2f}MB {latency * 1e3:>8.2f}ms {win_rate:>9.2%}")
+
+if __name__ == "__main__":
+    main()
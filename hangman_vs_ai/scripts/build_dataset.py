@@ -0,0 +1,32 @@
+# Build (or reuse) the memory-mapped training dataset for a word list.
+# Run from the repository root, e.g.:
+#   python hangman_vs_ai/scripts/build_dataset.py --words hangman_train.txt
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from model.data_pipeline import load_words
+from model.dataset_store import build_dataset, open_arrays
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the memory-mapped Hangman training dataset")
+    parser.add_argument("--words", default="hangman_train.txt")
+    parser.add_argument("--cache-dir", default="data_cache")
+    parser.add_argument("--num-permutations", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--val-fraction", type=float, default=0.3, help="Share of the words held out for validation")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    path = build_dataset(load_words(args.words), args.cache_dir, args.num_permutations, args.seed,
+                         val_fraction=args.val_fraction)
+    meta, arrays = open_arrays(path)
+    size = sum(array.nbytes for array in arrays.values())
+    print(f"{meta['num_samples']:,} samples ({meta['num_train_samples']:,} train) | {size / 1e6:.1f} MB | {path} | {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
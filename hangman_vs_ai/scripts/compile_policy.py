@@ -0,0 +1,32 @@
+# Precompute the AI's decisions for every gameplay word so app.py can skip model inference.
+# Run from the repository root, e.g.:
+#   python hangman_vs_ai/scripts/compile_policy.py
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from model.data_pipeline import load_words
+from model.inference import MODEL_VARIANTS, load_model
+from model.policy_table import compile_policy
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the AI policy table for the gameplay word list")
+    parser.add_argument("--words", default="hangman_vs_ai/data/words.txt")
+    parser.add_argument("--model", default="hangman_vs_ai/model/transformer.pt")
+    parser.add_argument("--output", default="hangman_vs_ai/model/policy_table.json.gz")
+    parser.add_argument("--batch-size", type=int, default=4096)
+    parser.add_argument("--variant", default="base", choices=list(MODEL_VARIANTS), help="Architecture of --model")
+    parser.add_argument("--backend", default="torch", choices=["torch", "numpy"], help="Backend the app will serve (HANGMAN_BACKEND)")
+    parser.add_argument("--quantized", action="store_true", help="Compile with the int8 model (HANGMAN_QUANTIZED=1)")
+    args = parser.parse_args()
+
+    load_model(args.model, variant=args.variant, quantized=args.quantized, backend_name=args.backend)
+    table = compile_policy(load_words(args.words), args.model, batch_size=args.batch_size)
+    table.save(args.output)
+    print(f"{len(table):,} decisions | checkpoint {table.checkpoint_sha[:12]} | {table.backend}{' int8' if table.quantized else ''} | {Path(args.output).stat().st_size / 1e3:.0f} kB → {args.output}")
+
+if __name__ == "__main__":
+    main()
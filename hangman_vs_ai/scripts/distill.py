@@ -0,0 +1,36 @@
+# Distill the base model into a smaller variant saved next to the teacher checkpoint.
+# Run from the repository root, e.g.:
+#   python hangman_vs_ai/scripts/distill.py --variant small
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from model.data_pipeline import load_words
+from model.dataset_store import build_dataset
+from model.distill import distill
+from model.inference import MODEL_VARIANTS, variant_model_path
+
+def main():
+    parser = argparse.ArgumentParser(description="Knowledge distillation of the Hangman transformer")
+    parser.add_argument("--variant", default="small", choices=[v for v in MODEL_VARIANTS if v != "base"])
+    parser.add_argument("--teacher", default="hangman_vs_ai/model/transformer.pt")
+    parser.add_argument("--words", default="hangman_train.txt")
+    parser.add_argument("--cache-dir", default="data_cache")
+    parser.add_argument("--epochs", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=512)
+    parser.add_argument("--lr", type=float, default=1e-3)
+    parser.add_argument("--alpha", type=float, default=0.8, help="Weight of the teacher's soft targets")
+    parser.add_argument("--val-fraction", type=float, default=0.1, help="Share of the words held out for validation")
+    args = parser.parse_args()
+
+    dataset_path = build_dataset(load_words(args.words), args.cache_dir, val_fraction=args.val_fraction)
+    output = variant_model_path(args.teacher, args.variant)
+    distill(args.teacher, dataset_path, output, variant=args.variant, num_epochs=args.epochs,
+            batch_size=args.batch_size, lr=args.lr, alpha=args.alpha)
+    print(f"🎓 {args.variant} student → {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# Evaluate a checkpoint on a word list with the lockstep batched evaluator.
+# Run from the repository root, e.g.:
+#   python hangman_vs_ai/scripts/evaluate.py --words hangman_test.txt
+
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from model.inference import MODEL_VARIANTS, load_model
+from model.evaluator import evaluate_hangman_model
+
+def main():
+    parser = argparse.ArgumentParser(description="Batched self-play evaluation of the Hangman model")
+    parser.add_argument("--words", default="hangman_test.txt", help="Word list, one word per line")
+    parser.add_argument("--model", default="hangman_vs_ai/model/transformer.pt", help="Checkpoint path")
+    parser.add_argument("--batch-size", type=int, default=4096, help="Games in flight per forward pass")
+    parser.add_argument("--sample", type=int, default=None, help="Evaluate a random sample of N words")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--traces", default=None, help="Optional JSON file for per-game traces")
+    parser.add_argument("--verbose", action="store_true", help="Print the outcome of each game")
+    parser.add_argument("--variant", default="base", choices=list(MODEL_VARIANTS), help="Architecture of --model")
+    args = parser.parse_args()
+
+    words = [w.strip().lower() for w in Path(args.words).read_text(encoding="utf-8").splitlines()]
+    words = [w for w in words if w.isalpha()]
+    if args.sample:
+        words = random.Random(args.seed).sample(words, min(args.sample, len(words)))
+
+    load_model(args.model, variant=args.variant)
+    results = evaluate_hangman_model(words, batch_size=args.batch_size, verbose=args.verbose)
+
+    print(f"Forward passes: {results['forward_passes']} | Elapsed: {results['elapsed']:.2f}s")
+
+    if args.traces:
+        Path(args.traces).write_text(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
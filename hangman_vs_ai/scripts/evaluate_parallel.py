@@ -0,0 +1,66 @@
+# Sharded multi-process evaluation of a checkpoint on a word list, with a per-length breakdown
+# and a wall-clock scaling table over worker counts. Run from the repository root, e.g.:
+#   python hangman_vs_ai/scripts/evaluate_parallel.py --words hangman_test.txt --workers 1 2 4 8
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from model.checkpoints import MODEL_VARIANTS
+from model.parallel_eval import evaluate_parallel
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharded self-play evaluation across a process pool")
+    parser.add_argument("--words", default="hangman_test.txt", help="Word list, one word per line")
+    parser.add_argument("--model", default="hangman_vs_ai/model/transformer.pt", help="Checkpoint path")
+    parser.add_argument("--variant", default="base", choices=list(MODEL_VARIANTS), help="Architecture of --model")
+    parser.add_argument("--backend", default="torch", choices=["torch", "numpy"])
+    parser.add_argument("--workers", type=int, nargs="+", default=[os.cpu_count() or 1],
+                        help="Worker counts to run (one scaling-table row each)")
+    parser.add_argument("--threads-per-worker", type=int, default=1, help="torch/BLAS threads per worker")
+    parser.add_argument("--shards-per-worker", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=1024, help="Games in flight per forward pass in a shard")
+    parser.add_argument("--traces", default=None, help="Optional JSON file for the per-game traces of the last run")
+    args = parser.parse_args()
+
+    words = [w.strip().lower() for w in Path(args.words).read_text(encoding="utf-8").splitlines()]
+    words = [w for w in words if w.isalpha()]
+
+    runs = []
+    for num_workers in args.workers:
+        results = evaluate_parallel(
+            words, args.model, num_workers=num_workers, threads_per_worker=args.threads_per_worker,
+            shards_per_worker=args.shards_per_worker, batch_size=args.batch_size, variant=args.variant,
+            backend_name=args.backend
+        )
+        runs.append(results)
+        print(f"{num_workers} worker(s): {results['total']} games | ✅ Win rate: {results['win_rate']:.2%} | "
+              f"{results['elapsed']:.2f}s")
+
+    # Per-length breakdown (identical for every worker count)
+    results = runs[-1]
+    print(f"\n{'length':>6} {'games':>7} {'win rate':>9} {'wrong/game':>11}")
+    for length, row in results['by_length'].items():
+        print(f"{length:>6} {row['games']:>7} {row['win_rate']:>9.2%} {row['mean_wrong_guesses']:>11.2f}")
+
+    # Scaling table against the first worker count
+    base = runs[0]
+    print(f"\n{'workers':>7} {'shards':>7} {'wall':>8} {'eval':>8} {'games/s':>9} {'speedup':>8} {'efficiency':>11}")
+    for run in runs:
+        speedup = base['elapsed'] / run['elapsed']
+        efficiency = speedup * base['num_workers'] / run['num_workers']
+        print(f"{run['num_workers']:>7} {run['num_shards']:>7} {run['elapsed']:>7.2f}s {run['eval_elapsed']:>7.2f}s "
+              f"{run['games_per_sec']:>9,.0f} {speedup:>7.2f}x {efficiency:>11.0%}")
+
+    if len({run['wins'] for run in runs}) > 1:
+        print("⚠️  Win counts differ between worker counts")
+
+    if args.traces:
+        Path(args.traces).write_text(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+# Export the checkpoint as a frozen TorchScript module that load_model() picks up automatically.
+# Run from the repository root, e.g.:
+#   python hangman_vs_ai/scripts/export_frozen.py
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from model.inference import export_frozen
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a frozen, inference-optimized TorchScript model")
+    parser.add_argument("--model", default="hangman_vs_ai/model/transformer.pt")
+    parser.add_argument("--output", default=None, help="Defaults to <model>.frozen.pt next to the checkpoint")
+    args = parser.parse_args()
+
+    output = export_frozen(args.model, args.output)
+    print(f"🧊 Frozen model ({Path(output).stat().st_size / 1e6:.1f} MB) → {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# Export a checkpoint for the pure-NumPy backend (load_model(..., backend_name='numpy')) and check
+# that its logits match the torch model on encoded mid-game states from a word list.
+# Needs torch; the exported .npz is then served without it. Run from the repository root, e.g.:
+#   python hangman_vs_ai/scripts/export_numpy.py --variant base
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import torch
+from model.checkpoints import numpy_model_path
+from model.constants import max_len, vocab
+from model.fast_features import encode_batch, guessed_matrix
+from model.inference import load_state_dict_file, model_from_state_dict
+from model.numpy_backend import NumpyHangmanTransformer, export_npz
+
+INPUT_KEYS = ('input_ids', 'masked_idx', 'norm_features', 'char_multi_hot', 'ngram_vector')
+
+def sample_states(words, count, seed):
+
+    # (masked word, guessed letters) pairs with a random subset of letters already guessed
+    rng = random.Random(seed)
+    states, histories = [], []
+    for word in rng.sample(words, min(count, len(words))):
+        guessed = rng.sample('abcdefghijklmnopqrstuvwxyz', rng.randint(0, 8))
+        states.append(''.join(c if c in guessed else '_' for c in word))
+        histories.append(guessed)
+    return states, histories
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a checkpoint to .npz and check NumPy/torch parity")
+    parser.add_argument("--words", default="hangman_test.txt")
+    parser.add_argument("--model", default="hangman_vs_ai/model/transformer.pt")
+    parser.add_argument("--variant", default="base")
+    parser.add_argument("--output", default=None, help="Defaults to <model>.npz next to the checkpoint")
+    parser.add_argument("--padding-mask", action="store_true", help="Check with [PAD] keys masked")
+    parser.add_argument("--states", type=int, default=2048, help="Encoded states compared")
+    parser.add_argument("--atol", type=float, default=1e-4, help="Largest acceptable absolute logit difference")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    output = export_npz(args.model, args.output or numpy_model_path(args.model), args.variant)
+    print(f"📦 NumPy model ({Path(output).stat().st_size / 1e6:.1f} MB) → {output}")
+
+    # Step 1: Both models on the same encoded batch
+    words = [w.strip().lower() for w in Path(args.words).read_text(encoding="utf-8").splitlines()]
+    states, histories = sample_states([w for w in words if w.isalpha() and len(w) <= max_len], args.states, args.seed)
+    encoded = encode_batch(states, guessed_matrix(histories))
+    inputs = [encoded[key] for key in INPUT_KEYS]
+
+    torch_model = model_from_state_dict(load_state_dict_file(args.model), args.variant, args.padding_mask).eval()
+    numpy_model = NumpyHangmanTransformer.load(output, vocab['[PAD]'] if args.padding_mask else None)
+
+    start = time.perf_counter()
+    with torch.no_grad():
+        expected = torch_model(*[torch.from_numpy(x) for x in inputs]).numpy()
+    torch_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = numpy_model(*inputs)
+    numpy_time = time.perf_counter() - start
+
+    # Step 2: Logit difference and decision agreement
+    max_diff = float(np.abs(actual - expected).max())
+    agreement = float((actual.argmax(axis=1) == expected.argmax(axis=1)).mean())
+    print(f"{len(states)} states | max |Δlogit| {max_diff:.2e} | top-1 agreement {agreement:.2%} | "
+          f"torch {torch_time * 1e3:.1f}ms | numpy {numpy_time * 1e3:.1f}ms")
+
+    passed = max_diff <= args.atol
+    print(f"Parity (atol {args.atol:.0e}) → {'✅ PASS' if passed else '❌ FAIL'}")
+    sys.exit(0 if passed else 1)
+
+if __name__ == "__main__":
+    main()
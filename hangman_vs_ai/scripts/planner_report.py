@@ -0,0 +1,85 @@
+# Win rate and per-turn latency of the lookahead planner at several time budgets (budget 0 is the
+# greedy model letter), to pick how much CPU per turn is worth spending, and whether the budget
+# holds: "p99 over" is the 99th percentile of the time spent past the budget and "over" the share
+# of turns that exceeded it. Run from the repository root, e.g.:
+#   python hangman_vs_ai/scripts/planner_report.py --budgets 0 10 25 50 100 --sample 500
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from model.candidate_index import CandidateIndex
+from model.checkpoints import MODEL_VARIANTS
+from model.constants import max_lives
+from model.inference import load_model
+from model.planner import LookaheadPlanner
+
+def play(word, planner):
+
+    # One game with the planner choosing every letter; returns (won, turn latencies, plies reached)
+    state = ['_' for _ in word]
+    guessed = []
+    lives = max_lives
+    latencies, depths = [], []
+    while '_' in state and lives > 0:
+        start = time.perf_counter()
+        letter, depth = planner.plan(''.join(state), guessed, lives)
+        latencies.append(time.perf_counter() - start)
+        depths.append(depth)
+        if letter is None:
+            break
+        guessed.append(letter)
+        positions = [i for i, c in enumerate(word) if c == letter]
+        for i in positions:
+            state[i] = letter
+        lives -= not positions
+    return '_' not in state, latencies, depths
+
+def main():
+    parser = argparse.ArgumentParser(description="Lookahead planner strength vs per-turn time budget")
+    parser.add_argument("--words", default="hangman_test.txt", help="Words to play")
+    parser.add_argument("--dictionary", default="hangman_train.txt", help="Words the outcome distributions come from")
+    parser.add_argument("--model", default="hangman_vs_ai/model/transformer.pt")
+    parser.add_argument("--variant", default="base", choices=list(MODEL_VARIANTS))
+    parser.add_argument("--backend", default="torch", choices=["torch", "numpy"])
+    parser.add_argument("--budgets", type=float, nargs="+", default=[0, 10, 25, 50, 100], help="Per-turn budgets (ms)")
+    parser.add_argument("--max-depth", type=int, default=3)
+    parser.add_argument("--branching", type=int, default=4)
+    parser.add_argument("--sample", type=int, default=500, help="Random sample of N words (0 for all)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    words = [w.strip().lower() for w in Path(args.words).read_text(encoding="utf-8").splitlines()]
+    words = [w for w in words if w.isalpha()]
+    if args.sample:
+        words = random.Random(args.seed).sample(words, min(args.sample, len(words)))
+
+    load_model(args.model, variant=args.variant, backend_name=args.backend)
+    index = CandidateIndex.from_file(args.dictionary)
+
+    print(f"{'budget':>8} {'win rate':>9} {'p50 turn':>10} {'p99 turn':>10} {'max turn':>10} {'p99 over':>10} "
+          f"{'over':>7} {'mean depth':>11}")
+    for budget in args.budgets:
+        # Fresh planner per budget so no budget profits from positions memoized by another
+        planner = LookaheadPlanner(index, budget_ms=budget, max_depth=args.max_depth, branching=args.branching)
+        wins, latencies, depths = 0, [], []
+        for word in words:
+            won, turn_latencies, turn_depths = play(word, planner)
+            wins += won
+            latencies += turn_latencies
+            depths += turn_depths
+
+        latencies = np.array(latencies) * 1e3
+        overrun = np.maximum(latencies - budget, 0) if budget > 0 else np.zeros_like(latencies)
+        print(f"{budget:>6.0f}ms {wins / len(words):>9.2%} {np.percentile(latencies, 50):>8.2f}ms "
+              f"{np.percentile(latencies, 99):>8.2f}ms {latencies.max():>8.2f}ms {np.percentile(overrun, 99):>8.2f}ms "
+              f"{np.mean(overrun > 0):>7.2%} {np.mean(depths):>11.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# Accuracy/latency parity report for the dynamic int8 model against fp32.
+# Exits non-zero when the win-rate drop exceeds --max-drop, so it can gate adoption.
+# Run from the repository root, e.g.:
+#   python hangman_vs_ai/scripts/quantization_report.py --max-drop 0.005 --save
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from model.inference import load_model, predict_next_letter, save_quantized, quantized_model_path
+from model.evaluator import evaluate_hangman_model, replay_trace
+
+def replay_states(traces, limit, seed):
+
+    # (state, guessed letters) pairs the model actually faced, for single-turn latency
+    states = [(state, guessed) for trace in traces for state, guessed, _ in replay_trace(trace)]
+    return random.Random(seed).sample(states, min(limit, len(states)))
+
+def per_turn_latency(states):
+    timings = []
+    for state, guessed in states:
+        start = time.perf_counter()
+        predict_next_letter(state, guessed, use_cache=False)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.99) - 1]
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare int8 dynamic quantization with the fp32 model")
+    parser.add_argument("--words", default="hangman_test.txt")
+    parser.add_argument("--model", default="hangman_vs_ai/model/transformer.pt")
+    parser.add_argument("--batch-size", type=int, default=4096)
+    parser.add_argument("--latency-states", type=int, default=2000, help="Single-turn predictions to time")
+    parser.add_argument("--max-drop", type=float, default=0.005, help="Largest acceptable win-rate drop (absolute)")
+    parser.add_argument("--save", action="store_true", help="Write the int8 checkpoint if the gate passes")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    words = [w.strip().lower() for w in Path(args.words).read_text(encoding="utf-8").splitlines()]
+    words = [w for w in words if w.isalpha()]
+
+    rows = {}
+    states = None
+    for name, quantized in (("fp32", False), ("int8", True)):
+        load_model(args.model, frozen=False, quantized=quantized)
+        results = evaluate_hangman_model(words, batch_size=args.batch_size)
+        if states is None:
+            states = replay_states(results['traces'], args.latency_states, args.seed)
+        rows[name] = (results, *per_turn_latency(states))
+
+    print(f"\n{'model':<6} {'win rate':>9} {'games/s':>9} {'p50 turn':>10} {'p99 turn':>10}")
+    for name, (results, p50, p99) in rows.items():
+        print(f"{name:<6} {results['win_rate']:>9.2%} {results['games_per_sec']:>9,.0f} {p50 * 1e3:>8.2f}ms {p99 * 1e3:>8.2f}ms")
+
+    drop = rows['fp32'][0]['win_rate'] - rows['int8'][0]['win_rate']
+    passed = drop <= args.max_drop
+    print(f"\nWin-rate drop {drop:+.2%} (threshold {args.max_drop:.2%}) → {'✅ PASS' if passed else '❌ FAIL'}")
+
+    if passed and args.save:
+        output = save_quantized(args.model)
+        print(f"💾 int8 checkpoint → {output}")
+    elif args.save:
+        print(f"Not writing {quantized_model_path(args.model)}")
+
+    sys.exit(0 if passed else 1)
+
+if __name__ == "__main__":
+    main()
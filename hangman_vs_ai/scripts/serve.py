@@ -0,0 +1,35 @@
+# Run the micro-batching inference server that app.py uses in client mode (HANGMAN_INFERENCE_URL).
+# Run from the repository root, e.g.:
+#   python hangman_vs_ai/scripts/serve.py --port 8765
+#   python hangman_vs_ai/scripts/serve.py --unix-socket /tmp/hangman.sock
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from model.inference import MODEL_VARIANTS, load_model, variant_model_path
+from model.server import serve
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-batching Hangman inference server")
+    parser.add_argument("--model", default="hangman_vs_ai/model/transformer.pt", help="Base checkpoint")
+    parser.add_argument("--variant", default="base", choices=list(MODEL_VARIANTS))
+    parser.add_argument("--quantized", action="store_true")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix-socket", default=None)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    load_model(variant_model_path(args.model, args.variant), quantized=args.quantized, variant=args.variant)
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix_socket, args.max_batch_size, args.max_wait_ms))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# Train a HangmanTransformer on the memory-mapped dataset with the CPU-oriented training engine.
+# Run from the repository root, e.g.:
+#   python hangman_vs_ai/scripts/train.py --words hangman_train.txt --bf16 --compile
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from model.checkpoints import MODEL_VARIANTS
+from model.corpus_builder import build_dataset_parallel
+from model.data_pipeline import load_words
+from model.train import train_model
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the Hangman transformer")
+    parser.add_argument("--words", default="hangman_train.txt")
+    parser.add_argument("--cache-dir", default="data_cache")
+    parser.add_argument("--output", default="transformer_retrained.pt", help="Best checkpoint (state_dict)")
+    parser.add_argument("--variant", default="base", choices=list(MODEL_VARIANTS))
+    parser.add_argument("--epochs", type=int, default=15)
+    parser.add_argument("--batch-size", type=int, default=512)
+    parser.add_argument("--lr", type=float, default=2e-4)
+    parser.add_argument("--patience", type=int, default=2)
+    parser.add_argument("--padding-mask", action="store_true", help="Train the padding-mask model on trimmed batches")
+    parser.add_argument("--bf16", action="store_true", help="bfloat16 autocast")
+    parser.add_argument("--compile", action="store_true", help="torch.compile the model")
+    parser.add_argument("--threads", type=int, default=None, help="torch intra-op threads")
+    parser.add_argument("--preload", action="store_true", help="Keep the decoded dataset in memory (if under --max-preload-gb)")
+    parser.add_argument("--max-preload-gb", type=float, default=2.0)
+    parser.add_argument("--workers", type=int, default=None, help="Dataset builder processes (first run only)")
+    parser.add_argument("--val-fraction", type=float, default=0.3, help="Share of the words held out for validation")
+    parser.add_argument("--history", default=None, help="Optional JSON file for the per-epoch history")
+    args = parser.parse_args()
+
+    dataset_path = build_dataset_parallel(load_words(args.words), args.cache_dir, num_workers=args.workers,
+                                          val_fraction=args.val_fraction)
+    history = train_model(
+        dataset_path, args.output, variant=args.variant, num_epochs=args.epochs, batch_size=args.batch_size,
+        lr=args.lr, patience=args.patience, padding_mask=args.padding_mask, bf16=args.bf16,
+        compile_model=args.compile, num_threads=args.threads, preload=args.preload,
+        max_preload_bytes=int(args.max_preload_gb * 1024 ** 3)
+    )
+
+    best = max(history, key=lambda h: h['val_acc'])
+    print(f"🏋️ Best Val Acc {best['val_acc']:.4f} (epoch {best['epoch']}) → {args.output}")
+    if args.history:
+        Path(args.history).write_text(json.dumps(history, indent=2))
+
+if __name__ == "__main__":
+    main()
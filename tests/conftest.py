@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The app imports its modules as `model.<name>` from inside hangman_vs_ai (see app.py and scripts/)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "hangman_vs_ai"))
@@ -0,0 +1,46 @@
+import random
+import string
+from pathlib import Path
+
+import numpy as np
+
+from model.candidate_index import CandidateIndex
+
+# CandidateIndex answers with bitset ANDs; it must return exactly the words a linear scan
+# of the dictionary keeps.
+
+WORDS = Path(__file__).resolve().parents[1] / "hangman_vs_ai" / "data" / "words.txt"
+
+def consistent(word, state, guessed):
+    # Reference rule: revealed letters match, hidden positions hold no revealed letter,
+    # and the word contains none of the wrong guesses
+    if len(word) != len(state):
+        return False
+    revealed = set(state) - {'_'}
+    for c, s in zip(word, state):
+        if s == '_' and c in revealed:
+            return False
+        if s != '_' and c != s:
+            return False
+    return not any(letter in word for letter in set(guessed) - revealed)
+
+def test_candidate_indices_match_linear_scan():
+    words = [w for w in WORDS.read_text(encoding="utf-8").split() if w.isalpha()]
+    index = CandidateIndex(words)
+    rng = random.Random(0)
+    for _ in range(300):
+        word = rng.choice(index.words[rng.choice(list(index.words))])
+        guessed = rng.sample(sorted(set(word)), rng.randint(0, len(set(word)))) + rng.sample(string.ascii_lowercase, rng.randint(0, 4))
+        guessed = list(dict.fromkeys(guessed))
+        state = ''.join(c if c in guessed else '_' for c in word)
+
+        expected = [i for i, w in enumerate(index.words[len(word)]) if consistent(w, state, guessed)]
+        assert index.candidate_indices(state, guessed).tolist() == expected
+        assert index.candidates(state, guessed) == [index.words[len(word)][i] for i in expected]
+
+def test_candidate_indices_of_unknown_length_is_empty():
+    index = CandidateIndex(["apple", "angle"])
+    assert len(index.candidate_indices("___", [])) == 0
+    assert index.candidate_indices("_____", []).tolist() == [0, 1]
+    assert index.candidate_indices("_____", ["n"]).tolist() == [1]
+    assert isinstance(index.candidate_indices("__", []), np.ndarray)
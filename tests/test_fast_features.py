@@ -0,0 +1,61 @@
+import random
+import string
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from model.fast_features import encode_batch
+from model.inference import encode_features, generate_features
+
+# encode_batch must reproduce the reference per-sample pipeline (generate_features +
+# encode_features), which the model was trained on.
+
+WORDS = Path(__file__).resolve().parents[1] / "hangman_vs_ai" / "data" / "words.txt"
+
+def random_game_states(n, seed=0):
+
+    # Random mid-game states: a random subset of each word's letters revealed plus a few misses
+    words = [w for w in WORDS.read_text(encoding="utf-8").split() if w.isalpha()]
+    rng = random.Random(seed)
+    states, histories = [], []
+    for _ in range(n):
+        word = rng.choice(words)
+        letters = sorted(set(word))
+        revealed = set(rng.sample(letters, rng.randint(0, len(letters) - 1)))
+        misses = [c for c in string.ascii_lowercase if c not in word]
+        history = list(revealed) + rng.sample(misses, rng.randint(0, 5))
+        rng.shuffle(history)
+        states.append(''.join(c if c in revealed else '_' for c in word))
+        histories.append(history)
+    return states, histories
+
+def assert_matches_reference(encoded, reference):
+    for key, values in encoded.items():
+        expected = np.array([e[key] for e in reference], dtype=values.dtype)
+        if key == 'norm_features':
+            # avg_remaining_freq (column 6) sums in set iteration order in the reference
+            assert np.array_equal(np.delete(expected, 6, axis=1), np.delete(values, 6, axis=1)), key
+            np.testing.assert_allclose(values[:, 6], expected[:, 6], rtol=0, atol=1e-15)
+        else:
+            assert np.array_equal(expected, values), key
+
+def test_encode_batch_matches_reference():
+    states, histories = random_game_states(2000)
+    reference = encode_features(generate_features([{'current_state': s, 'guess_history': h} for s, h in zip(states, histories)]))
+    assert_matches_reference(encode_batch(states, histories, dtype=np.float64), reference)
+
+@pytest.mark.parametrize("state, history", [("_____", []), ("a", ["a"]), ("__________", list("zqxj")), ("apple", list("aple"))])
+def test_encode_batch_edge_states(state, history):
+    reference = encode_features(generate_features([{'current_state': state, 'guess_history': history}]))
+    assert_matches_reference(encode_batch([state], [history], dtype=np.float64), reference)
+
+def test_encode_batch_accepts_guessed_matrix():
+    states, histories = random_game_states(200, seed=1)
+    guessed = np.zeros((len(states), 26), dtype=bool)
+    for row, history in zip(guessed, histories):
+        row[[ord(c) - ord('a') for c in history]] = True
+    from_lists = encode_batch(states, histories)
+    from_matrix = encode_batch(states, guessed)
+    for key in from_lists:
+        assert np.array_equal(from_lists[key], from_matrix[key]), key
@@ -0,0 +1,45 @@
+import random
+import string
+from pathlib import Path
+
+import numpy as np
+
+from model.inference import GameFeatureState, encode_features, generate_features
+
+# GameFeatureState updates the encoding incrementally after each guess; at every step it must
+# equal the reference encoding recomputed from the masked word and the guess history.
+
+WORDS = Path(__file__).resolve().parents[1] / "hangman_vs_ai" / "data" / "words.txt"
+
+def reference_encoding(state, history):
+    return encode_features(generate_features([{'current_state': state, 'guess_history': list(history)}]))[0]
+
+def assert_same_encoding(actual, expected):
+    for key in ('input_ids', 'masked_idx', 'char_multi_hot', 'ngram_vector'):
+        assert list(actual[key]) == list(expected[key]), key
+    norm, expected_norm = np.array(actual['norm_features']), np.array(expected['norm_features'])
+    # avg_remaining_freq (index 6) sums in set iteration order in the reference
+    assert np.array_equal(np.delete(norm, 6), np.delete(expected_norm, 6))
+    np.testing.assert_allclose(norm[6], expected_norm[6], rtol=0, atol=1e-15)
+
+def test_feature_state_matches_reference_every_turn():
+    words = [w for w in WORDS.read_text(encoding="utf-8").split() if w.isalpha()]
+    rng = random.Random(0)
+    for word in rng.sample(words, 200):
+        features = GameFeatureState(len(word))
+        state = ['_'] * len(word)
+        history = []
+        assert_same_encoding(features.encoded_features(), reference_encoding(''.join(state), history))
+
+        # Random guesses, biased towards the word's letters so games reveal most of it
+        letters = list(set(word)) + rng.sample(string.ascii_lowercase, 8)
+        rng.shuffle(letters)
+        for letter in dict.fromkeys(letters):
+            positions = [i for i, c in enumerate(word) if c == letter]
+            features.apply_guess(letter, positions)
+            history.append(letter)
+            for i in positions:
+                state[i] = letter
+            assert_same_encoding(features.encoded_features(), reference_encoding(''.join(state), history))
+            if '_' not in state:
+                break
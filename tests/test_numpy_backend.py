@@ -0,0 +1,48 @@
+import random
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from model import inference
+from model.constants import max_len, vocab
+from model.fast_features import encode_batch
+from model.numpy_backend import NumpyHangmanTransformer, export_npz
+
+# The NumPy backend must reproduce the torch model's logits from the same checkpoint (fp32,
+# up to summation order), with and without the [PAD] attention mask.
+
+WORDS = Path(__file__).resolve().parents[1] / "hangman_vs_ai" / "data" / "words.txt"
+INPUT_KEYS = ('input_ids', 'masked_idx', 'norm_features', 'char_multi_hot', 'ngram_vector')
+
+def encoded_states(n=256, seed=0):
+    words = [w for w in WORDS.read_text(encoding="utf-8").split() if w.isalpha() and len(w) <= max_len]
+    rng = random.Random(seed)
+    states, histories = [], []
+    for word in rng.sample(words, n):
+        history = rng.sample(sorted(set(word)), rng.randint(0, len(set(word)) - 1))
+        states.append(''.join(c if c in history else '_' for c in word))
+        histories.append(history)
+    encoded = encode_batch(states, histories)
+    return [encoded[key] for key in INPUT_KEYS]
+
+@pytest.mark.parametrize("variant", ["base", "tiny"])
+@pytest.mark.parametrize("padding_mask", [False, True])
+def test_numpy_logits_match_torch(tmp_path, variant, padding_mask):
+    torch.manual_seed(0)
+    model_path = str(tmp_path / "transformer.pt")
+    torch.save(inference.build_model(variant).state_dict(), model_path)
+    npz_path = export_npz(model_path, str(tmp_path / "transformer.npz"), variant)
+
+    torch_model = inference.model_from_state_dict(inference.load_state_dict_file(model_path), variant, padding_mask)
+    numpy_model = NumpyHangmanTransformer.load(npz_path, vocab['[PAD]'] if padding_mask else None)
+
+    inputs = encoded_states()
+    with torch.no_grad():
+        expected = torch_model(*[torch.from_numpy(x) for x in inputs]).numpy()
+    actual = numpy_model(*inputs)
+
+    np.testing.assert_allclose(actual, expected, rtol=0, atol=1e-4)
+    assert np.array_equal(actual.argmax(axis=1), expected.argmax(axis=1))
@@ -0,0 +1,68 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from model import inference
+from model.checkpoints import write_checkpoint_meta
+from model.constants import max_len, ngram_list, vocab
+from model.model_definition import HangmanTransformer
+
+# The [PAD] attention mask changes the outputs of a model trained without it, so it must only be
+# enabled for checkpoints whose metadata says they were trained with it.
+
+def _inputs(batch_size=16, seed=0):
+    generator = torch.Generator().manual_seed(seed)
+    lengths = torch.randint(3, max_len + 1, (batch_size,), generator=generator)
+    input_ids = torch.randint(2, len(vocab), (batch_size, max_len), generator=generator)
+    input_ids[torch.arange(max_len)[None, :] >= lengths[:, None]] = vocab['[PAD]']
+    masked_idx = (torch.rand(batch_size, max_len, generator=generator) < 0.5).long()
+    masked_idx[input_ids == vocab['[PAD]']] = 0
+    input_ids[masked_idx.bool()] = vocab['[MASK]']
+    return (
+        input_ids,
+        masked_idx,
+        torch.rand(batch_size, 19, generator=generator),
+        (torch.rand(batch_size, 26 * 4, generator=generator) < 0.3).float(),
+        torch.rand(batch_size, len(ngram_list), generator=generator)
+    )
+
+@pytest.fixture(autouse=True)
+def restore_inference_globals():
+    # load_model replaces the module-level model; put the previous one back for later tests
+    names = ('model', 'backend', 'model_quantized', 'trim_padding', 'device')
+    saved = {name: getattr(inference, name) for name in names}
+    yield
+    for name, value in saved.items():
+        setattr(inference, name, value)
+    inference.prediction_cache.clear()
+
+@pytest.fixture
+def checkpoint(tmp_path):
+    torch.manual_seed(0)
+    baseline = HangmanTransformer().eval()
+    path = tmp_path / "transformer.pt"
+    torch.save(baseline.state_dict(), path)
+    return str(path), baseline
+
+def test_unmasked_model_matches_baseline_exactly(checkpoint):
+    path, baseline = checkpoint
+    unmasked = inference.model_from_state_dict(inference.load_state_dict_file(path), 'base', padding_mask=False)
+    inputs = _inputs()
+    with torch.no_grad():
+        assert torch.equal(unmasked(*inputs), baseline(*inputs))
+
+def test_mask_request_ignored_for_checkpoint_trained_without_it(checkpoint):
+    path, baseline = checkpoint
+    inference.load_model(path, frozen=False, padding_mask=True)
+    assert not inference.trim_padding
+    assert inference.model.pad_token_id is None
+    inputs = _inputs(seed=1)
+    with torch.no_grad():
+        assert torch.equal(inference.model(*inputs), baseline(*inputs))
+
+def test_mask_enabled_from_checkpoint_metadata(checkpoint):
+    path, _ = checkpoint
+    write_checkpoint_meta(path, variant='base', padding_mask=True)
+    inference.load_model(path, frozen=False)
+    assert inference.trim_padding
+    assert inference.model.pad_token_id == vocab['[PAD]']